@@ -1,10 +1,140 @@
-from roboticstoolbox.tools import *
+"""
+The subpackages, and the names they export, are imported when first used
+(PEP 562) so that importing the toolbox does not import the mobile robot,
+model and graphics code, or their dependencies, until they are needed.
+"""
 
-from roboticstoolbox.robot import *
+import importlib
 
-from roboticstoolbox.mobile import *
-from roboticstoolbox import models
-from roboticstoolbox import backends
+# the subpackage which exports each name
+_exports = {
+    "tools": [
+        "null",
+        "p_servo",
+        "angle_axis_python",
+        "angle_axis",
+        "Ticker",
+        "quintic",
+        "quintic_func",
+        "jtraj",
+        "ctraj",
+        "trapezoidal",
+        "trapezoidal_func",
+        "xplot",
+        "mtraj",
+        "mstraj",
+        "jsingu",
+        "jacobian_numerical",
+        "hessian_numerical",
+        "rtb_load_data",
+        "rtb_load_matfile",
+        "rtb_load_jsonfile",
+        "rtb_path_to_datafile",
+        "rtb_cache_dir",
+        "rtb_set_param",
+        "rtb_get_param",
+        "PyArrayLike",
+        "ArrayLike",
+        "NDArray",
+    ],
+    "robot": [
+        "Robot",
+        "Robot2",
+        "SerialLink",
+        "DHRobot",
+        "Link",
+        "DHLink",
+        "RevoluteDH",
+        "PrismaticDH",
+        "RevoluteMDH",
+        "PrismaticMDH",
+        "BaseRobot",
+        "ELink",
+        "ELink2",
+        "Link2",
+        "ERobot",
+        "ERobot2",
+        "ETS",
+        "ETS2",
+        "Gripper",
+        "PoERobot",
+        "PoELink",
+        "PoEPrismatic",
+        "PoERevolute",
+        "ET",
+        "ET2",
+        "DynamicsCode",
+        "DynamicsEnsemble",
+        "IKSolution",
+        "IKSolver",
+        "IK_LM",
+        "IK_NR",
+        "IK_GN",
+        "IK_QP",
+        "IK_Pieper",
+    ],
+    "mobile": [
+        "VehicleBase",
+        "Bicycle",
+        "Unicycle",
+        "DiffSteer",
+        "VehicleAnimationBase",
+        "VehicleMarker",
+        "VehiclePolygon",
+        "VehicleIcon",
+        "Bug2",
+        "DistanceTransformPlanner",
+        "DstarPlanner",
+        "DubinsPlanner",
+        "LatticePlanner",
+        "ReedsSheppPlanner",
+        "CurvaturePolyPlanner",
+        "QuinticPolyPlanner",
+        "PRMPlanner",
+        "VehicleDriverBase",
+        "RandomPath",
+        "PurePursuit",
+        "LandmarkMap",
+        "RangeBearingSensor",
+        "PoseGraph",
+        "PolygonMap",
+        "BinaryOccupancyGrid",
+        "OccupancyGrid",
+        "PlannerBase",
+        "RRTPlanner",
+        "EKF",
+        "ParticleFilter",
+    ],
+}
+
+_lazy = {name: package for package, names in _exports.items() for name in names}
+_subpackages = ("backends", "mobile", "models", "robot", "tools")
+
+
+def __getattr__(name):
+    if name in _subpackages:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _lazy:
+        package = importlib.import_module(f"{__name__}.{_lazy[name]}")
+        value = getattr(package, name)
+    elif name == "__version__":
+        # the package metadata is slow to import
+        from importlib import metadata
+
+        try:
+            value = metadata.version("roboticstoolbox-python")
+        except metadata.PackageNotFoundError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # later lookups do not come here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy) | set(_subpackages))
 
 
 __all__ = [
@@ -37,6 +167,8 @@ __all__ = [
     "Gripper",
     "ET",
     "ET2",
+    "DynamicsCode",
+    "DynamicsEnsemble",
     # tools
     "null",
     "angle_axis",
@@ -59,6 +191,7 @@ __all__ = [
     "rtb_load_matfile",
     "rtb_load_jsonfile",
     "rtb_path_to_datafile",
+    "rtb_cache_dir",
     "rtb_set_param",
     "rtb_get_param",
     # mobile
@@ -95,9 +228,3 @@ __all__ = [
     "EKF",
     "ParticleFilter",
 ]
-
-try:
-    import importlib.metadata
-    __version__ = importlib.metadata.version("roboticstoolbox-python")
-except:
-    pass
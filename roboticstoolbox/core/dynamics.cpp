@@ -0,0 +1,668 @@
+/* dynamics.cpp */
+
+#include "dynamics.h"
+#include "linalg.h"
+#include "methods.h"
+#include "structs.h"
+
+#include <Eigen/Dense>
+#include <vector>
+
+// Spatial vectors are ordered [angular; linear] and expressed in the frame
+// of the link they belong to, following Featherstone's notation
+typedef Eigen::Matrix<double, 6, 1> Vector6d;
+typedef Eigen::Matrix<double, 6, 6> Matrix6d;
+typedef Eigen::Map<Vector6d> MapVector6d;
+typedef Eigen::Map<Matrix6d> MapMatrix6d;
+
+static Eigen::Matrix3d _skew(const Eigen::Vector3d &v)
+{
+    Eigen::Matrix3d S;
+
+    S << 0, -v(2), v(1),
+        v(2), 0, -v(0),
+        -v(1), v(0), 0;
+
+    return S;
+}
+
+static Vector6d _crm(const Vector6d &v, const Vector6d &m)
+{
+    // The spatial cross product of motion vectors, v x m
+    Vector6d ret;
+
+    ret.head<3>() = v.head<3>().cross(m.head<3>());
+    ret.tail<3>() = v.head<3>().cross(m.tail<3>()) + v.tail<3>().cross(m.head<3>());
+
+    return ret;
+}
+
+static Vector6d _crf(const Vector6d &v, const Vector6d &f)
+{
+    // The spatial cross product of a motion and a force vector, v x* f
+    Vector6d ret;
+
+    ret.head<3>() = v.head<3>().cross(f.head<3>()) + v.tail<3>().cross(f.tail<3>());
+    ret.tail<3>() = v.head<3>().cross(f.tail<3>());
+
+    return ret;
+}
+
+static Matrix6d _body_coriolis(const Vector6d &v, const Matrix6d &I)
+{
+    // The Coriolis matrix of a rigid body with velocity v and spatial
+    // inertia I, B = 1/2 (v x* I + (I v) xbar* - I v x), which makes
+    // Bdot - 2B skew-symmetric
+    Matrix6d B;
+    Vector6d h = I * v;
+
+    for (int k = 0; k < 6; k++)
+    {
+        Vector6d e = Vector6d::Unit(k);
+
+        B.col(k) = 0.5 * (_crf(v, I.col(k)) + _crf(e, h) - I * _crm(v, e));
+    }
+
+    return B;
+}
+
+static void _link_X(ETS *ets, double *q, Matrix6d &X)
+{
+    // The motion transform from the parent link frame to the link frame
+    Matrix4dc T;
+    MapMatrix4dc eT(T.data());
+    Eigen::Matrix3d Rt;
+
+    _ETS_fkine(ets, q, NULL, NULL, eT);
+
+    Rt = T.topLeftCorner<3, 3>().transpose();
+
+    X.topLeftCorner<3, 3>() = Rt;
+    X.topRightCorner<3, 3>().setZero();
+    X.bottomLeftCorner<3, 3>() = -Rt * _skew(T.block<3, 1>(0, 3));
+    X.bottomRightCorner<3, 3>() = Rt;
+}
+
+extern "C"
+{
+
+    int _link_jindex(ETS *ets)
+    {
+        // The joint index of the joint within a link ETS, -1 if the link is
+        // fixed
+        for (int i = 0; i < ets->m; i++)
+        {
+            if (ets->ets[i]->isjoint)
+            {
+                return ets->ets[i]->jindex;
+            }
+        }
+
+        return -1;
+    }
+
+    void _link_S(ETS *ets, double *S)
+    {
+        // The motion subspace of the joint of a link ETS, expressed in the
+        // link frame. Any static transforms which follow the joint move the
+        // axis away from the link origin
+        MapVector6d eS(S);
+        Matrix4dc after = Matrix4dc::Identity();
+        Eigen::Vector3d axis = Eigen::Vector3d::Zero();
+        Eigen::Matrix3d Rt;
+        ET *joint = NULL;
+
+        for (int i = 0; i < ets->m; i++)
+        {
+            ET *et = ets->ets[i];
+
+            if (joint != NULL)
+            {
+                after = after * et->Tm;
+            }
+            else if (et->isjoint)
+            {
+                joint = et;
+            }
+        }
+
+        eS.setZero();
+
+        if (joint == NULL)
+        {
+            return;
+        }
+
+        axis(joint->axis % 3) = joint->isflip ? -1.0 : 1.0;
+        Rt = after.topLeftCorner<3, 3>().transpose();
+
+        if (joint->axis < 3)
+        {
+            eS.head<3>() = Rt * axis;
+            eS.tail<3>() = Rt * axis.cross(after.block<3, 1>(0, 3));
+        }
+        else
+        {
+            eS.tail<3>() = Rt * axis;
+        }
+    }
+
+    void _spatial_inertia(double *params, double *I)
+    {
+        // The spatial inertia about the link origin from the link mass, the
+        // centre of mass and the row-major inertia tensor about the centre
+        // of mass
+        MapMatrix6d eI(I);
+        double m = params[0];
+        Eigen::Matrix3d C = _skew(Eigen::Map<Eigen::Vector3d>(&params[1]));
+        Eigen::Matrix3d Ic = Eigen::Map<Eigen::Matrix<double, 3, 3, Eigen::RowMajor>>(&params[4]);
+
+        eI.topLeftCorner<3, 3>() = Ic + m * C * C.transpose();
+        eI.topRightCorner<3, 3>() = m * C;
+        eI.bottomLeftCorner<3, 3>() = m * C.transpose();
+        eI.bottomRightCorner<3, 3>() = m * Eigen::Matrix3d::Identity();
+    }
+
+    void _Robot_rne(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, double *qd, double *qdd, int n, int trajn,
+        double *gravity, double *fext, int fext_stride, int ee, double *tau, int nthreads)
+    {
+        // Recursive Newton-Euler inverse dynamics of a kinematic tree of nb
+        // links for each of the trajn rows of q, qd and qdd. Links are
+        // ordered so that parent[i] < i, a parent of -1 is the robot base.
+        // Fixed links have no joint and a zero motion subspace, they carry
+        // their inertia and transmit forces to their parent. S holds the
+        // 6-vector motion subspace and I the column-major 6x6 spatial
+        // inertia of each link. I holds ne sets of inertias, an ensemble of
+        // models, and row k uses set k / (trajn / ne). fext is a wrench
+        // [f, m] applied by link ee, fext_stride is 0 when it is shared by
+        // all rows.
+        std::vector<int> jindex(nb);
+
+        for (int i = 0; i < nb; i++)
+        {
+            jindex[i] = _link_jindex(links[i]);
+        }
+
+        _parallel_rows(
+            trajn, nthreads,
+            [&](int start, int stop)
+            {
+                std::vector<Matrix6d> X(nb);
+                std::vector<Vector6d> v(nb), a(nb), f(nb);
+                Vector6d a_grav, vJ, aJ;
+
+                a_grav << 0, 0, 0, -gravity[0], -gravity[1], -gravity[2];
+
+                for (int k = start; k < stop; k++)
+                {
+                    double *Ik = &I[(k / (trajn / ne)) * nb * 36];
+                    double *qk = &q[k * n];
+                    double *qdk = &qd[k * n];
+                    double *qddk = &qdd[k * n];
+                    double *fk = &fext[k * fext_stride];
+                    double *tauk = &tau[k * n];
+
+                    for (int j = 0; j < n; j++)
+                    {
+                        tauk[j] = 0.0;
+                    }
+
+                    // forward recursion
+                    for (int i = 0; i < nb; i++)
+                    {
+                        MapVector6d Si(&S[i * 6]);
+                        MapMatrix6d Ii(&Ik[i * 36]);
+                        int j = jindex[i], p = parent[i];
+
+                        _link_X(links[i], qk, X[i]);
+
+                        if (j >= 0)
+                        {
+                            vJ = Si * qdk[j];
+                            aJ = Si * qddk[j];
+                        }
+                        else
+                        {
+                            vJ.setZero();
+                            aJ.setZero();
+                        }
+
+                        if (p < 0)
+                        {
+                            v[i] = vJ;
+                            a[i] = X[i] * a_grav + aJ;
+                        }
+                        else
+                        {
+                            v[i] = X[i] * v[p] + vJ;
+                            a[i] = X[i] * a[p] + aJ + _crm(v[i], vJ);
+                        }
+
+                        f[i] = Ii * a[i] + _crf(v[i], Ii * v[i]);
+                    }
+
+                    // the wrench applied by the end-effector link
+                    f[ee].head<3>() += Eigen::Map<Eigen::Vector3d>(&fk[3]);
+                    f[ee].tail<3>() += Eigen::Map<Eigen::Vector3d>(&fk[0]);
+
+                    // backward recursion
+                    for (int i = nb - 1; i >= 0; i--)
+                    {
+                        if (jindex[i] >= 0)
+                        {
+                            tauk[jindex[i]] = MapVector6d(&S[i * 6]).dot(f[i]);
+                        }
+
+                        if (parent[i] >= 0)
+                        {
+                            f[parent[i]] += X[i].transpose() * f[i];
+                        }
+                    }
+                }
+            });
+    }
+
+    void _Robot_crba(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, int n, int trajn, double *M, int nthreads)
+    {
+        // Composite-rigid-body joint-space inertia matrix of a kinematic
+        // tree of nb links for each of the trajn rows of q, see _Robot_rne
+        // for the layout of the model. M is (trajn, n, n) and row-major
+        std::vector<int> jindex(nb);
+
+        for (int i = 0; i < nb; i++)
+        {
+            jindex[i] = _link_jindex(links[i]);
+        }
+
+        _parallel_rows(
+            trajn, nthreads,
+            [&](int start, int stop)
+            {
+                std::vector<Matrix6d> X(nb), Ic(nb);
+                Vector6d F;
+
+                for (int k = start; k < stop; k++)
+                {
+                    double *Ik = &I[(k / (trajn / ne)) * nb * 36];
+                    double *qk = &q[k * n];
+                    Eigen::Map<Eigen::MatrixXd> Mk(&M[k * n * n], n, n);
+
+                    Mk.setZero();
+
+                    for (int i = 0; i < nb; i++)
+                    {
+                        _link_X(links[i], qk, X[i]);
+                        Ic[i] = MapMatrix6d(&Ik[i * 36]);
+                    }
+
+                    // accumulate the composite inertia of each subtree
+                    for (int i = nb - 1; i >= 0; i--)
+                    {
+                        if (parent[i] >= 0)
+                        {
+                            Ic[parent[i]] += X[i].transpose() * Ic[i] * X[i];
+                        }
+                    }
+
+                    for (int i = 0; i < nb; i++)
+                    {
+                        int j = jindex[i];
+
+                        if (j < 0)
+                        {
+                            continue;
+                        }
+
+                        F = Ic[i] * MapVector6d(&S[i * 6]);
+                        Mk(j, j) = MapVector6d(&S[i * 6]).dot(F);
+
+                        // the force transmitted to each ancestor joint
+                        for (int a = i; parent[a] >= 0;)
+                        {
+                            F = X[a].transpose() * F;
+                            a = parent[a];
+
+                            if (jindex[a] >= 0)
+                            {
+                                Mk(j, jindex[a]) = Mk(jindex[a], j) = MapVector6d(&S[a * 6]).dot(F);
+                            }
+                        }
+                    }
+                }
+            });
+    }
+
+    void _Robot_aba(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, double *qd, double *tau, double *armature, int n, int trajn,
+        double *gravity, double *qdd, int nthreads)
+    {
+        // Articulated-body forward dynamics of a kinematic tree of nb links
+        // for each of the trajn rows of q, qd and tau, see _Robot_rne for the
+        // layout of the model. armature is the (n,) inertia added to each
+        // joint, such as the reflected motor inertia
+        std::vector<int> jindex(nb);
+
+        for (int i = 0; i < nb; i++)
+        {
+            jindex[i] = _link_jindex(links[i]);
+        }
+
+        _parallel_rows(
+            trajn, nthreads,
+            [&](int start, int stop)
+            {
+                std::vector<Matrix6d> X(nb), IA(nb);
+                std::vector<Vector6d> v(nb), c(nb), pA(nb), U(nb), a(nb);
+                std::vector<double> D(nb), u(nb);
+                Matrix6d Ia;
+                Vector6d a_grav, vJ, pa;
+
+                a_grav << 0, 0, 0, -gravity[0], -gravity[1], -gravity[2];
+
+                for (int k = start; k < stop; k++)
+                {
+                    double *Ik = &I[(k / (trajn / ne)) * nb * 36];
+                    double *qk = &q[k * n];
+                    double *qdk = &qd[k * n];
+                    double *tauk = &tau[k * n];
+                    double *qddk = &qdd[k * n];
+
+                    // velocities and bias forces
+                    for (int i = 0; i < nb; i++)
+                    {
+                        MapMatrix6d Ii(&Ik[i * 36]);
+                        int j = jindex[i], p = parent[i];
+
+                        _link_X(links[i], qk, X[i]);
+
+                        if (j >= 0)
+                        {
+                            vJ = MapVector6d(&S[i * 6]) * qdk[j];
+                        }
+                        else
+                        {
+                            vJ.setZero();
+                        }
+
+                        v[i] = p < 0 ? vJ : Vector6d(X[i] * v[p] + vJ);
+                        c[i] = _crm(v[i], vJ);
+                        IA[i] = Ii;
+                        pA[i] = _crf(v[i], Ii * v[i]);
+                    }
+
+                    // articulated-body inertias, fixed links pass theirs on
+                    for (int i = nb - 1; i >= 0; i--)
+                    {
+                        MapVector6d Si(&S[i * 6]);
+                        int j = jindex[i];
+
+                        if (j >= 0)
+                        {
+                            U[i] = IA[i] * Si;
+                            D[i] = Si.dot(U[i]) + armature[j];
+                            u[i] = tauk[j] - Si.dot(pA[i]);
+                            Ia = IA[i] - U[i] * U[i].transpose() / D[i];
+                            pa = pA[i] + Ia * c[i] + U[i] * u[i] / D[i];
+                        }
+                        else
+                        {
+                            Ia = IA[i];
+                            pa = pA[i] + Ia * c[i];
+                        }
+
+                        if (parent[i] >= 0)
+                        {
+                            IA[parent[i]] += X[i].transpose() * Ia * X[i];
+                            pA[parent[i]] += X[i].transpose() * pa;
+                        }
+                    }
+
+                    // accelerations
+                    for (int i = 0; i < nb; i++)
+                    {
+                        int j = jindex[i], p = parent[i];
+
+                        a[i] = X[i] * (p < 0 ? a_grav : a[p]) + c[i];
+
+                        if (j >= 0)
+                        {
+                            qddk[j] = (u[i] - U[i].dot(a[i])) / D[i];
+                            a[i] += MapVector6d(&S[i * 6]) * qddk[j];
+                        }
+                    }
+                }
+            });
+    }
+
+    void _Robot_coriolis(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, double *qd, int n, int trajn, double *C, int nthreads)
+    {
+        // The Coriolis and centripetal matrix, consistent with the
+        // Christoffel symbols of the inertia matrix, of a kinematic tree of
+        // nb links for each of the trajn rows of q and qd, see _Robot_rne for
+        // the layout of the model. C is (trajn, n, n) and row-major.
+        //
+        // S. Echeandia and P. M. Wensing, "Numerical Methods to Compute the
+        // Coriolis Matrix and Christoffel Symbols for Rigid-Body Systems",
+        // Journal of Computational and Nonlinear Dynamics, 2021.
+        std::vector<int> jindex(nb);
+
+        for (int i = 0; i < nb; i++)
+        {
+            jindex[i] = _link_jindex(links[i]);
+        }
+
+        _parallel_rows(
+            trajn, nthreads,
+            [&](int start, int stop)
+            {
+                std::vector<Matrix6d> X(nb), Ic(nb), Bc(nb);
+                std::vector<Vector6d> v(nb), Sd(nb);
+                Vector6d f1, f2, f3;
+
+                for (int k = start; k < stop; k++)
+                {
+                    double *Ik = &I[(k / (trajn / ne)) * nb * 36];
+                    double *qk = &q[k * n];
+                    double *qdk = &qd[k * n];
+                    Eigen::Map<Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>> Ck(
+                        &C[k * n * n], n, n);
+
+                    Ck.setZero();
+
+                    // link velocities and the rate of change of the joint
+                    // axes
+                    for (int i = 0; i < nb; i++)
+                    {
+                        MapVector6d Si(&S[i * 6]);
+                        int j = jindex[i], p = parent[i];
+
+                        _link_X(links[i], qk, X[i]);
+
+                        v[i] = p < 0 ? Vector6d::Zero() : Vector6d(X[i] * v[p]);
+
+                        if (j >= 0)
+                        {
+                            v[i] += Si * qdk[j];
+                        }
+
+                        Sd[i] = _crm(v[i], Si);
+                        Ic[i] = MapMatrix6d(&Ik[i * 36]);
+                        Bc[i] = _body_coriolis(v[i], Ic[i]);
+                    }
+
+                    for (int i = nb - 1; i >= 0; i--)
+                    {
+                        MapVector6d Si(&S[i * 6]);
+                        int ji = jindex[i];
+
+                        if (ji >= 0)
+                        {
+                            f1 = Ic[i] * Sd[i] + Bc[i] * Si;
+                            f2 = Ic[i] * Si;
+                            f3 = Bc[i].transpose() * Si;
+
+                            // the entries of each ancestor joint
+                            for (int a = i;; a = parent[a])
+                            {
+                                int ja = jindex[a];
+
+                                if (ja >= 0)
+                                {
+                                    MapVector6d Sa(&S[a * 6]);
+
+                                    Ck(ja, ji) = Sa.dot(f1);
+                                    Ck(ji, ja) = Sd[a].dot(f2) + Sa.dot(f3);
+                                }
+
+                                if (parent[a] < 0)
+                                {
+                                    break;
+                                }
+
+                                f1 = X[a].transpose() * f1;
+                                f2 = X[a].transpose() * f2;
+                                f3 = X[a].transpose() * f3;
+                            }
+                        }
+
+                        // the composite inertia and Coriolis matrices
+                        if (parent[i] >= 0)
+                        {
+                            Ic[parent[i]] += X[i].transpose() * Ic[i] * X[i];
+                            Bc[parent[i]] += X[i].transpose() * Bc[i] * X[i];
+                        }
+                    }
+                }
+            });
+    }
+
+    void _Robot_regressor(
+        ETS **links, int nb, int *parent, double *S,
+        double *q, double *qd, double *qdd, int n, int trajn,
+        double *gravity, double *Y, int nthreads)
+    {
+        // The regressor of the inverse dynamics of a kinematic tree of nb
+        // links for each of the trajn rows of q, qd and qdd, see _Robot_rne
+        // for the layout of the model. tau = Y pi where pi holds the 10
+        // inertial parameters of each link
+        //     [m, m cx, m cy, m cz, Ixx, Ixy, Iyy, Ixz, Iyz, Izz]
+        // with the inertia tensor about the link origin. Y is
+        // (trajn, n, 10 nb) and row-major.
+        std::vector<int> jindex(nb);
+        Matrix6d basis[10];
+
+        for (int i = 0; i < nb; i++)
+        {
+            jindex[i] = _link_jindex(links[i]);
+        }
+
+        // the spatial inertia of each unit inertial parameter
+        for (int p = 0; p < 10; p++)
+        {
+            basis[p].setZero();
+        }
+
+        basis[0].bottomRightCorner<3, 3>() = Eigen::Matrix3d::Identity();
+
+        for (int c = 0; c < 3; c++)
+        {
+            Eigen::Matrix3d C = _skew(Eigen::Vector3d::Unit(c));
+
+            basis[1 + c].topRightCorner<3, 3>() = C;
+            basis[1 + c].bottomLeftCorner<3, 3>() = C.transpose();
+        }
+
+        int tensor[6][2] = {{0, 0}, {0, 1}, {1, 1}, {0, 2}, {1, 2}, {2, 2}};
+
+        for (int p = 0; p < 6; p++)
+        {
+            basis[4 + p](tensor[p][0], tensor[p][1]) = 1.0;
+            basis[4 + p](tensor[p][1], tensor[p][0]) = 1.0;
+        }
+
+        _parallel_rows(
+            trajn, nthreads,
+            [&](int start, int stop)
+            {
+                typedef Eigen::Matrix<double, 6, 10> Matrix6x10d;
+                std::vector<Matrix6d> X(nb);
+                std::vector<Vector6d> v(nb), a(nb);
+                Matrix6x10d A;
+                Vector6d a_grav, vJ;
+
+                a_grav << 0, 0, 0, -gravity[0], -gravity[1], -gravity[2];
+
+                for (int k = start; k < stop; k++)
+                {
+                    double *qk = &q[k * n];
+                    double *qdk = &qd[k * n];
+                    double *qddk = &qdd[k * n];
+                    Eigen::Map<Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>> Yk(
+                        &Y[k * n * 10 * nb], n, 10 * nb);
+
+                    Yk.setZero();
+
+                    // forward recursion, as for _Robot_rne
+                    for (int i = 0; i < nb; i++)
+                    {
+                        MapVector6d Si(&S[i * 6]);
+                        int j = jindex[i], p = parent[i];
+
+                        _link_X(links[i], qk, X[i]);
+
+                        vJ = j >= 0 ? Vector6d(Si * qdk[j]) : Vector6d::Zero();
+
+                        if (p < 0)
+                        {
+                            v[i] = vJ;
+                            a[i] = X[i] * a_grav;
+                        }
+                        else
+                        {
+                            v[i] = X[i] * v[p] + vJ;
+                            a[i] = X[i] * a[p] + _crm(v[i], vJ);
+                        }
+
+                        if (j >= 0)
+                        {
+                            a[i] += Si * qddk[j];
+                        }
+                    }
+
+                    for (int i = 0; i < nb; i++)
+                    {
+                        // the force on the link is linear in its parameters
+                        for (int p = 0; p < 10; p++)
+                        {
+                            A.col(p) = basis[p] * a[i] + _crf(v[i], basis[p] * v[i]);
+                        }
+
+                        // the force transmitted to each ancestor joint
+                        for (int b = i;; b = parent[b])
+                        {
+                            if (jindex[b] >= 0)
+                            {
+                                Yk.block<1, 10>(jindex[b], 10 * i) =
+                                    MapVector6d(&S[b * 6]).transpose() * A;
+                            }
+
+                            if (parent[b] < 0)
+                            {
+                                break;
+                            }
+
+                            A = X[b].transpose() * A;
+                        }
+                    }
+                }
+            });
+    }
+
+} /* extern "C" */
@@ -0,0 +1,45 @@
+/**
+ * \file dynamics.h
+ * \author Jesse Haviland
+ *
+ */
+/* dynamics.h */
+
+#ifndef _DYNAMICS_H_
+#define _DYNAMICS_H_
+
+#include "structs.h"
+#include "linalg.h"
+
+#ifdef __cplusplus
+extern "C"
+{
+#endif /* __cplusplus */
+
+    int _link_jindex(ETS *ets);
+    void _link_S(ETS *ets, double *S);
+    void _spatial_inertia(double *params, double *I);
+    void _Robot_rne(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, double *qd, double *qdd, int n, int trajn,
+        double *gravity, double *fext, int fext_stride, int ee, double *tau, int nthreads);
+    void _Robot_crba(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, int n, int trajn, double *M, int nthreads);
+    void _Robot_aba(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, double *qd, double *tau, double *armature, int n, int trajn,
+        double *gravity, double *qdd, int nthreads);
+    void _Robot_coriolis(
+        ETS **links, int nb, int *parent, double *S, double *I, int ne,
+        double *q, double *qd, int n, int trajn, double *C, int nthreads);
+    void _Robot_regressor(
+        ETS **links, int nb, int *parent, double *S,
+        double *q, double *qd, double *qdd, int n, int trajn,
+        double *gravity, double *Y, int nthreads);
+
+#ifdef __cplusplus
+} /* extern "C" */
+#endif /* __cplusplus */
+
+#endif
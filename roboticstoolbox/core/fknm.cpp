@@ -9,6 +9,7 @@
 
 #include "fknm.h"
 #include "methods.h"
+#include "dynamics.h"
 #include "ik.h"
 #include "linalg.h"
 #include "structs.h"
@@ -37,6 +38,10 @@ static PyMethodDef fknmMethods[] = {
      (PyCFunction)IK_LM_c,
      METH_VARARGS,
      "Link"},
+    {"IK_QP_c",
+     (PyCFunction)IK_QP_c,
+     METH_VARARGS,
+     "Link"},
     // {"IK_LM_Wampler_c",
     //  (PyCFunction)IK_LM_Wampler_c,
     //  METH_VARARGS,
@@ -49,6 +54,26 @@ static PyMethodDef fknmMethods[] = {
      (PyCFunction)Robot_link_T,
      METH_VARARGS,
      "Link"},
+    {"Robot_rne",
+     (PyCFunction)Robot_rne,
+     METH_VARARGS,
+     "Link"},
+    {"Robot_crba",
+     (PyCFunction)Robot_crba,
+     METH_VARARGS,
+     "Link"},
+    {"Robot_aba",
+     (PyCFunction)Robot_aba,
+     METH_VARARGS,
+     "Link"},
+    {"Robot_coriolis",
+     (PyCFunction)Robot_coriolis,
+     METH_VARARGS,
+     "Link"},
+    {"Robot_regressor",
+     (PyCFunction)Robot_regressor,
+     METH_VARARGS,
+     "Link"},
     {"ETS_hessian0",
      (PyCFunction)ETS_hessian0,
      METH_VARARGS,
@@ -69,6 +94,14 @@ static PyMethodDef fknmMethods[] = {
      (PyCFunction)ETS_fkine,
      METH_VARARGS,
      "Link"},
+    {"ETS_fkine_batch",
+     (PyCFunction)ETS_fkine_batch,
+     METH_VARARGS,
+     "Link"},
+    {"ETS_jacob_batch",
+     (PyCFunction)ETS_jacob_batch,
+     METH_VARARGS,
+     "Link"},
     {"ETS_init",
      (PyCFunction)ETS_init,
      METH_VARARGS,
@@ -244,7 +277,10 @@ extern "C"
         np_ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
         MapVectorX ret(np_ret, ets->n);
 
+        // Solve without holding the GIL so poses can be solved in parallel
+        Py_BEGIN_ALLOW_THREADS;
         _IK_GN(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, use_pinv, pinv_damping);
+        Py_END_ALLOW_THREADS;
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -359,7 +395,10 @@ extern "C"
         np_ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
         MapVectorX ret(np_ret, ets->n);
 
+        // Solve without holding the GIL so poses can be solved in parallel
+        Py_BEGIN_ALLOW_THREADS;
         _IK_NR(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, use_pinv, pinv_damping);
+        Py_END_ALLOW_THREADS;
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -478,6 +517,8 @@ extern "C"
         // std::cout << Tep << std::endl;
         // std::cout << ret << std::endl;
 
+        // Solve without holding the GIL so poses can be solved in parallel
+        Py_BEGIN_ALLOW_THREADS;
         if (method[0] == 's')
         {
             // std::cout << "sugi" << std::endl;
@@ -493,6 +534,7 @@ extern "C"
             // std::cout << "chan" << std::endl;
             _IK_LM_Chan(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we);
         }
+        Py_END_ALLOW_THREADS;
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -524,6 +566,155 @@ extern "C"
         return py_tup;
     }
 
+    static PyObject *IK_QP_c(PyObject *self, PyObject *args)
+    {
+        ETS *ets;
+        npy_float64 *np_Tep, *np_ret, *np_q0, *np_we, *np_pi;
+        PyArrayObject *py_np_Tep;
+        PyObject *py_ets, *py_ret, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
+        PyObject *py_pi, *py_np_pi;
+        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E;
+        npy_intp dim[1] = {1};
+        int ilimit, slimit, q0_used = 0, we_used = 0, reject_jl;
+        double tol, E, kj, ks, kq, ps;
+
+        int it = 0, search = 1, solution = 0;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOiidiOddddO",
+                &py_ets,
+                &py_Tep,
+                &py_q0,
+                &ilimit,
+                &slimit,
+                &tol,
+                &reject_jl,
+                &py_we,
+                &kj,
+                &ks,
+                &kq,
+                &ps,
+                &py_pi))
+            return NULL;
+
+        if (!_check_array_type(py_Tep))
+            return NULL;
+
+        // Extract the ETS object from the python object
+        if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+            return NULL;
+
+        // Assign empty q0 and we
+        MapVectorX q0(NULL, 0);
+        MapVectorX we(NULL, 0);
+
+        // Check if q0 is None
+        if (py_q0 != Py_None)
+        {
+            // Make sure q is number array
+            // Cast to numpy array
+            // Get data out
+            if (!_check_array_type(py_q0))
+                return NULL;
+            q0_used = 1;
+            py_np_q0 = (PyObject *)PyArray_FROMANY(py_q0, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            np_q0 = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q0);
+            new (&q0) MapVectorX(np_q0, ets->n);
+        }
+
+        // Check if we is None
+        if (py_we != Py_None)
+        {
+            // Make sure we is number array
+            // Cast to numpy array
+            // Get data out
+            if (!_check_array_type(py_we))
+                return NULL;
+            we_used = 1;
+            py_np_we = (PyObject *)PyArray_FROMANY(py_we, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            np_we = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_we);
+            new (&we) MapVectorX(np_we, 6);
+        }
+
+        // Make sure pi is number array
+        // Cast to numpy array
+        // Get data out
+        if (!_check_array_type(py_pi))
+            return NULL;
+        py_np_pi = (PyObject *)PyArray_FROMANY(py_pi, NPY_DOUBLE, 1, 1, NPY_ARRAY_F_CONTIGUOUS);
+
+        if (py_np_pi == NULL)
+            return NULL;
+
+        if (PyArray_SIZE((PyArrayObject *)py_np_pi) != ets->n)
+        {
+            Py_DECREF(py_np_pi);
+
+            if (q0_used)
+                Py_DECREF(py_np_q0);
+
+            if (we_used)
+                Py_DECREF(py_np_we);
+
+            PyErr_SetString(PyExc_ValueError, "pi must have one element per joint");
+            return NULL;
+        }
+
+        np_pi = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_pi);
+        MapVectorX pi(np_pi, ets->n);
+
+        // Set the dimension of the returned array to match the number of joints
+        dim[0] = ets->n;
+
+        py_np_Tep = (PyArrayObject *)PyArray_FROMANY(py_Tep, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
+        np_Tep = (npy_float64 *)PyArray_DATA(py_np_Tep);
+
+        // Tep in row major from Python
+        MapMatrix4dr row_Tep(np_Tep);
+
+        // Convert to col major here
+        Matrix4dc Tep = row_Tep;
+
+        py_ret = PyArray_EMPTY(1, dim, NPY_DOUBLE, 0);
+        np_ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
+        MapVectorX ret(np_ret, ets->n);
+
+        // Solve without holding the GIL so poses can be solved in parallel
+        Py_BEGIN_ALLOW_THREADS;
+        _IK_QP(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, kj, ks, kq, ps, pi);
+        Py_END_ALLOW_THREADS;
+
+        // Free the memory
+        Py_DECREF(py_np_Tep);
+        Py_DECREF(py_np_pi);
+
+        if (q0_used)
+        {
+            Py_DECREF(py_np_q0);
+        }
+
+        if (we_used)
+        {
+            Py_DECREF(py_np_we);
+        }
+
+        // Build the return tuple
+        py_it = Py_BuildValue("i", it);
+        py_search = Py_BuildValue("i", search);
+        py_solution = Py_BuildValue("i", solution);
+        py_E = Py_BuildValue("d", E);
+
+        py_tup = PyTuple_Pack(5, py_ret, py_solution, py_it, py_search, py_E);
+
+        Py_DECREF(py_it);
+        Py_DECREF(py_search);
+        Py_DECREF(py_solution);
+        Py_DECREF(py_E);
+        Py_DECREF(py_ret);
+
+        return py_tup;
+    }
+
     static PyObject *Robot_link_T(PyObject *self, PyObject *args)
     {
         ETS *ets;
@@ -551,33 +742,628 @@ extern "C"
         }
         else
         {
-            py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
-            q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
-            q_used = 1;
+            py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
+            q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
+            q_used = 1;
+        }
+
+        n_links = PyList_GET_SIZE(ets_list);
+        for (int i = 0; i < n_links; i++)
+        {
+            PyObject *py_ets = PyList_GET_ITEM(ets_list, i);
+            // Extract the ETS object from the python object
+            if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+                return NULL;
+
+            npy_float64 *T = (npy_float64 *)PyArray_DATA((PyArrayObject *)PyList_GET_ITEM(T_list, i));
+            MapMatrix4dc eT(T);
+
+            // TODO Add this back
+            _ETS_fkine(ets, q, NULL, NULL, eT);
+        }
+
+        // Free the memory
+        if (q_used)
+        {
+            Py_DECREF(py_np_q);
+        }
+
+        Py_RETURN_NONE;
+    }
+
+    int _robot_tree(PyObject *py_links, PyObject *py_parent, int n, RobotModel *model)
+    {
+        // Fills the kinematic tree of model from
+        // links - a list of the ETS of each link, holding at most one joint
+        // parent - (nb,) array of the index of the parent of each link, -1
+        //     for the base, and parent[i] < i
+        // where n is the number of columns of q. Returns 0 and sets an
+        // exception on failure
+        int nb;
+
+        model->links = NULL;
+        model->S = NULL;
+        model->I = NULL;
+        model->ne = 0;
+        model->py_parent = NULL;
+
+        if (!PyList_Check(py_links))
+        {
+            PyErr_SetString(PyExc_TypeError, "links must be a list");
+            return 0;
+        }
+
+        nb = model->nb = (int)PyList_GET_SIZE(py_links);
+
+        if (nb < 1)
+        {
+            PyErr_SetString(PyExc_ValueError, "the robot has no links");
+            return 0;
+        }
+
+        model->py_parent = PyArray_FROMANY(py_parent, NPY_INT, 1, 1, NPY_ARRAY_C_CONTIGUOUS | NPY_ARRAY_FORCECAST);
+
+        if (model->py_parent == NULL || PyArray_SIZE((PyArrayObject *)model->py_parent) != nb)
+        {
+            if (!PyErr_Occurred())
+                PyErr_SetString(PyExc_ValueError, "parent must have one element per link");
+
+            return 0;
+        }
+
+        model->parent = (int *)PyArray_DATA((PyArrayObject *)model->py_parent);
+        model->links = (ETS **)PyMem_RawMalloc(nb * sizeof(ETS *));
+        model->S = (npy_float64 *)PyMem_RawMalloc(nb * 6 * sizeof(npy_float64));
+
+        for (int i = 0; i < nb; i++)
+        {
+            ETS *ets = (ETS *)PyCapsule_GetPointer(PyList_GET_ITEM(py_links, i), "ETS");
+
+            if (ets == NULL || model->parent[i] >= i || _link_jindex(ets) >= n || n <= _ETS_max_jindex(ets))
+            {
+                if (!PyErr_Occurred())
+                {
+                    PyErr_SetString(
+                        PyExc_ValueError,
+                        model->parent[i] >= i ? "links must be ordered after their parent"
+                                              : "q has fewer columns than the joints of the links");
+                }
+
+                return 0;
+            }
+
+            model->links[i] = ets;
+            _link_S(ets, &model->S[i * 6]);
+        }
+
+        return 1;
+    }
+
+    int _robot_model(PyObject *py_links, PyObject *py_parent, PyObject *py_inertia, int n, int trajn, RobotModel *model)
+    {
+        // Fills model from the kinematic tree, see _robot_tree, and
+        // inertia - (nb, 13) array of link mass, centre of mass and the
+        //     row-major inertia tensor about the centre of mass, or an
+        //     (ne, nb, 13) array of an ensemble of ne models
+        // where trajn is the number of rows of q, which must be a multiple
+        // of ne. Returns 0 and sets an exception on failure
+        PyObject *py_np_inertia;
+        npy_float64 *inertia;
+        int nb;
+
+        if (!_robot_tree(py_links, py_parent, n, model))
+            return 0;
+
+        nb = model->nb;
+
+        if (!_check_array_type(py_inertia))
+            return 0;
+
+        py_np_inertia = PyArray_FROMANY(py_inertia, NPY_DOUBLE, 1, 3, NPY_ARRAY_C_CONTIGUOUS);
+
+        if (py_np_inertia == NULL)
+            return 0;
+
+        if (PyArray_NDIM((PyArrayObject *)py_np_inertia) == 3)
+            model->ne = (int)PyArray_DIM((PyArrayObject *)py_np_inertia, 0);
+        else
+            model->ne = 1;
+
+        if (PyArray_SIZE((PyArrayObject *)py_np_inertia) != 13 * nb * model->ne)
+        {
+            Py_DECREF(py_np_inertia);
+            PyErr_SetString(PyExc_ValueError, "inertia must be (nb, 13) or (ne, nb, 13)");
+            return 0;
+        }
+
+        if (model->ne < 1 || trajn % model->ne != 0)
+        {
+            Py_DECREF(py_np_inertia);
+            PyErr_SetString(PyExc_ValueError, "the rows of q must be a multiple of the models in inertia");
+            return 0;
+        }
+
+        inertia = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_inertia);
+        model->I = (npy_float64 *)PyMem_RawMalloc(model->ne * nb * 36 * sizeof(npy_float64));
+
+        for (int i = 0; i < model->ne * nb; i++)
+        {
+            _spatial_inertia(&inertia[i * 13], &model->I[i * 36]);
+        }
+
+        Py_DECREF(py_np_inertia);
+
+        return 1;
+    }
+
+    void _robot_model_free(RobotModel *model)
+    {
+        PyMem_RawFree(model->links);
+        PyMem_RawFree(model->S);
+        PyMem_RawFree(model->I);
+        Py_XDECREF(model->py_parent);
+    }
+
+    static PyObject *Robot_rne(PyObject *self, PyObject *args)
+    {
+        RobotModel model;
+        npy_intp dim2[2];
+        int nthreads, n, trajn, fext_stride, ee;
+        PyObject *py_links, *py_parent, *py_inertia, *py_q, *py_qd, *py_qdd, *py_gravity, *py_fext;
+        PyObject *py_out = Py_None, *py_ret = NULL;
+        PyObject *arrays[5] = {NULL, NULL, NULL, NULL, NULL};
+        PyArrayObject *np_q, *np_qd, *np_qdd, *np_gravity, *np_fext;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOOOOOOii|O",
+                &py_links,
+                &py_parent,
+                &py_inertia,
+                &py_q,
+                &py_qd,
+                &py_qdd,
+                &py_gravity,
+                &py_fext,
+                &ee,
+                &nthreads,
+                &py_out))
+            return NULL;
+
+        // Inputs are:
+        // links, parent, inertia - the robot model, see _robot_model
+        // q, qd, qdd - (trajn, n) arrays
+        // gravity - (3,) array
+        // fext - (6,) array applied at every row or (trajn, 6) array
+        // ee - the index of the link which applies fext
+        PyObject *inputs[5] = {py_q, py_qd, py_qdd, py_gravity, py_fext};
+
+        for (int i = 0; i < 5; i++)
+        {
+            if (!_check_array_type(inputs[i]))
+                goto fail;
+
+            arrays[i] = PyArray_FROMANY(inputs[i], NPY_DOUBLE, 1, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+            if (arrays[i] == NULL)
+                goto fail;
+        }
+
+        np_q = (PyArrayObject *)arrays[0];
+        np_qd = (PyArrayObject *)arrays[1];
+        np_qdd = (PyArrayObject *)arrays[2];
+        np_gravity = (PyArrayObject *)arrays[3];
+        np_fext = (PyArrayObject *)arrays[4];
+
+        if (PyArray_NDIM(np_q) != 2 || !PyArray_SAMESHAPE(np_q, np_qd) || !PyArray_SAMESHAPE(np_q, np_qdd))
+        {
+            PyErr_SetString(PyExc_ValueError, "q, qd and qdd must be (trajn, n) arrays");
+            goto fail;
+        }
+
+        trajn = (int)PyArray_DIM(np_q, 0);
+        n = (int)PyArray_DIM(np_q, 1);
+
+        if (PyArray_SIZE(np_gravity) != 3)
+        {
+            PyErr_SetString(PyExc_ValueError, "gravity must be (3,)");
+            goto fail;
+        }
+
+        if (PyArray_SIZE(np_fext) == 6)
+        {
+            fext_stride = 0;
+        }
+        else if (PyArray_SIZE(np_fext) == 6 * trajn)
+        {
+            fext_stride = 6;
+        }
+        else
+        {
+            PyErr_SetString(PyExc_ValueError, "fext must be (6,) or (trajn, 6)");
+            goto fail;
+        }
+
+        if (!_robot_model(py_links, py_parent, py_inertia, n, trajn, &model))
+        {
+            _robot_model_free(&model);
+            goto fail;
+        }
+
+        if (ee < 0 || ee >= model.nb)
+        {
+            _robot_model_free(&model);
+            PyErr_SetString(PyExc_ValueError, "ee is not a link");
+            goto fail;
+        }
+
+        dim2[0] = trajn;
+        dim2[1] = n;
+        py_ret = _out_array(py_out, 2, dim2, 0, NULL);
+
+        if (py_ret != NULL)
+        {
+            // Do the actual job without holding the GIL
+            Py_BEGIN_ALLOW_THREADS;
+            _Robot_rne(
+                model.links, model.nb, model.parent, model.S, model.I, model.ne,
+                (npy_float64 *)PyArray_DATA(np_q),
+                (npy_float64 *)PyArray_DATA(np_qd),
+                (npy_float64 *)PyArray_DATA(np_qdd),
+                n, trajn,
+                (npy_float64 *)PyArray_DATA(np_gravity),
+                (npy_float64 *)PyArray_DATA(np_fext),
+                fext_stride,
+                ee,
+                (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret),
+                nthreads);
+            Py_END_ALLOW_THREADS;
+        }
+
+        _robot_model_free(&model);
+
+    fail:
+        for (int i = 0; i < 5; i++)
+            Py_XDECREF(arrays[i]);
+
+        return py_ret;
+    }
+
+    static PyObject *Robot_crba(PyObject *self, PyObject *args)
+    {
+        RobotModel model;
+        npy_intp dim3[3];
+        int nthreads, n, trajn;
+        PyObject *py_links, *py_parent, *py_inertia, *py_q, *py_np_q;
+        PyObject *py_out = Py_None, *py_ret = NULL;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOOi|O",
+                &py_links,
+                &py_parent,
+                &py_inertia,
+                &py_q,
+                &nthreads,
+                &py_out))
+            return NULL;
+
+        // Inputs are:
+        // links, parent, inertia - the robot model, see _robot_model
+        // q - (trajn, n) array
+        // returns the (trajn, n, n) joint-space inertia matrices
+        if (!_check_array_type(py_q))
+            return NULL;
+
+        py_np_q = PyArray_FROMANY(py_q, NPY_DOUBLE, 2, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+        if (py_np_q == NULL)
+            return NULL;
+
+        trajn = (int)PyArray_DIM((PyArrayObject *)py_np_q, 0);
+        n = (int)PyArray_DIM((PyArrayObject *)py_np_q, 1);
+
+        if (_robot_model(py_links, py_parent, py_inertia, n, trajn, &model))
+        {
+            dim3[0] = trajn;
+            dim3[1] = n;
+            dim3[2] = n;
+            py_ret = _out_array(py_out, 3, dim3, 0, NULL);
+
+            if (py_ret != NULL)
+            {
+                // Do the actual job without holding the GIL
+                Py_BEGIN_ALLOW_THREADS;
+                _Robot_crba(
+                    model.links, model.nb, model.parent, model.S, model.I, model.ne,
+                    (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q),
+                    n, trajn,
+                    (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret),
+                    nthreads);
+                Py_END_ALLOW_THREADS;
+            }
+        }
+
+        _robot_model_free(&model);
+        Py_DECREF(py_np_q);
+
+        return py_ret;
+    }
+
+    static PyObject *Robot_aba(PyObject *self, PyObject *args)
+    {
+        RobotModel model;
+        npy_intp dim2[2];
+        int nthreads, n, trajn;
+        PyObject *py_links, *py_parent, *py_inertia, *py_q, *py_qd, *py_tau, *py_armature, *py_gravity;
+        PyObject *py_out = Py_None, *py_ret = NULL;
+        PyObject *arrays[5] = {NULL, NULL, NULL, NULL, NULL};
+        PyArrayObject *np_q, *np_qd, *np_tau, *np_armature, *np_gravity;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOOOOOOi|O",
+                &py_links,
+                &py_parent,
+                &py_inertia,
+                &py_q,
+                &py_qd,
+                &py_tau,
+                &py_armature,
+                &py_gravity,
+                &nthreads,
+                &py_out))
+            return NULL;
+
+        // Inputs are:
+        // links, parent, inertia - the robot model, see _robot_model
+        // q, qd, tau - (trajn, n) arrays
+        // armature - (n,) array of inertia added to each joint
+        // gravity - (3,) array
+        // returns the (trajn, n) joint accelerations
+        PyObject *inputs[5] = {py_q, py_qd, py_tau, py_armature, py_gravity};
+
+        for (int i = 0; i < 5; i++)
+        {
+            if (!_check_array_type(inputs[i]))
+                goto fail;
+
+            arrays[i] = PyArray_FROMANY(inputs[i], NPY_DOUBLE, 1, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+            if (arrays[i] == NULL)
+                goto fail;
+        }
+
+        np_q = (PyArrayObject *)arrays[0];
+        np_qd = (PyArrayObject *)arrays[1];
+        np_tau = (PyArrayObject *)arrays[2];
+        np_armature = (PyArrayObject *)arrays[3];
+        np_gravity = (PyArrayObject *)arrays[4];
+
+        if (PyArray_NDIM(np_q) != 2 || !PyArray_SAMESHAPE(np_q, np_qd) || !PyArray_SAMESHAPE(np_q, np_tau))
+        {
+            PyErr_SetString(PyExc_ValueError, "q, qd and tau must be (trajn, n) arrays");
+            goto fail;
+        }
+
+        trajn = (int)PyArray_DIM(np_q, 0);
+        n = (int)PyArray_DIM(np_q, 1);
+
+        if (PyArray_SIZE(np_armature) != n)
+        {
+            PyErr_SetString(PyExc_ValueError, "armature must be (n,)");
+            goto fail;
+        }
+
+        if (PyArray_SIZE(np_gravity) != 3)
+        {
+            PyErr_SetString(PyExc_ValueError, "gravity must be (3,)");
+            goto fail;
+        }
+
+        if (_robot_model(py_links, py_parent, py_inertia, n, trajn, &model))
+        {
+            dim2[0] = trajn;
+            dim2[1] = n;
+            py_ret = _out_array(py_out, 2, dim2, 0, NULL);
+
+            if (py_ret != NULL)
+            {
+                // Do the actual job without holding the GIL
+                Py_BEGIN_ALLOW_THREADS;
+                _Robot_aba(
+                    model.links, model.nb, model.parent, model.S, model.I, model.ne,
+                    (npy_float64 *)PyArray_DATA(np_q),
+                    (npy_float64 *)PyArray_DATA(np_qd),
+                    (npy_float64 *)PyArray_DATA(np_tau),
+                    (npy_float64 *)PyArray_DATA(np_armature),
+                    n, trajn,
+                    (npy_float64 *)PyArray_DATA(np_gravity),
+                    (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret),
+                    nthreads);
+                Py_END_ALLOW_THREADS;
+            }
+        }
+
+        _robot_model_free(&model);
+
+    fail:
+        for (int i = 0; i < 5; i++)
+            Py_XDECREF(arrays[i]);
+
+        return py_ret;
+    }
+
+    static PyObject *Robot_coriolis(PyObject *self, PyObject *args)
+    {
+        RobotModel model;
+        npy_intp dim3[3];
+        int nthreads, n, trajn;
+        PyObject *py_links, *py_parent, *py_inertia, *py_q, *py_qd;
+        PyObject *py_out = Py_None, *py_ret = NULL;
+        PyObject *arrays[2] = {NULL, NULL};
+        PyArrayObject *np_q, *np_qd;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOOOi|O",
+                &py_links,
+                &py_parent,
+                &py_inertia,
+                &py_q,
+                &py_qd,
+                &nthreads,
+                &py_out))
+            return NULL;
+
+        // Inputs are:
+        // links, parent, inertia - the robot model, see _robot_model
+        // q, qd - (trajn, n) arrays
+        // returns the (trajn, n, n) Coriolis matrices
+        PyObject *inputs[2] = {py_q, py_qd};
+
+        for (int i = 0; i < 2; i++)
+        {
+            if (!_check_array_type(inputs[i]))
+                goto fail;
+
+            arrays[i] = PyArray_FROMANY(inputs[i], NPY_DOUBLE, 2, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+            if (arrays[i] == NULL)
+                goto fail;
+        }
+
+        np_q = (PyArrayObject *)arrays[0];
+        np_qd = (PyArrayObject *)arrays[1];
+
+        if (!PyArray_SAMESHAPE(np_q, np_qd))
+        {
+            PyErr_SetString(PyExc_ValueError, "q and qd must be (trajn, n) arrays");
+            goto fail;
+        }
+
+        trajn = (int)PyArray_DIM(np_q, 0);
+        n = (int)PyArray_DIM(np_q, 1);
+
+        if (_robot_model(py_links, py_parent, py_inertia, n, trajn, &model))
+        {
+            dim3[0] = trajn;
+            dim3[1] = n;
+            dim3[2] = n;
+            py_ret = _out_array(py_out, 3, dim3, 0, NULL);
+
+            if (py_ret != NULL)
+            {
+                // Do the actual job without holding the GIL
+                Py_BEGIN_ALLOW_THREADS;
+                _Robot_coriolis(
+                    model.links, model.nb, model.parent, model.S, model.I, model.ne,
+                    (npy_float64 *)PyArray_DATA(np_q),
+                    (npy_float64 *)PyArray_DATA(np_qd),
+                    n, trajn,
+                    (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret),
+                    nthreads);
+                Py_END_ALLOW_THREADS;
+            }
+        }
+
+        _robot_model_free(&model);
+
+    fail:
+        for (int i = 0; i < 2; i++)
+            Py_XDECREF(arrays[i]);
+
+        return py_ret;
+    }
+
+    static PyObject *Robot_regressor(PyObject *self, PyObject *args)
+    {
+        RobotModel model;
+        npy_intp dim3[3];
+        int nthreads, n, trajn;
+        PyObject *py_links, *py_parent, *py_q, *py_qd, *py_qdd, *py_gravity;
+        PyObject *py_out = Py_None, *py_ret = NULL;
+        PyObject *arrays[4] = {NULL, NULL, NULL, NULL};
+        PyArrayObject *np_q, *np_qd, *np_qdd, *np_gravity;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOOOOi|O",
+                &py_links,
+                &py_parent,
+                &py_q,
+                &py_qd,
+                &py_qdd,
+                &py_gravity,
+                &nthreads,
+                &py_out))
+            return NULL;
+
+        // Inputs are:
+        // links, parent - the kinematic tree, see _robot_tree
+        // q, qd, qdd - (trajn, n) arrays
+        // gravity - (3,) array
+        // returns the (trajn, n, 10 nb) regressor of the inverse dynamics,
+        // see _Robot_regressor
+        PyObject *inputs[4] = {py_q, py_qd, py_qdd, py_gravity};
+
+        for (int i = 0; i < 4; i++)
+        {
+            if (!_check_array_type(inputs[i]))
+                goto fail;
+
+            arrays[i] = PyArray_FROMANY(inputs[i], NPY_DOUBLE, 1, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+            if (arrays[i] == NULL)
+                goto fail;
         }
 
-        n_links = PyList_GET_SIZE(ets_list);
-        for (int i = 0; i < n_links; i++)
-        {
-            PyObject *py_ets = PyList_GET_ITEM(ets_list, i);
-            // Extract the ETS object from the python object
-            if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
-                return NULL;
+        np_q = (PyArrayObject *)arrays[0];
+        np_qd = (PyArrayObject *)arrays[1];
+        np_qdd = (PyArrayObject *)arrays[2];
+        np_gravity = (PyArrayObject *)arrays[3];
 
-            npy_float64 *T = (npy_float64 *)PyArray_DATA((PyArrayObject *)PyList_GET_ITEM(T_list, i));
-            MapMatrix4dc eT(T);
+        if (PyArray_NDIM(np_q) != 2 || !PyArray_SAMESHAPE(np_q, np_qd) || !PyArray_SAMESHAPE(np_q, np_qdd))
+        {
+            PyErr_SetString(PyExc_ValueError, "q, qd and qdd must be (trajn, n) arrays");
+            goto fail;
+        }
 
-            // TODO Add this back
-            _ETS_fkine(ets, q, NULL, NULL, eT);
+        if (PyArray_SIZE(np_gravity) != 3)
+        {
+            PyErr_SetString(PyExc_ValueError, "gravity must be (3,)");
+            goto fail;
         }
 
-        // Free the memory
-        if (q_used)
+        trajn = (int)PyArray_DIM(np_q, 0);
+        n = (int)PyArray_DIM(np_q, 1);
+
+        if (_robot_tree(py_links, py_parent, n, &model))
         {
-            Py_DECREF(py_np_q);
+            dim3[0] = trajn;
+            dim3[1] = n;
+            dim3[2] = 10 * model.nb;
+            py_ret = _out_array(py_out, 3, dim3, 0, NULL);
+
+            if (py_ret != NULL)
+            {
+                // Do the actual job without holding the GIL
+                Py_BEGIN_ALLOW_THREADS;
+                _Robot_regressor(
+                    model.links, model.nb, model.parent, model.S,
+                    (npy_float64 *)PyArray_DATA(np_q),
+                    (npy_float64 *)PyArray_DATA(np_qd),
+                    (npy_float64 *)PyArray_DATA(np_qdd),
+                    n, trajn,
+                    (npy_float64 *)PyArray_DATA(np_gravity),
+                    (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret),
+                    nthreads);
+                Py_END_ALLOW_THREADS;
+            }
         }
 
-        Py_RETURN_NONE;
+        _robot_model_free(&model);
+
+    fail:
+        for (int i = 0; i < 4; i++)
+            Py_XDECREF(arrays[i]);
+
+        return py_ret;
     }
 
     static PyObject *ETS_hessian0(PyObject *self, PyObject *args)
@@ -586,14 +1372,16 @@ extern "C"
         npy_float64 *H, *J, *q, *tool = NULL;
         PyObject *py_q, *py_J, *py_tool, *py_np_q, *py_np_tool, *py_np_J;
         PyObject *py_ets;
+        PyObject *py_out = Py_None;
         int tool_used = 0, J_used = 0, q_used = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOO",
+                args, "OOOO|O",
                 &py_ets,
                 &py_q,
                 &py_J,
-                &py_tool))
+                &py_tool,
+                &py_out))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -601,6 +1389,7 @@ extern "C"
             return NULL;
 
         MapMatrixJc eJ(NULL, 6, ets->n);
+        MatrixJc J_tmp;
 
         // Check if J is None
         // Make sure J is number array
@@ -628,12 +1417,10 @@ extern "C"
             py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
             q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
 
-            // Make our empty Jacobian
-            npy_intp dimsJ[2] = {6, ets->n};
-            PyObject *py_J = PyArray_EMPTY(2, dimsJ, NPY_DOUBLE, 1);
-            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-            // MapMatrixJc eJ(J, 6, ets->n);
-            new (&eJ) MapMatrixJc(J, 6, ets->n);
+            // Make our empty Jacobian, this is only an intermediate so it
+            // does not need to be a numpy array
+            J_tmp.resize(6, ets->n);
+            new (&eJ) MapMatrixJc(J_tmp.data(), 6, ets->n);
 
             // Check if tool is None
             // Make sure tool is number array
@@ -652,9 +1439,11 @@ extern "C"
             _ETS_jacob0(ets, q, tool, eJ);
         }
 
-        // Make our empty Hessian
+        // Make our empty Hessian or use the one provided
         npy_intp dimsH[3] = {ets->n, 6, ets->n};
-        PyObject *py_H = PyArray_EMPTY(3, dimsH, NPY_DOUBLE, 0);
+        PyObject *py_H = _out_array(py_out, 3, dimsH, 0, NULL);
+        if (!py_H)
+            return NULL;
         H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
         MapMatrixHr eH(H, ets->n * 6, ets->n);
 
@@ -687,14 +1476,16 @@ extern "C"
         npy_float64 *H, *J, *q, *tool = NULL;
         PyObject *py_q, *py_J, *py_tool, *py_np_q, *py_np_tool, *py_np_J;
         PyObject *py_ets;
+        PyObject *py_out = Py_None;
         int tool_used = 0, J_used = 0, q_used = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOO",
+                args, "OOOO|O",
                 &py_ets,
                 &py_q,
                 &py_J,
-                &py_tool))
+                &py_tool,
+                &py_out))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -702,6 +1493,7 @@ extern "C"
             return NULL;
 
         MapMatrixJc eJ(NULL, 6, ets->n);
+        MatrixJc J_tmp;
 
         // Check if J is None
         // Make sure J is number array
@@ -729,12 +1521,10 @@ extern "C"
             py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
             q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
 
-            // Make our empty Jacobian
-            npy_intp dimsJ[2] = {6, ets->n};
-            PyObject *py_J = PyArray_EMPTY(2, dimsJ, NPY_DOUBLE, 1);
-            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-            // MapMatrixJc eJ(J, 6, ets->n);
-            new (&eJ) MapMatrixJc(J, 6, ets->n);
+            // Make our empty Jacobian, this is only an intermediate so it
+            // does not need to be a numpy array
+            J_tmp.resize(6, ets->n);
+            new (&eJ) MapMatrixJc(J_tmp.data(), 6, ets->n);
 
             // Check if tool is None
             // Make sure tool is number array
@@ -753,9 +1543,11 @@ extern "C"
             _ETS_jacobe(ets, q, tool, eJ);
         }
 
-        // Make our empty Hessian
+        // Make our empty Hessian or use the one provided
         npy_intp dimsH[3] = {ets->n, 6, ets->n};
-        PyObject *py_H = PyArray_EMPTY(3, dimsH, NPY_DOUBLE, 0);
+        PyObject *py_H = _out_array(py_out, 3, dimsH, 0, NULL);
+        if (!py_H)
+            return NULL;
         H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
         MapMatrixHr eH(H, ets->n * 6, ets->n);
 
@@ -788,13 +1580,15 @@ extern "C"
         npy_float64 *J, *q, *tool = NULL;
         PyObject *py_q, *py_tool, *py_np_q, *py_np_tool;
         PyObject *py_ets;
-        int tool_used = 0;
+        PyObject *py_out = Py_None;
+        int tool_used = 0, fortran = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOO",
+                args, "OOO|O",
                 &py_ets,
                 &py_q,
-                &py_tool))
+                &py_tool,
+                &py_out))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -808,11 +1602,18 @@ extern "C"
         // q can be 1D or 2D, assumes dimesnions correct (n, 1xn or nx1)
         // tool can be SE3s or 4x4 numpy array
 
-        // Make our empty Jacobian
+        // Make our empty Jacobian or use the one provided
         npy_intp dims[2] = {6, ets->n};
-        PyObject *py_J = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+        PyObject *py_J = _out_array(py_out, 2, dims, 1, &fortran);
+        if (!py_J)
+            return NULL;
         J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-        MapMatrixJc eJ(J, 6, ets->n);
+
+        // A row-major out array is filled through a column-major temporary
+        MatrixJc J_tmp;
+        if (!fortran)
+            J_tmp.resize(6, ets->n);
+        MapMatrixJc eJ(fortran ? J : J_tmp.data(), 6, ets->n);
 
         // Make sure q is number array
         // Cast to numpy array
@@ -838,6 +1639,9 @@ extern "C"
         // Do the job
         _ETS_jacob0(ets, q, tool, eJ);
 
+        if (!fortran)
+            MapMatrixJr(J, 6, ets->n) = eJ;
+
         // Free the memory
         Py_DECREF(py_np_q);
 
@@ -855,13 +1659,15 @@ extern "C"
         npy_float64 *J, *q, *tool = NULL;
         PyObject *py_q, *py_tool, *py_np_q, *py_np_tool;
         PyObject *py_ets;
-        int tool_used = 0;
+        PyObject *py_out = Py_None;
+        int tool_used = 0, fortran = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOO",
+                args, "OOO|O",
                 &py_ets,
                 &py_q,
-                &py_tool))
+                &py_tool,
+                &py_out))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -875,11 +1681,18 @@ extern "C"
         // q can be 1D or 2D, assumes dimesnions correct (n, 1xn or nx1)
         // tool can be SE3s or 4x4 numpy array
 
-        // Make our empty Jacobian
+        // Make our empty Jacobian or use the one provided
         npy_intp dims[2] = {6, ets->n};
-        PyObject *py_J = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+        PyObject *py_J = _out_array(py_out, 2, dims, 1, &fortran);
+        if (!py_J)
+            return NULL;
         J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-        MapMatrixJc eJ(J, 6, ets->n);
+
+        // A row-major out array is filled through a column-major temporary
+        MatrixJc J_tmp;
+        if (!fortran)
+            J_tmp.resize(6, ets->n);
+        MapMatrixJc eJ(fortran ? J : J_tmp.data(), 6, ets->n);
 
         // Make sure q is number array
         // Cast to numpy array
@@ -909,6 +1722,9 @@ extern "C"
         // }
         _ETS_jacobe(ets, q, tool, eJ);
 
+        if (!fortran)
+            MapMatrixJr(J, 6, ets->n) = eJ;
+
         // Free the memory
         Py_DECREF(py_np_q);
 
@@ -927,16 +1743,18 @@ extern "C"
         int include_base, n = 0, q_nd, trajn = 1, tool_used = 0, base_used = 0;
         npy_float64 *ret, *retp, *q, *qp, *base = NULL, *tool = NULL;
         PyObject *py_q, *py_base, *py_tool, *py_np_q, *py_np_tool, *py_np_base;
-        PyObject *py_ret, *py_ets;
+        PyObject *py_ret, *py_ets, *py_out = Py_None;
         npy_intp *q_shape;
+        int fortran = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOOOi",
+                args, "OOOOi|O",
                 &py_ets,
                 &py_q,
                 &py_base,
                 &py_tool,
-                &include_base))
+                &include_base,
+                &py_out))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -990,7 +1808,7 @@ extern "C"
         // Allocate return array
         if (trajn == 1)
         {
-            py_ret = PyArray_EMPTY(2, dim2, NPY_DOUBLE, 1);
+            py_ret = _out_array(py_out, 2, dim2, 1, &fortran);
         }
         else
         {
@@ -1002,7 +1820,14 @@ extern "C"
             // therefore we make the returned python array (n, 4, 4) and row-major
             // and later on we transpose each (4, 4) component
             dim3[0] = trajn;
-            py_ret = PyArray_EMPTY(3, dim3, NPY_DOUBLE, 0);
+            py_ret = _out_array(py_out, 3, dim3, 0, NULL);
+            fortran = 0;
+        }
+
+        if (!py_ret)
+        {
+            Py_DECREF(py_np_q);
+            return NULL;
         }
 
         // Get numpy reference to return array
@@ -1043,9 +1868,9 @@ extern "C"
             qp = q + (n * i);
             _ETS_fkine(ets, qp, base, tool, e_retp);
 
-            // Transpose if we have a trajectory
-            // as the returned trajectory is row-major
-            if (trajn > 1)
+            // Transpose if we have a trajectory or a row-major out array
+            // as the returned data is row-major
+            if (!fortran)
             {
                 e_retp.transposeInPlace();
             }
@@ -1063,6 +1888,265 @@ extern "C"
         return py_ret;
     }
 
+    static PyObject *ETS_fkine_batch(PyObject *self, PyObject *args)
+    {
+        ETS *ets;
+        npy_intp dim3[3] = {1, 4, 4};
+        int include_base, nthreads, n = 0, trajn = 1, tool_used = 0, base_used = 0;
+        npy_float64 *ret, *q, *base = NULL, *tool = NULL;
+        PyObject *py_q, *py_base, *py_tool, *py_np_q, *py_np_tool, *py_np_base;
+        PyObject *py_ret, *py_ets, *py_out = Py_None;
+        npy_intp *q_shape;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOOii|O",
+                &py_ets,
+                &py_q,
+                &py_base,
+                &py_tool,
+                &include_base,
+                &nthreads,
+                &py_out))
+            return NULL;
+
+        // Extract the ETS object from the python object
+        if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+            return NULL;
+
+        // Inputs can be:
+        // Not arrays - Will raise exception
+        // Have symbolic data - Will raise exception
+        // q can be 1D (a single configuration) or 2D (trajn x n), every
+        // row of a 2D q is treated as a configuration
+        // base and tool can be SE3s or 4x4 numpy array
+
+        // Make sure q is number array
+        // Cast to numpy array
+        // Get data out
+        if (!_check_array_type(py_q))
+            return NULL;
+        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+        if (py_np_q == NULL)
+            return NULL;
+
+        q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
+        q_shape = PyArray_SHAPE((PyArrayObject *)py_np_q);
+
+        // Work out how long the trajectory is
+        if (PyArray_NDIM((PyArrayObject *)py_np_q) > 1)
+        {
+            trajn = q_shape[0];
+            n = q_shape[1];
+        }
+        else
+        {
+            trajn = 1;
+            n = q_shape[0];
+        }
+
+        // Each row must hold every joint referenced by the ETS as the worker
+        // threads can not raise an exception
+        if (n <= _ETS_max_jindex(ets))
+        {
+            Py_DECREF(py_np_q);
+            PyErr_SetString(PyExc_ValueError, "q has fewer columns than the joints of the ETS");
+            return NULL;
+        }
+
+        // The returned python array is always (trajn, 4, 4) and row-major
+        dim3[0] = trajn;
+        py_ret = _out_array(py_out, 3, dim3, 0, NULL);
+
+        if (py_ret == NULL)
+        {
+            Py_DECREF(py_np_q);
+            return NULL;
+        }
+
+        ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
+
+        // Check if base is None
+        // Make sure base is number array
+        // Cast to numpy array
+        // Get data out
+        if (py_base != Py_None && include_base)
+        {
+            if (!_check_array_type(py_base))
+            {
+                Py_DECREF(py_np_q);
+                Py_DECREF(py_ret);
+                return NULL;
+            }
+
+            base_used = 1;
+            py_np_base = (PyObject *)PyArray_FROMANY(py_base, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            base = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_base);
+        }
+
+        if (py_tool != Py_None)
+        {
+            if (!_check_array_type(py_tool))
+            {
+                Py_DECREF(py_np_q);
+                Py_DECREF(py_ret);
+
+                if (base_used)
+                    Py_DECREF(py_np_base);
+
+                return NULL;
+            }
+
+            tool_used = 1;
+            py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
+        }
+
+        // Do the actual job without holding the GIL
+        Py_BEGIN_ALLOW_THREADS;
+        _ETS_fkine_batch(ets, q, n, trajn, base, tool, ret, nthreads);
+        Py_END_ALLOW_THREADS;
+
+        // Free memory
+        Py_DECREF(py_np_q);
+
+        if (tool_used)
+            Py_DECREF(py_np_tool);
+
+        if (base_used)
+            Py_DECREF(py_np_base);
+
+        return py_ret;
+    }
+
+    static PyObject *ETS_jacob_batch(PyObject *self, PyObject *args)
+    {
+        ETS *ets;
+        npy_intp dimJ[3] = {1, 6, 1}, dimH[4] = {1, 1, 6, 1};
+        int frame, jacob, hessian, nthreads, n = 0, trajn = 1, tool_used = 0;
+        npy_float64 *q, *J = NULL, *H = NULL, *tool = NULL;
+        PyObject *py_q, *py_tool, *py_np_q, *py_np_tool;
+        PyObject *py_J = Py_None, *py_H = Py_None, *py_ets;
+        npy_intp *q_shape;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOiiii",
+                &py_ets,
+                &py_q,
+                &py_tool,
+                &frame,
+                &jacob,
+                &hessian,
+                &nthreads))
+            return NULL;
+
+        // Extract the ETS object from the python object
+        if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+            return NULL;
+
+        // Inputs can be:
+        // Not arrays - Will raise exception
+        // Have symbolic data - Will raise exception
+        // q can be 1D (a single configuration) or 2D (trajn x n), every
+        // row of a 2D q is treated as a configuration
+        // tool can be SE3s or 4x4 numpy array
+        // frame is 0 for the base frame, otherwise the end-effector frame
+        // jacob and hessian select which of the (J, H) tuple are computed,
+        // the other is returned as None
+
+        // Make sure q is number array
+        // Cast to numpy array
+        // Get data out
+        if (!_check_array_type(py_q))
+            return NULL;
+        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_C_CONTIGUOUS);
+
+        if (py_np_q == NULL)
+            return NULL;
+
+        q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
+        q_shape = PyArray_SHAPE((PyArrayObject *)py_np_q);
+
+        // Work out how long the trajectory is
+        if (PyArray_NDIM((PyArrayObject *)py_np_q) > 1)
+        {
+            trajn = q_shape[0];
+            n = q_shape[1];
+        }
+        else
+        {
+            trajn = 1;
+            n = q_shape[0];
+        }
+
+        // Each row must hold every joint referenced by the ETS as the worker
+        // threads can not raise an exception
+        if (n <= _ETS_max_jindex(ets))
+        {
+            Py_DECREF(py_np_q);
+            PyErr_SetString(PyExc_ValueError, "q has fewer columns than the joints of the ETS");
+            return NULL;
+        }
+
+        // Check if tool is None
+        // Make sure tool is number array
+        // Cast to numpy array
+        // Get data out
+        if (py_tool != Py_None)
+        {
+            if (!_check_array_type(py_tool))
+            {
+                Py_DECREF(py_np_q);
+                return NULL;
+            }
+
+            tool_used = 1;
+            py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
+        }
+
+        // The returned python arrays are (trajn, 6, n) and (trajn, n, 6, n)
+        // and row-major
+        if (jacob)
+        {
+            dimJ[0] = trajn;
+            dimJ[2] = ets->n;
+            py_J = PyArray_EMPTY(3, dimJ, NPY_DOUBLE, 0);
+            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
+        }
+        else
+        {
+            Py_INCREF(Py_None);
+        }
+
+        if (hessian)
+        {
+            dimH[0] = trajn;
+            dimH[1] = ets->n;
+            dimH[3] = ets->n;
+            py_H = PyArray_EMPTY(4, dimH, NPY_DOUBLE, 0);
+            H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
+        }
+        else
+        {
+            Py_INCREF(Py_None);
+        }
+
+        // Do the actual job without holding the GIL
+        Py_BEGIN_ALLOW_THREADS;
+        _ETS_jacob_batch(ets, q, n, trajn, tool, frame, J, H, nthreads);
+        Py_END_ALLOW_THREADS;
+
+        // Free memory
+        Py_DECREF(py_np_q);
+
+        if (tool_used)
+            Py_DECREF(py_np_tool);
+
+        // The tuple steals the references to py_J and py_H
+        return Py_BuildValue("NN", py_J, py_H);
+    }
+
     static PyObject *ETS_init(PyObject *self, PyObject *args)
     {
         ET *et;
@@ -1301,6 +2385,62 @@ extern "C"
         Py_RETURN_NONE;
     }
 
+    PyObject *_out_array(PyObject *py_out, int nd, npy_intp *dims, int any_order, int *fortran)
+    {
+        // Returns a new reference to an array of shape dims. If py_out is
+        // None a new array is allocated (Fortran ordered when fortran is
+        // given, otherwise C ordered). Otherwise py_out is checked to be a
+        // writeable float64 array of the right shape and is returned.
+        // When any_order is set, py_out may be either C or Fortran ordered
+        // and the order used is written to fortran.
+        PyArrayObject *out;
+
+        if (py_out == Py_None)
+        {
+            if (fortran)
+                *fortran = 1;
+            return PyArray_EMPTY(nd, dims, NPY_DOUBLE, fortran ? 1 : 0);
+        }
+
+        if (!PyArray_Check(py_out))
+        {
+            PyErr_SetString(PyExc_TypeError, "out must be a numpy array");
+            return NULL;
+        }
+
+        out = (PyArrayObject *)py_out;
+
+        if (PyArray_TYPE(out) != NPY_DOUBLE || !PyArray_ISWRITEABLE(out))
+        {
+            PyErr_SetString(PyExc_ValueError, "out must be a writeable float64 array");
+            return NULL;
+        }
+
+        if (PyArray_NDIM(out) != nd || !PyArray_CompareLists(PyArray_DIMS(out), dims, nd))
+        {
+            PyErr_SetString(PyExc_ValueError, "out has the wrong shape");
+            return NULL;
+        }
+
+        if (any_order && PyArray_IS_F_CONTIGUOUS(out))
+        {
+            *fortran = 1;
+        }
+        else if (PyArray_IS_C_CONTIGUOUS(out))
+        {
+            if (fortran)
+                *fortran = 0;
+        }
+        else
+        {
+            PyErr_SetString(PyExc_ValueError, "out must be a contiguous array");
+            return NULL;
+        }
+
+        Py_INCREF(py_out);
+        return py_out;
+    }
+
     int _check_array_type(PyObject *toCheck)
     {
         PyArray_Descr *desc;
@@ -9,29 +9,50 @@
 
 #include <Python.h>
 #include <numpy/arrayobject.h>
+#include "structs.h"
 
 #ifdef __cplusplus
 extern "C"
 {
 #endif /* __cplusplus */
 
+    /* A kinematic tree of links parsed for the dynamics methods */
+    typedef struct RobotModel
+    {
+        int nb;              /* number of links */
+        ETS **links;         /* the ETS of each link */
+        int *parent;         /* index of the parent of each link, -1 for base */
+        double *S;           /* (nb, 6) joint motion subspace of each link */
+        int ne;              /* number of sets of inertias */
+        double *I;           /* (ne, nb, 6, 6) spatial inertia of each link */
+        PyObject *py_parent; /* the array holding parent */
+    } RobotModel;
+
     // forward defines
     static PyObject *Angle_Axis(PyObject *self, PyObject *args);
 
     static PyObject *IK_GN_c(PyObject *self, PyObject *args);
     static PyObject *IK_NR_c(PyObject *self, PyObject *args);
     static PyObject *IK_LM_c(PyObject *self, PyObject *args);
+    static PyObject *IK_QP_c(PyObject *self, PyObject *args);
     // static PyObject *IK_LM_Chan_c(PyObject *self, PyObject *args);
     // static PyObject *IK_LM_Wampler_c(PyObject *self, PyObject *args);
     // static PyObject *IK_LM_Sugihara_c(PyObject *self, PyObject *args);
 
     static PyObject *Robot_link_T(PyObject *self, PyObject *args);
+    static PyObject *Robot_rne(PyObject *self, PyObject *args);
+    static PyObject *Robot_crba(PyObject *self, PyObject *args);
+    static PyObject *Robot_aba(PyObject *self, PyObject *args);
+    static PyObject *Robot_coriolis(PyObject *self, PyObject *args);
+    static PyObject *Robot_regressor(PyObject *self, PyObject *args);
 
     static PyObject *ETS_hessian0(PyObject *self, PyObject *args);
     static PyObject *ETS_hessiane(PyObject *self, PyObject *args);
     static PyObject *ETS_jacob0(PyObject *self, PyObject *args);
     static PyObject *ETS_jacobe(PyObject *self, PyObject *args);
     static PyObject *ETS_fkine(PyObject *self, PyObject *args);
+    static PyObject *ETS_fkine_batch(PyObject *self, PyObject *args);
+    static PyObject *ETS_jacob_batch(PyObject *self, PyObject *args);
     static PyObject *ETS_init(PyObject *self, PyObject *args);
 
     static PyObject *ET_init(PyObject *self, PyObject *args);
@@ -39,7 +60,11 @@ extern "C"
     static PyObject *ET_T(PyObject *self, PyObject *args);
 
     static PyObject *r2q(PyObject *self, PyObject *args);
+    PyObject *_out_array(PyObject *py_out, int nd, npy_intp *dims, int any_order, int *fortran);
     int _check_array_type(PyObject *toCheck);
+    int _robot_tree(PyObject *py_links, PyObject *py_parent, int n, RobotModel *model);
+    int _robot_model(PyObject *py_links, PyObject *py_parent, PyObject *py_inertia, int n, int trajn, RobotModel *model);
+    void _robot_model_free(RobotModel *model);
 
     void rx(npy_float64 *data, double eta);
     void ry(npy_float64 *data, double eta);
@@ -26,12 +26,14 @@
  */
 
 #include <math.h>
+#include <string.h>
 #include <Python.h>
 #include "frne.h"
 
 // forward defines
 static PyObject *init(PyObject *self, PyObject *args);
 static PyObject *frne(PyObject *self, PyObject *args);
+static PyObject *frne_batch(PyObject *self, PyObject *args);
 static PyObject *delete(PyObject *self, PyObject *args);
 static void rot_mat (Link *l, double th, double d, DHType type);
 
@@ -52,6 +54,12 @@ static PyMethodDef frneMethods[] = {
         METH_VARARGS,
         "Fast rne"
     },
+    {
+        "frne_batch",
+        (PyCFunction)frne_batch,
+        METH_VARARGS,
+        "Fast rne over a trajectory"
+    },
     {
         "delete",
         (PyCFunction)delete,
@@ -222,6 +230,139 @@ static PyObject *frne(PyObject *self, PyObject *args) {
 }
 
 
+/**
+ * Batched RNE
+ *
+ *  FRNE_BATCH(ROBOT*, Q, QD, QDD, GRAV, FEXT, TAU)
+ *
+ *  Q, QD, QDD and TAU are C-contiguous float64 buffers holding trajn rows of
+ *  njoints values. FEXT holds either 6 values, applied at every row, or
+ *  6 values per row. TAU is written in place.
+ *
+ *  The recursion runs on a private copy of the link structures, so the GIL
+ *  is released and calls on the same robot can run concurrently.
+ */
+static PyObject *frne_batch(PyObject *self, PyObject *args) {
+
+    Robot *robot, local;
+    Link *links;
+    Vect gravity;
+    PyObject *rO, *qO, *qdO, *qddO, *gravO, *fextO, *tauO;
+    Py_buffer bq, bqd, bqdd, bfext, btau;
+    double *q, *qd, *qdd, *fext, *tau;
+    Py_ssize_t trajn;
+    int njoints, fext_stride;
+
+    if (!PyArg_ParseTuple(args, "OOOOOOO", &rO, &qO, &qdO, &qddO, &gravO, &fextO, &tauO)) {
+        return NULL;
+    }
+
+    if (!(robot = (Robot*) PyCapsule_GetPointer(rO, "Robot"))) {
+        return NULL;
+    }
+
+    njoints = robot->njoints;
+
+    if (!PyArg_ParseTuple(gravO, "ddd", &gravity.x, &gravity.y, &gravity.z)) {
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(qO, &bq, PyBUF_C_CONTIGUOUS) < 0) {
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(qdO, &bqd, PyBUF_C_CONTIGUOUS) < 0) {
+        PyBuffer_Release(&bq);
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(qddO, &bqdd, PyBUF_C_CONTIGUOUS) < 0) {
+        PyBuffer_Release(&bq);
+        PyBuffer_Release(&bqd);
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(fextO, &bfext, PyBUF_C_CONTIGUOUS) < 0) {
+        PyBuffer_Release(&bq);
+        PyBuffer_Release(&bqd);
+        PyBuffer_Release(&bqdd);
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(tauO, &btau, PyBUF_C_CONTIGUOUS | PyBUF_WRITABLE) < 0) {
+        PyBuffer_Release(&bq);
+        PyBuffer_Release(&bqd);
+        PyBuffer_Release(&bqdd);
+        PyBuffer_Release(&bfext);
+        return NULL;
+    }
+
+    trajn = bq.len / (Py_ssize_t)(njoints * sizeof(double));
+    fext_stride = bfext.len == (Py_ssize_t)(6 * sizeof(double)) ? 0 : 6;
+
+    if (bq.len != trajn * njoints * (Py_ssize_t)sizeof(double) ||
+        bqd.len != bq.len || bqdd.len != bq.len || btau.len != bq.len ||
+        (fext_stride && bfext.len != trajn * 6 * (Py_ssize_t)sizeof(double))) {
+
+        PyBuffer_Release(&bq);
+        PyBuffer_Release(&bqd);
+        PyBuffer_Release(&bqdd);
+        PyBuffer_Release(&bfext);
+        PyBuffer_Release(&btau);
+        PyErr_SetString(PyExc_ValueError, "inconsistent array sizes");
+        return NULL;
+    }
+
+    q = (double *)bq.buf;
+    qd = (double *)bqd.buf;
+    qdd = (double *)bqdd.buf;
+    fext = (double *)bfext.buf;
+    tau = (double *)btau.buf;
+
+    // The link structures hold intermediate variables, work on a copy
+    links = (Link *)PyMem_RawMalloc(njoints * sizeof(Link));
+    memcpy(links, robot->links, njoints * sizeof(Link));
+
+    local.njoints = njoints;
+    local.dhtype = robot->dhtype;
+    local.links = links;
+    local.gravity = &gravity;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    for (Py_ssize_t p = 0; p < trajn; p++) {
+        double *qp = &q[p * njoints];
+
+        // Update all position dependent variables
+        for (int j = 0; j < njoints; j++) {
+            Link *l = &links[j];
+
+            if (l->jointtype == REVOLUTE) {
+                rot_mat(l, qp[j] + l->offset, l->D, local.dhtype);
+            } else {
+                rot_mat(l, l->theta, qp[j] + l->offset, local.dhtype);
+            }
+        }
+
+        newton_euler(
+            &local, &tau[p * njoints], &qd[p * njoints], &qdd[p * njoints],
+            &fext[p * fext_stride], 1);
+    }
+
+    Py_END_ALLOW_THREADS
+
+    PyMem_RawFree(links);
+
+    PyBuffer_Release(&bq);
+    PyBuffer_Release(&bqd);
+    PyBuffer_Release(&bqdd);
+    PyBuffer_Release(&bfext);
+    PyBuffer_Release(&btau);
+
+    Py_RETURN_NONE;
+}
+
+
 static PyObject *init(PyObject *self, PyObject *args) {
 
     Robot *robot;
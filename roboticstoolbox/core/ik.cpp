@@ -9,6 +9,7 @@
 #include <math.h>
 #include <iostream>
 #include <Eigen/Dense>
+#include <vector>
 // #include <Eigen/QR>
 // #include <Eigen/Core>
 // #include <Eigen/LU>
@@ -629,6 +630,275 @@ extern "C"
         free(np_J);
     }
 
+    void _IK_QP(
+        ETS *ets, Matrix4dc Tep,
+        MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
+        MapVectorX q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double kj, double ks, double kq, double ps, MapVectorX pi)
+    {
+        // The QP of the Python IK_QP solver
+        //   min  0.5 kj qd' qd + 0.5 ks' d' d
+        //   s.t. J qd + d = e,  A qd <= b
+        // where ks' = ks / sum(|e|) and the joint limit velocity dampers
+        // A qd <= b bound single joints. Substituting the slack d = e - J qd
+        // leaves a QP in qd with only bound constraints, which is solved
+        // by _QP_bounded
+        int iter = 1;
+
+        double *np_Te = (double *)PyMem_RawCalloc(16, sizeof(double));
+        MapMatrix4dc Te(np_Te);
+
+        double *np_J = (double *)PyMem_RawCalloc(6 * ets->n, sizeof(double));
+        Eigen::Map<Eigen::MatrixXd> J(np_J, 6, ets->n);
+
+        double *np_e = (double *)PyMem_RawCalloc(6, sizeof(double));
+        MapVectorX e(np_e, 6);
+
+        Matrix6dc We;
+
+        Eigen::MatrixXd H(ets->n, ets->n);
+        Eigen::MatrixXd EyeN = Eigen::MatrixXd::Identity(ets->n, ets->n);
+
+        VectorX g(ets->n);
+        VectorX qd(ets->n);
+        VectorX lb(ets->n);
+        VectorX ub(ets->n);
+
+        double ks_e;
+
+        // Set we
+        if (we.size() == 6)
+        {
+            We = we.asDiagonal();
+        }
+        else
+        {
+            We = Matrix6dc::Identity();
+        }
+
+        // Set the first q0
+        if (q0.size() == ets->n)
+        {
+            q = q0;
+        }
+        else
+        {
+            _rand_q(ets, q);
+        }
+
+        // Global search up to slimit
+        while (*search <= slimit)
+        {
+
+            while (iter <= ilimit)
+            {
+                // Current pose Te
+                _ETS_fkine(ets, q.data(), (double *)NULL, NULL, Te);
+
+                // Angle axis error e
+                _angle_axis(Te, Tep, e);
+
+                // Squared error E
+                *E = 0.5 * e.transpose() * We * e;
+
+                if (*E < tol)
+                {
+                    // We have arrived
+
+                    // wrap q to +- pi
+                    for (int i = 0; i < ets->n; i++)
+                    {
+                        q(i) = std::fmod(q(i) + PI, PI_x2) - PI;
+                    }
+
+                    // Check for joint limit violation
+                    if (reject_jl)
+                    {
+                        *solution = _check_lim(ets, q);
+                    }
+                    else
+                    {
+                        *solution = 1;
+                    }
+
+                    break;
+                }
+
+                // Jacobian Matric J
+                _ETS_jacob0(ets, q.data(), (double *)NULL, J);
+
+                // Slack gain
+                ks_e = ks / e.cwiseAbs().sum();
+
+                // The quadratic and linear terms of the reduced QP
+                H = kj * EyeN + ks_e * J.transpose() * J;
+                g = -ks_e * J.transpose() * e;
+
+                // The joint limit velocity dampers
+                lb.setConstant(-INFINITY);
+                ub.setConstant(INFINITY);
+
+                if (kq > 0.0)
+                {
+                    for (int i = 0; i < ets->n; i++)
+                    {
+                        if (q(i) - ets->qlim_l[i] <= pi(i))
+                        {
+                            lb(i) = (1.0 / kq) * ((ets->qlim_l[i] - q(i)) + ps) / (pi(i) - ps);
+                        }
+                        else if (ets->qlim_h[i] - q(i) <= pi(i))
+                        {
+                            ub(i) = (1.0 / kq) * ((ets->qlim_h[i] - q(i)) - ps) / (pi(i) - ps);
+                        }
+                    }
+                }
+
+                // Work out the joint velocity qd
+                if (!_QP_bounded(H, g, lb, ub, qd))
+                {
+                    // Abandon this search
+                    break;
+                }
+
+                q += qd;
+
+                iter += 1;
+            }
+
+            if (*solution)
+            {
+                *it += iter;
+                break;
+            }
+
+            *it += iter;
+            iter = 0;
+            *search += 1;
+            _rand_q(ets, q);
+        }
+
+        free(np_e);
+        free(np_Te);
+        free(np_J);
+    }
+
+    int _QP_bounded(Eigen::MatrixXd &H, VectorX &g, VectorX &lb, VectorX &ub, VectorX &x)
+    {
+        // Primal active set method for the strictly convex QP
+        //   min 0.5 x' H x + g' x  s.t.  lb <= x <= ub
+        // where each element has at most one finite bound. Returns 1 on
+        // success and 0 if the iteration limit was reached
+        int n = x.size();
+        std::vector<int> active(n, 0), free_idx;
+        VectorX grad(n), p(n);
+        double alpha, t, lambda, min_lambda;
+        int block, block_side, release;
+
+        // Start from the projection of qd = 0 onto the bounds
+        for (int i = 0; i < n; i++)
+        {
+            x(i) = std::min(std::max(0.0, lb(i)), ub(i));
+
+            if (x(i) != 0.0)
+            {
+                active[i] = x(i) == ub(i) ? 1 : -1;
+            }
+        }
+
+        for (int k = 0; k < 10 * (n + 1); k++)
+        {
+            grad = H * x + g;
+            p.setZero();
+
+            free_idx.clear();
+            for (int i = 0; i < n; i++)
+            {
+                if (!active[i])
+                {
+                    free_idx.push_back(i);
+                }
+            }
+
+            // The Newton step over the free elements
+            if (!free_idx.empty())
+            {
+                Eigen::MatrixXd H_free = H(free_idx, free_idx);
+                VectorX grad_free = grad(free_idx);
+                VectorX p_free = H_free.ldlt().solve(-grad_free);
+                p(free_idx) = p_free;
+            }
+
+            if (p.cwiseAbs().maxCoeff() < 1e-12)
+            {
+                // Optimal over the working set, release the active bound
+                // with the most negative multiplier
+                release = -1;
+                min_lambda = -1e-12;
+
+                for (int i = 0; i < n; i++)
+                {
+                    if (active[i])
+                    {
+                        lambda = active[i] == 1 ? -grad(i) : grad(i);
+
+                        if (lambda < min_lambda)
+                        {
+                            min_lambda = lambda;
+                            release = i;
+                        }
+                    }
+                }
+
+                if (release < 0)
+                {
+                    return 1;
+                }
+
+                active[release] = 0;
+                continue;
+            }
+
+            // Step as far as possible towards the Newton point
+            alpha = 1.0;
+            block = -1;
+            block_side = 0;
+
+            for (int i : free_idx)
+            {
+                if (p(i) > 0.0 && std::isfinite(ub(i)))
+                {
+                    t = (ub(i) - x(i)) / p(i);
+                    if (t < alpha)
+                    {
+                        alpha = t;
+                        block = i;
+                        block_side = 1;
+                    }
+                }
+                else if (p(i) < 0.0 && std::isfinite(lb(i)))
+                {
+                    t = (lb(i) - x(i)) / p(i);
+                    if (t < alpha)
+                    {
+                        alpha = t;
+                        block = i;
+                        block_side = -1;
+                    }
+                }
+            }
+
+            x += alpha * p;
+
+            if (block >= 0)
+            {
+                active[block] = block_side;
+                x(block) = block_side == 1 ? ub(block) : lb(block);
+            }
+        }
+
+        return 0;
+    }
+
     void _pseudo_inverse(Eigen::Map<Eigen::MatrixXd> J, Eigen::Map<Eigen::MatrixXd> J_pinv, double damping)
     {
         Eigen::JacobiSVD<Eigen::MatrixXd>
@@ -47,6 +47,13 @@ extern "C"
         MapVectorX q, int *it, int *search, int *solution, double *E,
         double lambda, MapVectorX we);
 
+    void _IK_QP(
+        ETS *ets, Matrix4dc Tep,
+        MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
+        MapVectorX q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double kj, double ks, double kq, double ps, MapVectorX pi);
+
+    int _QP_bounded(Eigen::MatrixXd &H, VectorX &g, VectorX &lb, VectorX &ub, VectorX &x);
     void _pseudo_inverse(Eigen::Map<Eigen::MatrixXd> J, Eigen::Map<Eigen::MatrixXd> J_pinv, double damping);
     void _rand_q(ETS *ets, MapVectorX q);
     int _check_lim(ETS *ets, MapVectorX q);
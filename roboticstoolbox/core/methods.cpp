@@ -9,6 +9,39 @@
 #include <iostream>
 #include <Eigen/Dense>
 #include <Eigen/QR>
+#include <functional>
+#include <thread>
+#include <vector>
+
+void _parallel_rows(int trajn, int nthreads, const std::function<void(int, int)> &work)
+{
+    // Splits the rows [0, trajn) into contiguous chunks, one per worker, and
+    // calls work(start, stop) for each chunk. The calling thread takes the
+    // first chunk
+    std::vector<std::thread> workers;
+    int chunk;
+
+    nthreads = _n_threads(nthreads, trajn);
+    chunk = (trajn + nthreads - 1) / nthreads;
+
+    for (int t = 1; t < nthreads; t++)
+    {
+        int start = t * chunk;
+        int stop = std::min(start + chunk, trajn);
+
+        if (start < stop)
+        {
+            workers.emplace_back(work, start, stop);
+        }
+    }
+
+    work(0, std::min(chunk, trajn));
+
+    for (auto &worker : workers)
+    {
+        worker.join();
+    }
+}
 
 extern "C"
 {
@@ -351,6 +384,106 @@ extern "C"
         }
     }
 
+    void _ETS_fkine_batch(ETS *ets, double *q, int n, int trajn, double *base, double *tool, double *ret, int nthreads)
+    {
+        // Evaluates the forward kinematics for each of the trajn rows of q
+        // (row-major, trajn x n) and writes a row-major (trajn, 4, 4) result
+        // into ret. _ETS_fkine only reads the shared ETS, so no locking is
+        // required.
+        _parallel_rows(
+            trajn, nthreads,
+            [=](int start, int stop)
+            {
+                for (int i = start; i < stop; i++)
+                {
+                    MapMatrix4dc e_retp(ret + (4 * 4 * i));
+                    _ETS_fkine(ets, q + (n * i), base, tool, e_retp);
+
+                    // The returned trajectory is row-major
+                    e_retp.transposeInPlace();
+                }
+            });
+    }
+
+    void _ETS_jacob_batch(ETS *ets, double *q, int n, int trajn, double *tool, int frame, double *J, double *H, int nthreads)
+    {
+        // Evaluates the Jacobian (frame 0 for the base frame, otherwise the
+        // end-effector frame) for each of the trajn rows of q. If J is not
+        // NULL the row-major (trajn, 6, ets->n) Jacobians are written to it,
+        // if H is not NULL the row-major (trajn, ets->n, 6, ets->n) Hessians
+        // are written to it. The link transforms of each row are evaluated
+        // once and shared by its Jacobian and Hessian.
+        int nj = ets->n;
+
+        _parallel_rows(
+            trajn, nthreads,
+            [=](int start, int stop)
+            {
+                std::vector<double> buf(6 * nj);
+                MapMatrixJc eJ(buf.data(), 6, nj);
+
+                for (int i = start; i < stop; i++)
+                {
+                    if (frame == 0)
+                    {
+                        _ETS_jacob0(ets, q + (n * i), tool, eJ);
+                    }
+                    else
+                    {
+                        _ETS_jacobe(ets, q + (n * i), tool, eJ);
+                    }
+
+                    if (J != NULL)
+                    {
+                        MapMatrixJr eJr(J + (6 * nj * i), 6, nj);
+                        eJr = eJ;
+                    }
+
+                    if (H != NULL)
+                    {
+                        MapMatrixHr eH(H + (nj * 6 * nj * i), nj * 6, nj);
+                        _ETS_hessian(nj, eJ, eH);
+                    }
+                }
+            });
+    }
+
+    int _ETS_max_jindex(ETS *ets)
+    {
+        int max_jindex = -1;
+
+        for (int i = 0; i < ets->m; i++)
+        {
+            if (ets->ets[i]->isjoint && ets->ets[i]->jindex > max_jindex)
+            {
+                max_jindex = ets->ets[i]->jindex;
+            }
+        }
+
+        return max_jindex;
+    }
+
+    int _n_threads(int nthreads, int trajn)
+    {
+        // nthreads < 1 means use one worker per hardware thread
+        if (nthreads < 1)
+        {
+            nthreads = (int)std::thread::hardware_concurrency();
+        }
+
+        if (nthreads < 1)
+        {
+            nthreads = 1;
+        }
+
+        if (nthreads > trajn)
+        {
+            nthreads = trajn > 0 ? trajn : 1;
+        }
+
+        return nthreads;
+    }
+
     void _ET_T(ET *et, double *ret, double eta)
     {
         // Check if static and return static transform
@@ -12,6 +12,13 @@
 #include "structs.h"
 #include "linalg.h"
 
+#ifdef __cplusplus
+#include <functional>
+
+// Splits the rows [0, trajn) of a batch between nthreads worker threads
+void _parallel_rows(int trajn, int nthreads, const std::function<void(int, int)> &work);
+#endif /* __cplusplus */
+
 #ifdef __cplusplus
 extern "C"
 {
@@ -23,6 +30,10 @@ extern "C"
     void _ETS_jacob0(ETS *ets, double *q, double *tool, MapMatrixJc &eJ);
     void _ETS_jacobe(ETS *ets, double *q, double *tool, MapMatrixJc &eJ);
     void _ETS_fkine(ETS *ets, double *q, double *base, double *tool, MapMatrix4dc &e_ret);
+    void _ETS_fkine_batch(ETS *ets, double *q, int n, int trajn, double *base, double *tool, double *ret, int nthreads);
+    void _ETS_jacob_batch(ETS *ets, double *q, int n, int trajn, double *tool, int frame, double *J, double *H, int nthreads);
+    int _ETS_max_jindex(ETS *ets);
+    int _n_threads(int nthreads, int trajn);
     void _ET_T(ET *et, double *ret, double eta);
 
 #ifdef __cplusplus
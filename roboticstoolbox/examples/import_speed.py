@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Time to import the toolbox and to first use parts of it
+
+Each case is run in a new interpreter, so no module is already imported.
+The subpackages of the toolbox are imported when first used, so the time
+depends on what is used rather than on the size of the toolbox.
+"""
+
+import subprocess
+import sys
+from ansitable import ANSITable, Column
+
+# Number of runs of each case, the fastest is reported
+repeats = 5
+
+cases = {
+    "import roboticstoolbox": "import roboticstoolbox as rtb",
+    "rtb.ETS": "import roboticstoolbox as rtb\nrtb.ETS",
+    "rtb.Robot": "import roboticstoolbox as rtb\nrtb.Robot",
+    "rtb.models.Panda()": "import roboticstoolbox as rtb\nrtb.models.Panda()",
+    "rtb.Bicycle": "import roboticstoolbox as rtb\nrtb.Bicycle",
+    "from roboticstoolbox import *": "from roboticstoolbox import *",
+}
+
+timer = """
+import sys, time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start, len(sys.modules))
+"""
+
+
+def run(code):
+    out = subprocess.run(
+        [sys.executable, "-c", timer.format(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    t, modules = out.stdout.split()[-2:]
+    return float(t), int(modules)
+
+
+table = ANSITable(
+    "Case",
+    Column("Time (ms)", fmt="{:.0f}"),
+    Column("Modules", fmt="{:d}"),
+    border="thin",
+)
+
+for name, code in cases.items():
+    results = [run(code) for _ in range(repeats)]
+    t = min(r[0] for r in results)
+    table.row(name, t * 1e3, results[0][1])
+
+print(f"\nTime to import in a new interpreter, best of {repeats}\n")
+table.print()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Time to build each URDF model of the toolbox
+
+The on-disk model cache is disabled so every build expands the xacro files.
+Models are built once with an empty include cache, as in a new process,
+and again once the declarations of the included files are cached.
+
+The expanded URDF of each model is then read by the URDF object parser and
+by the single-pass parser used by ``Robot.URDF_read``.
+"""
+
+import time
+import roboticstoolbox as rtb
+import roboticstoolbox.models.URDF as models
+from roboticstoolbox.tools import xacro, URDF
+from roboticstoolbox.tools.urdf import stream
+from roboticstoolbox.tools.data import rtb_path_to_datafile
+from ansitable import ANSITable, Column
+
+# Number of builds of each model, the fastest is reported
+repeats = 5
+
+rtb.rtb_set_param("model_cache", False)
+
+
+def best(func, clear=False):
+    t = float("inf")
+
+    for _ in range(repeats):
+        if clear:
+            xacro._include_cache.clear()
+
+        start = time.perf_counter()
+        func()
+        t = min(t, time.perf_counter() - start)
+
+    return t
+
+
+def compare(title, heading, columns, rows):
+    table = ANSITable(
+        heading,
+        Column(f"{columns[0]} (ms)", fmt="{:.1f}"),
+        Column(f"{columns[1]} (ms)", fmt="{:.1f}"),
+        Column("Speedup", fmt="{:.2f}"),
+        border="thin",
+    )
+
+    total = [0.0, 0.0]
+
+    for name, t0, t1 in rows:
+        total[0] += t0
+        total[1] += t1
+        table.row(name, t0 * 1e3, t1 * 1e3, t0 / t1)
+
+    table.row("Total", total[0] * 1e3, total[1] * 1e3, total[0] / total[1])
+
+    print(f"\n{title}, best of {repeats}\n")
+    table.print()
+
+
+rows = []
+
+for name in models.__all__:
+    model = getattr(models, name)
+    uncached = best(model, clear=True)
+    cached = best(model)
+
+    rows.append((name, uncached, cached))
+
+compare("Time to build the URDF models", "Model", ("Uncached", "Cached"), rows)
+
+# record the expanded URDF read by each model
+URDF_read = rtb.Robot.URDF_read
+strings = []
+
+
+def record(*args, **kwargs):
+    result = URDF_read(*args, **kwargs)
+    strings.append(result[2])
+    return result
+
+
+rtb.Robot.URDF_read = staticmethod(record)
+
+base_path = rtb_path_to_datafile("xacro")
+rows = []
+
+for name in models.__all__:
+    getattr(models, name)()
+    urdf = strings[-1]
+
+    # URDF.loadstr needs an existing file to resolve relative paths
+    t0 = best(lambda: URDF.loadstr(urdf, __file__, base_path))
+    t1 = best(lambda: stream.loadstr(urdf, base_path))
+
+    rows.append((name, t0, t1))
+
+compare("Time to read the URDF of the models", "Model", ("URDF", "Stream"), rows)
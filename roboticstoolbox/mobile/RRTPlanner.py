@@ -12,7 +12,6 @@ from collections import namedtuple
 from roboticstoolbox.mobile.OccGrid import PolygonMap
 
 # import rvcprint
-from roboticstoolbox import *
 import numpy as np
 import matplotlib.pyplot as plt
 
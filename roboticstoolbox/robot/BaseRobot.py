@@ -7,6 +7,7 @@
 
 # import sys
 from abc import ABC
+from collections import OrderedDict, namedtuple
 from copy import deepcopy
 from functools import lru_cache
 from typing import (
@@ -35,7 +36,6 @@ from spatialmath.base.argcheck import (
 )
 
 from ansitable import ANSITable, Column
-from swift import Swift
 from spatialgeometry import SceneNode
 
 from roboticstoolbox.fknm import Robot_link_T
@@ -47,12 +47,16 @@ from roboticstoolbox.robot.ET import ET
 from roboticstoolbox.robot.Dynamics import DynamicsMixin
 from roboticstoolbox.tools.types import ArrayLike, NDArray
 from roboticstoolbox.tools.params import rtb_get_param
-from roboticstoolbox.backends.PyPlot import PyPlot, PyPlot2
-from roboticstoolbox.backends.PyPlot.EllipsePlot import EllipsePlot
 
 
+# the graphical backends are imported when used
 if TYPE_CHECKING:
     from matplotlib.cm import Color  # pragma nocover
+    from swift import Swift  # pragma nocover
+    from roboticstoolbox.backends.PyPlot import PyPlot, PyPlot2  # pragma nocover
+    from roboticstoolbox.backends.PyPlot.EllipsePlot import (  # pragma nocover
+        EllipsePlot,
+    )
 else:
     Color = None
 
@@ -70,6 +74,9 @@ except ImportError:  # pragma nocover
 # A generic type variable representing any subclass of BaseLink
 LinkType = TypeVar("LinkType", bound=BaseLink)
 
+# Statistics of the ETS cache of a robot, see BaseRobot.ets_cache_info
+ETSCacheInfo = namedtuple("ETSCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
 
 class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
     def __init__(
@@ -90,6 +97,17 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         # Initialise the scene node
         SceneNode.__init__(self)
 
+        # LRU cache of the ETS objects built by ets(), invalidated by
+        # kinchanged()
+        self._ets_cache: OrderedDict = OrderedDict()
+        self._ets_cache_size = 32
+        self._ets_cache_hits = 0
+        self._ets_cache_misses = 0
+
+        # The model used by the compiled inverse dynamics, invalidated by
+        # dynchanged() and kinchanged()
+        self._rne_cache = None
+
         # Lets sort out links now
         self._linkdict: Dict[str, LinkType] = {}
 
@@ -394,9 +412,63 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         """
 
         self._dynchanged = True
+        self._rne_cache = None
         if what != "gravity":
             self._hasdynamics = True
 
+    def kinchanged(self):
+        """
+        Kinematic parameters have changed
+
+        Called from a property setter to inform the robot that the cache of
+        ETS objects returned by :func:`ets` is invalid.
+
+        See Also
+        --------
+        :func:`roboticstoolbox.Link._listen_kin`
+        :func:`ets_cache_info`
+
+        """
+
+        self._ets_cache.clear()
+        self._rne_cache = None
+
+    def ets_cache_info(self) -> ETSCacheInfo:
+        """
+        Statistics of the ETS cache
+
+        :func:`ets` keeps a least recently used cache of the ETS built for
+        each ``start`` and ``end`` argument pair, which is cleared when a
+        link, the base or the tool of the robot is changed.
+
+        Returns
+        -------
+        info
+            named tuple ``(hits, misses, maxsize, currsize)``
+
+        Examples
+        --------
+        .. runblock:: pycon
+            >>> import roboticstoolbox as rtb
+            >>> panda = rtb.models.Panda()
+            >>> ets = panda.ets()
+            >>> ets = panda.ets()
+            >>> panda.ets_cache_info()
+
+        See Also
+        --------
+        :func:`ets`
+        :func:`kinchanged`
+
+        """
+
+        return ETSCacheInfo(
+            self._ets_cache_hits,
+            self._ets_cache_misses,
+            self._ets_cache_size,
+            len(self._ets_cache),
+        )
+
     # --------------------------------------------------------------------- #
     # --------- Magic Methods --------------------------------------------- #
     # --------------------------------------------------------------------- #
@@ -1228,6 +1300,8 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         else:
             self._tool = T
 
+        self.kinchanged()
+
     @property
     def base(self) -> SE3:
         """
@@ -1265,6 +1339,8 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
             else:
                 self._T = T
 
+            self.kinchanged()
+
     # --------------------------------------------------------------------- #
 
     @lru_cache(maxsize=32)
@@ -1551,7 +1627,6 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         # because Gripper returns Link not LinkType
         return end_ret, start_ret, tool  # type: ignore
 
-    @lru_cache(maxsize=32)
     def ets(
         self,
         start: Union[LinkType, Gripper, str, None] = None,
@@ -1593,6 +1668,45 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
             >>> panda = rtb.models.ETS.Panda()
             >>> panda.ets()
 
+        Notes
+        -----
+        - The ETS for each ``start`` and ``end`` pair is kept in a least
+          recently used cache, so repeated calls return the same compiled
+          ETS. The cache is cleared when a link, the base or the tool of
+          the robot is changed, see :func:`ets_cache_info`.
+
+        """
+
+        # The gripper tools are part of the ETS but are not watched by
+        # kinchanged, so they form part of the key
+        key = (start, end, *(gripper._tool.tobytes() for gripper in self.grippers))
+
+        try:
+            ets = self._ets_cache[key]
+        except KeyError:
+            self._ets_cache_misses += 1
+        else:
+            self._ets_cache_hits += 1
+            self._ets_cache.move_to_end(key)
+            return ets
+
+        ets = self._ets(start, end)
+
+        self._ets_cache[key] = ets
+
+        if len(self._ets_cache) > self._ets_cache_size:
+            self._ets_cache.popitem(last=False)
+
+        return ets
+
+    def _ets(
+        self,
+        start: Union[LinkType, Gripper, str, None] = None,
+        end: Union[LinkType, Gripper, str, None] = None,
+    ) -> ETS:
+        """
+        Privade method which will build the ETS from start to end
+        see ets()
         """
 
         # ets to stand and end incase of grippers
@@ -1667,6 +1781,12 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         for link in self.links:
             links.append(deepcopy(link))
 
+        # the copied links are children of the copied parents
+        index = {id(link): i for i, link in enumerate(self.links)}
+        for link, original in zip(links, self.links):
+            if id(original.parent) in index:
+                link._parent = links[index[id(original.parent)]]
+
         name = deepcopy(self.name)
         manufacturer = deepcopy(self.manufacturer)
         comment = deepcopy(self.comment)
@@ -2174,7 +2294,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
 
     def _get_graphical_backend(
         self, backend: Union[L["swift", "pyplot", "pyplot2"], None] = None
-    ) -> Union[Swift, PyPlot, PyPlot2]:
+    ) -> Union["Swift", "PyPlot", "PyPlot2"]:
         default = self.default_backend
 
         # figure out the right default
@@ -2244,7 +2364,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         movie: Union[str, None] = None,
         loop: bool = False,
         **kwargs,
-    ) -> Union[Swift, PyPlot, PyPlot2]:
+    ) -> Union["Swift", "PyPlot", "PyPlot2"]:
         """
         Graphical display and animation
 
@@ -2326,6 +2446,8 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
 
         """  # noqa
 
+        from roboticstoolbox.backends.PyPlot import PyPlot
+
         env = None
 
         env = self._get_graphical_backend(backend)
@@ -2396,7 +2518,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         opt: L["trans", "rot"] = "trans",
         unit: L["rad", "deg"] = "rad",
         centre: Union[L["ee"], ArrayLike] = [0, 0, 0],
-    ) -> EllipsePlot:
+    ) -> "EllipsePlot":
         """
         Create a force ellipsoid object for plotting with PyPlot
 
@@ -2437,6 +2559,8 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         if isinstance(self, rtb.ERobot):  # pragma nocover
             raise NotImplementedError("ERobot fellipse not implemented yet")
 
+        from roboticstoolbox.backends.PyPlot.EllipsePlot import EllipsePlot
+
         q = getunit(q, unit)
         ell = EllipsePlot(self, q, "f", opt, centre=centre)
         return ell
@@ -2448,7 +2572,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         unit: L["rad", "deg"] = "rad",
         centre: Union[L["ee"], ArrayLike] = [0, 0, 0],
         scale: float = 0.1,
-    ) -> EllipsePlot:
+    ) -> "EllipsePlot":
         """
         Create a velocity ellipsoid object for plotting with PyPlot
 
@@ -2491,13 +2615,15 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         if isinstance(self, rtb.ERobot):  # pragma nocover
             raise NotImplementedError("ERobot vellipse not implemented yet")
 
+        from roboticstoolbox.backends.PyPlot.EllipsePlot import EllipsePlot
+
         q = getunit(q, unit)
         ell = EllipsePlot(self, q, "v", opt, centre=centre, scale=scale)
         return ell
 
     def plot_ellipse(
         self,
-        ellipse: EllipsePlot,
+        ellipse: "EllipsePlot",
         block: bool = True,
         limits: Union[ArrayLike, None] = None,
         jointaxes: bool = True,
@@ -2541,6 +2667,9 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
 
         """
 
+        from roboticstoolbox.backends.PyPlot import PyPlot
+        from roboticstoolbox.backends.PyPlot.EllipsePlot import EllipsePlot
+
         if not isinstance(ellipse, EllipsePlot):  # pragma nocover
             raise TypeError(
                 "ellipse must be of type roboticstoolbox.backend.PyPlot.EllipsePlot"
@@ -2563,7 +2692,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         self,
         q: Union[ArrayLike, None],
         block: bool = True,
-        fellipse: Union[EllipsePlot, None] = None,
+        fellipse: Union["EllipsePlot", None] = None,
         limits: Union[ArrayLike, None] = None,
         opt: L["trans", "rot"] = "trans",
         centre: Union[L["ee"], ArrayLike] = [0, 0, 0],
@@ -2571,7 +2700,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         eeframe: bool = True,
         shadow: bool = True,
         name: bool = True,
-    ) -> PyPlot:
+    ) -> "PyPlot":
         """
         Plot the force ellipsoid for manipulator
 
@@ -2659,7 +2788,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         self,
         q: Union[ArrayLike, None],
         block: bool = True,
-        vellipse: Union[EllipsePlot, None] = None,
+        vellipse: Union["EllipsePlot", None] = None,
         limits: Union[ArrayLike, None] = None,
         opt: L["trans", "rot"] = "trans",
         centre: Union[L["ee"], ArrayLike] = [0, 0, 0],
@@ -2667,7 +2796,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         eeframe: bool = True,
         shadow: bool = True,
         name: bool = True,
-    ) -> PyPlot:
+    ) -> "PyPlot":
         """
         Plot the velocity ellipsoid for manipulator
 
@@ -2757,7 +2886,7 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         vellipse: bool = False,
         fellipse: bool = False,
         backend: Union[L["pyplot", "pyplot2"], None] = None,
-    ) -> Union[PyPlot, PyPlot2]:
+    ) -> Union["PyPlot", "PyPlot2"]:
         """
         Graphical teach pendant
 
@@ -2812,6 +2941,8 @@ class BaseRobot(SceneNode, DynamicsMixin, ABC, Generic[LinkType]):
         # Make an empty 3D figure
         env = self._get_graphical_backend(backend)
 
+        from swift import Swift
+
         if isinstance(env, Swift):  # pragma: nocover
             raise TypeError("teach() not supported for Swift backend")
 
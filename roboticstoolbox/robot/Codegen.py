@@ -0,0 +1,649 @@
+#!/usr/bin/env python
+
+"""
+Code generation of closed-form rigid-body dynamics
+
+The joint-space inertia matrix, the Coriolis matrix and the gravity load of
+a robot with numeric dynamic parameters are derived symbolically once, by
+running the composite-rigid-body, Christoffel-consistent Coriolis and
+recursive Newton-Euler algorithms on symbolic joint coordinates. Common
+subexpressions are eliminated and the result is emitted as straight-line
+NumPy or C code, which is cached on disk per model.
+"""
+
+import ctypes
+import hashlib
+import importlib.util
+import os
+import re
+import subprocess
+import sysconfig
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+import roboticstoolbox as rtb
+from spatialmath.base import getmatrix, getvector
+from roboticstoolbox.tools.data import rtb_cache_dir
+from roboticstoolbox.tools.types import ArrayLike, NDArray
+
+try:
+    import sympy
+
+    _sympy = True
+except ImportError:  # pragma nocover
+    _sympy = False
+
+# bump when the generated code changes, invalidates the cache
+_VERSION = 1
+
+
+class DynamicsCode:
+    """
+    Generated closed-form dynamics of a robot
+
+    The functions are branch-free straight-line code with no Python
+    recursion, and every method accepts a single configuration (n) or an
+    (m,n) array with one configuration per row. Use
+    :func:`~roboticstoolbox.robot.Dynamics.DynamicsMixin.dynamics_codegen` to
+    create an instance.
+
+    Parameters
+    ----------
+    robot
+        The robot the code was generated for
+    backend
+        ``"numpy"`` or ``"c"``
+    path
+        The generated source file
+
+    Attributes
+    ----------
+    n
+        The number of joints
+    backend
+        The backend of the generated code
+    path
+        The generated source file
+
+    Notes
+    -----
+    - The model is rigid-body dynamics plus, for DH robots, the reflected
+        motor inertia. Joint friction is not included.
+    - The dynamic parameters are constants of the generated code, the
+        gravity vector is an argument.
+
+    """
+
+    def __init__(self, robot, backend: str, path: Path):
+        self.n = robot.n
+        self.backend = backend
+        self.path = path
+        self._gravity = np.array(robot.gravity, dtype=np.float64)
+
+        # gravity is rotated into the base frame of the robot
+        if np.array_equal(robot.base.R, np.eye(3)):
+            self._baseR = None
+        else:
+            self._baseR = robot.base.R
+
+        if backend == "numpy":
+            spec = importlib.util.spec_from_file_location(path.stem, path)
+            self._module = importlib.util.module_from_spec(spec)  # type: ignore
+            spec.loader.exec_module(self._module)  # type: ignore
+        else:
+            self._lib = ctypes.CDLL(str(path.with_suffix(".so")))
+
+    def __repr__(self) -> str:
+        return f"DynamicsCode(n={self.n}, backend={self.backend!r}, path={self.path})"
+
+    def _call(self, name: str, shape: Tuple[int, ...], *args: NDArray) -> NDArray:
+        trajn = args[0].shape[0]
+        out = np.zeros((trajn,) + shape)
+
+        if self.backend == "numpy":
+            getattr(self._module, name)(*args, out)
+        else:
+            ptr = ctypes.POINTER(ctypes.c_double)
+            args = tuple(np.ascontiguousarray(a, dtype=np.float64) for a in args)
+            getattr(self._lib, name)(
+                ctypes.c_int(trajn), *[a.ctypes.data_as(ptr) for a in args + (out,)]
+            )
+
+        return out
+
+    def _gravity_arg(self, trajn: int, gravity: Union[ArrayLike, None]) -> NDArray:
+        g = self._gravity if gravity is None else getvector(gravity, 3)
+
+        if self._baseR is not None:
+            g = self._baseR.T @ g
+
+        return np.tile(g, (trajn, 1))
+
+    def inertia(self, q: ArrayLike) -> NDArray:
+        """
+        Joint-space inertia matrix
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n) or (m,n)
+
+        Returns
+        -------
+        M
+            The inertia matrix (n,n) or (m,n,n)
+
+        """
+
+        q = getmatrix(q, (None, self.n))
+        M = self._call("inertia", (self.n, self.n), q)
+
+        return M[0] if q.shape[0] == 1 else M
+
+    def coriolis(self, q: ArrayLike, qd: ArrayLike) -> NDArray:
+        """
+        Coriolis and centripetal matrix
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n) or (m,n)
+        qd
+            Joint velocities (n) or (m,n)
+
+        Returns
+        -------
+        C
+            The Coriolis matrix (n,n) or (m,n,n), consistent with the
+            Christoffel symbols of the inertia matrix
+
+        """
+
+        q = getmatrix(q, (None, self.n))
+        qd = getmatrix(qd, (q.shape[0], self.n))
+        C = self._call("coriolis", (self.n, self.n), q, qd)
+
+        return C[0] if q.shape[0] == 1 else C
+
+    def gravload(self, q: ArrayLike, gravity: Union[ArrayLike, None] = None) -> NDArray:
+        """
+        Joint gravity load
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n) or (m,n)
+        gravity
+            Gravitational acceleration, defaults to that of the robot when
+            the code was generated
+
+        Returns
+        -------
+        G
+            The joint gravity load (n) or (m,n)
+
+        """
+
+        q = getmatrix(q, (None, self.n))
+        G = self._call(
+            "gravload", (self.n,), q, self._gravity_arg(q.shape[0], gravity)
+        )
+
+        return G[0] if q.shape[0] == 1 else G
+
+    def rne(
+        self,
+        q: ArrayLike,
+        qd: ArrayLike,
+        qdd: ArrayLike,
+        gravity: Union[ArrayLike, None] = None,
+    ) -> NDArray:
+        """
+        Inverse dynamics
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n) or (m,n)
+        qd
+            Joint velocities (n) or (m,n)
+        qdd
+            Joint accelerations (n) or (m,n)
+        gravity
+            Gravitational acceleration, defaults to that of the robot when
+            the code was generated
+
+        Returns
+        -------
+        tau
+            The joint forces/torques :math:`M \\ddot{q} + C \\dot{q} + G`,
+            (n) or (m,n)
+
+        """
+
+        q = getmatrix(q, (None, self.n))
+        qd = getmatrix(qd, q.shape)
+        qdd = getmatrix(qdd, q.shape)
+
+        M = self.inertia(q).reshape((-1, self.n, self.n))
+        C = self.coriolis(q, qd).reshape((-1, self.n, self.n))
+        G = self.gravload(q, gravity).reshape((-1, self.n))
+        tau = np.einsum("kij,kj->ki", M, qdd) + np.einsum("kij,kj->ki", C, qd) + G
+
+        return tau[0] if q.shape[0] == 1 else tau
+
+    def accel(
+        self,
+        q: ArrayLike,
+        qd: ArrayLike,
+        torque: ArrayLike,
+        gravity: Union[ArrayLike, None] = None,
+    ) -> NDArray:
+        """
+        Forward dynamics
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n) or (m,n)
+        qd
+            Joint velocities (n) or (m,n)
+        torque
+            Joint forces/torques (n) or (m,n)
+        gravity
+            Gravitational acceleration, defaults to that of the robot when
+            the code was generated
+
+        Returns
+        -------
+        qdd
+            The joint accelerations (n) or (m,n)
+
+        """
+
+        q = getmatrix(q, (None, self.n))
+        qd = getmatrix(qd, q.shape)
+        torque = getmatrix(torque, q.shape)
+
+        M = self.inertia(q).reshape((-1, self.n, self.n))
+        C = self.coriolis(q, qd).reshape((-1, self.n, self.n))
+        G = self.gravload(q, gravity).reshape((-1, self.n))
+        h = torque - np.einsum("kij,kj->ki", C, qd) - G
+        qdd = np.linalg.solve(M, h[..., np.newaxis])[..., 0]
+
+        return qdd[0] if q.shape[0] == 1 else qdd
+
+
+# --------------------------------------------------------------------------- #
+# symbolic spatial algebra, vectors are [angular; linear] as in the compiled
+# dynamics
+
+
+def _skew(v):
+    return np.array(
+        [[0, -v[2], v[1]], [v[2], 0, -v[0]], [-v[1], v[0], 0]], dtype=object
+    )
+
+
+def _cross(a, b):
+    # np.cross does not support object arrays
+    return np.array(
+        [
+            a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0],
+        ],
+        dtype=object,
+    )
+
+
+def _crm(v, m):
+    # the spatial cross product of motion vectors, v x m
+    return np.r_[_cross(v[:3], m[:3]), _cross(v[:3], m[3:]) + _cross(v[3:], m[:3])]
+
+
+def _crf(v, f):
+    # the spatial cross product of a motion and a force vector, v x* f
+    return np.r_[_cross(v[:3], f[:3]) + _cross(v[3:], f[3:]), _cross(v[:3], f[3:])]
+
+
+def _motion_transform(T):
+    # the motion transform from the parent frame to the frame T
+    Rt = T[:3, :3].T
+    X = np.zeros((6, 6), dtype=object)
+    X[:3, :3] = Rt
+    X[3:, :3] = -Rt @ _skew(T[:3, 3])
+    X[3:, 3:] = Rt
+
+    return X
+
+
+def _body_coriolis(v, I):  # noqa
+    # the Coriolis matrix of a rigid body, see _body_coriolis in dynamics.cpp
+    h = I @ v
+    B = np.zeros((6, 6), dtype=object)
+
+    for k in range(6):
+        e = np.zeros(6)
+        e[k] = 1
+        B[:, k] = (_crf(v, I[:, k]) + _crf(e, h) - I @ _crm(v, e)) / 2
+
+    return B
+
+
+def _small(x, tol=1e-12):
+    # exact zeros keep the symbolic expressions short
+    return 0 if isinstance(x, float) and abs(x) < tol else x
+
+
+def _link_model(link, q) -> Tuple[NDArray, NDArray, Union[int, None]]:
+    """
+    The symbolic motion transform from the parent link, the numeric motion
+    subspace and the joint index of a link
+
+    """
+
+    T = np.eye(4, dtype=object)
+    after = np.eye(4)
+    joint = None
+
+    for et in link.ets:
+        if et.isjoint:
+            joint = et
+            A = et.A(q[et.jindex])
+        else:
+            A = np.vectorize(_small, otypes=[object])(et.A())
+            if joint is not None:
+                after = after @ et.A()
+
+        T = T @ A
+
+    S = np.zeros(6)
+
+    if joint is not None:
+        axis = np.zeros(3)
+        axis["xyz".index(joint.axis[1])] = -1.0 if joint.isflip else 1.0
+        Rt = after[:3, :3].T
+
+        if joint.isrotation:
+            S[:3] = Rt @ axis
+            S[3:] = Rt @ np.cross(axis, after[:3, 3])
+        else:
+            S[3:] = Rt @ axis
+
+    X = np.vectorize(sympy.expand_trig, otypes=[object])(_motion_transform(T))
+    X = np.vectorize(_small, otypes=[object])(X)
+    S = np.vectorize(_small, otypes=[object])(S)
+
+    return X, S, None if joint is None else joint.jindex
+
+
+def _spatial_inertia(link) -> NDArray:
+    C = _skew(np.array(link.r, dtype=np.float64))
+    m = float(link.m)
+    I = np.zeros((6, 6), dtype=object)  # noqa
+    I[:3, :3] = np.array(link.I, dtype=np.float64) + m * C @ C.T
+    I[:3, 3:] = m * C
+    I[3:, :3] = m * C.T
+    I[3:, 3:] = m * np.eye(3)
+
+    return np.vectorize(lambda x: _small(float(x)), otypes=[object])(I)
+
+
+def _derive(robot) -> Tuple[List, List, List, NDArray, NDArray, NDArray]:
+    """
+    Symbolic inertia matrix, Coriolis matrix and gravity load of a robot
+
+    Runs the composite-rigid-body algorithm, the Christoffel-consistent
+    Coriolis algorithm and the recursive Newton-Euler algorithm with zero
+    velocity and acceleration on symbolic joint coordinates, see
+    dynamics.cpp for the numeric versions.
+
+    """
+
+    n = robot.n
+    q = list(sympy.symbols(f"q:{n}", real=True))
+    qd = list(sympy.symbols(f"qd:{n}", real=True))
+    g = list(sympy.symbols("g:3", real=True))
+
+    links, parent = robot._dyn_links()
+    nb = len(links)
+    X, S, jindex = zip(*[_link_model(link, q) for link in links])
+
+    # velocities, accelerations due to gravity and joint axis rates
+    v: List = [None] * nb
+    a: List = [None] * nb
+    Sd: List = [None] * nb
+    a_grav = np.array([0, 0, 0, -g[0], -g[1], -g[2]], dtype=object)
+
+    for i in range(nb):
+        p = parent[i]
+        v[i] = np.zeros(6, dtype=object) if p < 0 else X[i] @ v[p]
+        if jindex[i] is not None:
+            v[i] = v[i] + S[i] * qd[jindex[i]]
+        a[i] = X[i] @ (a_grav if p < 0 else a[p])
+        Sd[i] = _crm(v[i], S[i])
+
+    # composite inertias, Coriolis matrices and gravity forces
+    Ic = [_spatial_inertia(link) for link in links]
+    Bc = [_body_coriolis(v[i], Ic[i]) for i in range(nb)]
+    f = [Ic[i] @ a[i] for i in range(nb)]
+
+    M = np.zeros((n, n), dtype=object)
+    C = np.zeros((n, n), dtype=object)
+    G = np.zeros(n, dtype=object)
+
+    for i in reversed(range(nb)):
+        ji = jindex[i]
+
+        if ji is not None:
+            G[ji] = S[i] @ f[i]
+            F = Ic[i] @ S[i]
+            f1 = Ic[i] @ Sd[i] + Bc[i] @ S[i]
+            f3 = Bc[i].T @ S[i]
+            k = i
+
+            # the entries of each ancestor joint
+            while True:
+                jk = jindex[k]
+                if jk is not None:
+                    M[jk, ji] = M[ji, jk] = S[k] @ F
+                    C[jk, ji] = S[k] @ f1
+                    C[ji, jk] = Sd[k] @ F + S[k] @ f3
+                if parent[k] < 0:
+                    break
+                F, f1, f3 = X[k].T @ F, X[k].T @ f1, X[k].T @ f3
+                k = parent[k]
+
+        p = parent[i]
+        if p >= 0:
+            Ic[p] = Ic[p] + X[i].T @ Ic[i] @ X[i]
+            Bc[p] = Bc[p] + X[i].T @ Bc[i] @ X[i]
+            f[p] = f[p] + X[i].T @ f[i]
+
+    if isinstance(robot, rtb.DHRobot):
+        # motor inertia reflected through the gearbox
+        for j, link in enumerate(robot.links):
+            M[j, j] = M[j, j] + float(link.G) ** 2 * float(link.Jm)
+
+    return q, qd, g, M, C, G
+
+
+# --------------------------------------------------------------------------- #
+# code emission, each function writes its outputs into preallocated zeroed
+# arrays with one row per configuration
+
+
+def _functions(q, qd, g, M, C, G):
+    # name, arguments, symbols of each argument, outputs per row, and the
+    # (index, expression) of the nonzero outputs
+    def nonzero(A):
+        return [(i, e) for i, e in enumerate(A.flatten()) if e != 0]
+
+    return [
+        ("inertia", ["q"], [q], M.size, nonzero(M)),
+        ("coriolis", ["q", "qd"], [q, qd], C.size, nonzero(C)),
+        ("gravload", ["q", "g"], [q, g], G.size, nonzero(G)),
+    ]
+
+
+def _emit_numpy(functions) -> str:
+    from sympy.printing.numpy import NumPyPrinter
+
+    printer = NumPyPrinter({"fully_qualified_modules": True})
+    lines = ["# Generated by roboticstoolbox, do not edit", "import numpy", ""]
+
+    for name, args, symbols, _, outputs in functions:
+        lines.append(f"def {name}({', '.join(args)}, out):")
+        lines.append("    out = out.reshape((out.shape[0], -1))")
+
+        for arg, syms in zip(args, symbols):
+            for j, sym in enumerate(syms):
+                lines.append(f"    {sym} = {arg}[:, {j}]")
+
+        subs, exprs = sympy.cse([e for _, e in outputs], symbols=_temporaries())
+
+        for x, e in subs:
+            lines.append(f"    {x} = {printer.doprint(e)}")
+        for (i, _), e in zip(outputs, exprs):
+            lines.append(f"    out[:, {i}] = {printer.doprint(e)}")
+
+        lines.append("")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def _emit_c(functions) -> str:
+    from sympy.printing.c import C99CodePrinter
+
+    printer = C99CodePrinter()
+    lines = ["/* Generated by roboticstoolbox, do not edit */", "#include <math.h>"]
+    lines.append("")
+
+    for name, args, symbols, size, outputs in functions:
+        params = ", ".join(f"const double *{arg}" for arg in args)
+
+        lines.append(f"void {name}(int trajn, {params}, double *out)")
+        lines.append("{")
+        lines.append("    for (int k = 0; k < trajn; k++)")
+        lines.append("    {")
+
+        for arg, syms in zip(args, symbols):
+            for j, sym in enumerate(syms):
+                index = f"k * {len(syms)} + {j}"
+                lines.append(f"        const double {sym} = {arg}[{index}];")
+
+        subs, exprs = sympy.cse([e for _, e in outputs], symbols=_temporaries())
+
+        for x, e in subs:
+            lines.append(f"        const double {x} = {printer.doprint(e)};")
+        for (i, _), e in zip(outputs, exprs):
+            lines.append(f"        out[k * {size} + {i}] = {printer.doprint(e)};")
+
+        lines.append("    }")
+        lines.append("}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def _temporaries():
+    i = 0
+    while True:
+        yield sympy.Symbol(f"x{i}", real=True)
+        i += 1
+
+
+def _model_hash(robot) -> str:
+    """
+    A digest of everything the generated code depends on
+
+    """
+
+    h = hashlib.sha1(f"{_VERSION} {type(robot).__name__} {robot.n}".encode())
+    links, parent = robot._dyn_links()
+    h.update(np.asarray(parent, dtype=np.int64).tobytes())
+
+    for link in links:
+        for et in link.ets:
+            h.update(f"{et.axis} {et.isjoint} {et.jindex} {et.isflip}".encode())
+            if not et.isjoint:
+                h.update(np.asarray(et.A(), dtype=np.float64).tobytes())
+
+        params = [link.m, *np.ravel(link.r), *np.ravel(link.I), link.G, link.Jm]
+        h.update(np.array(params, dtype=np.float64).tobytes())
+
+    return h.hexdigest()
+
+
+def _compile(source: Path) -> Path:
+    # build a shared library with the C compiler Python was built with
+    lib = source.with_suffix(".so")
+    cc = (sysconfig.get_config_var("CC") or "cc").split()
+    tmp = lib.with_suffix(f".{os.getpid()}.tmp")
+
+    result = subprocess.run(
+        cc + ["-O2", "-shared", "-fPIC", str(source), "-o", str(tmp), "-lm"],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"compiling {source} failed\n{result.stderr}")
+
+    os.replace(tmp, lib)
+
+    return lib
+
+
+def dynamics_codegen(
+    robot, backend: str = "numpy", cache: bool = True, path: Union[str, None] = None
+) -> DynamicsCode:
+    """
+    Generate closed-form dynamics code for a robot, see
+    :func:`~roboticstoolbox.robot.Dynamics.DynamicsMixin.dynamics_codegen`
+
+    """
+
+    if not _sympy:  # pragma: nocover
+        raise ImportError(
+            "the package sympy is required for code generation. \nInstall using"
+            " 'pip install sympy'"
+        )
+
+    if backend not in ("numpy", "c"):
+        raise ValueError("backend must be 'numpy' or 'c'")
+
+    if robot._rne_model() is None:
+        raise ValueError("the robot must have numeric dynamic parameters")
+
+    folder = rtb_cache_dir("codegen") if path is None else Path(path)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    name = re.sub(r"\W", "_", f"{robot.name}".lower())
+    suffix = ".py" if backend == "numpy" else ".c"
+    source = folder / f"{name}_{_model_hash(robot)}{suffix}"
+
+    ready = source.exists()
+    if backend == "c":
+        ready = ready and source.with_suffix(".so").exists()
+
+    if not (cache and ready):
+        functions = _functions(*_derive(robot))
+
+        if backend == "numpy":
+            code = _emit_numpy(functions)
+        else:
+            code = _emit_c(functions)
+
+        # write atomically so concurrent processes never see partial files
+        tmp = source.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(code)
+        os.replace(tmp, source)
+
+        if backend == "c":
+            _compile(source)
+
+    return DynamicsCode(robot, backend, source)
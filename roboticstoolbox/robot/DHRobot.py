@@ -6,11 +6,12 @@
 from collections import namedtuple
 from email import message
 from roboticstoolbox.tools.data import rtb_path_to_datafile
+import os
 import warnings
 import copy
 import numpy as np
 from roboticstoolbox.robot.Robot import Robot  # DHLink
-from roboticstoolbox.robot.ETS import ETS, ET
+from roboticstoolbox.robot.ETS import ETS, ET, _chunks
 from roboticstoolbox.robot.DHLink import DHLink
 from roboticstoolbox import rtb_set_param
 from spatialmath.base.argcheck import getvector, isscalar, verifymatrix, getmatrix
@@ -32,10 +33,10 @@ from ansitable import ANSITable, Column
 from scipy.linalg import block_diag
 from roboticstoolbox.robot.DHLink import _check_rne, DHLink
 from roboticstoolbox import rtb_get_param
-from roboticstoolbox.frne import init, frne, delete
+from roboticstoolbox.frne import init, frne_batch, delete
 from numpy import any
 from typing import Union, Tuple
-from roboticstoolbox.robot.IK import IKSolution
+from roboticstoolbox.robot.IK import IKSolution, IK_Pieper, _pool_map
 
 ArrayLike = Union[list, np.ndarray, tuple, set]
 
@@ -948,8 +949,18 @@ class DHRobot(Robot):
               into the result.
             - Joint offsets, if defined, are added to ``q`` before the forward
               kinematics are computed.
+            - Numeric values are computed by :func:`fkine_batch` and the
+              values of the returned ``SE3`` are views into its result.
         """
 
+        try:
+            T = SE3.Empty()
+            T.data = list(self.fkine_batch(q))
+            return T
+        except TypeError:
+            # symbolic joint coordinates or kinematic parameters
+            pass
+
         if np.array_equal(self.base.A, np.eye(4)):
             base = None
         else:
@@ -1055,6 +1066,14 @@ class DHRobot(Robot):
         if q is None:
             q = self.q
 
+        try:
+            Tall = SE3.Empty()
+            Tall.data = list(self.fkine_all_batch(getvector(q, self.n))[0])
+            return Tall
+        except TypeError:
+            # symbolic joint coordinates or kinematic parameters
+            pass
+
         Tj = self.base.copy()
         Tall = Tj
 
@@ -1063,6 +1082,235 @@ class DHRobot(Robot):
             Tall.append(Tj)
         return Tall
 
+    def _dh_links(self, q):
+        """
+        Link transforms for each row of ``q``
+
+        :param q: The joint configurations
+        :type q: ndarray(n) or ndarray(m,n)
+        :return: link transforms, ``A[k, j]`` is the transform of link ``j``
+            for configuration ``k``
+        :rtype: ndarray(m,n,4,4)
+
+        The transforms are computed directly from the ``a``, ``d``,
+        ``alpha``, ``theta`` and ``offset`` parameter arrays and broadcast
+        over all configurations.
+
+        :raises TypeError: if ``q`` or the link parameters are symbolic
+        """
+
+        q = np.asarray(getmatrix(q, (None, self.n)), dtype=np.float64)
+
+        a = np.asarray(self.a, dtype=np.float64)
+        d = np.asarray(self.d, dtype=np.float64)
+        alpha = np.asarray(self.alpha, dtype=np.float64)
+        theta = np.asarray(self.theta, dtype=np.float64)
+        offset = np.asarray(self.offset, dtype=np.float64)
+        prismatic = np.array([link.isprismatic for link in self.links])
+        flip = np.array([-1.0 if link.isflip else 1.0 for link in self.links])
+
+        # joint variable, including flip and offset
+        qj = flip * q + offset
+
+        th = np.where(prismatic, theta, qj)
+        d = np.where(prismatic, qj, d)
+
+        st = np.sin(th)
+        ct = np.cos(th)
+        sa = np.broadcast_to(np.sin(alpha), th.shape)
+        ca = np.broadcast_to(np.cos(alpha), th.shape)
+        a = np.broadcast_to(a, th.shape)
+
+        A = np.zeros(th.shape + (4, 4))
+
+        if self.mdh == 0:
+            # standard DH
+            A[..., 0, 0] = ct
+            A[..., 0, 1] = -st * ca
+            A[..., 0, 2] = st * sa
+            A[..., 0, 3] = a * ct
+            A[..., 1, 0] = st
+            A[..., 1, 1] = ct * ca
+            A[..., 1, 2] = -ct * sa
+            A[..., 1, 3] = a * st
+            A[..., 2, 1] = sa
+            A[..., 2, 2] = ca
+            A[..., 2, 3] = d
+        else:
+            # modified DH
+            A[..., 0, 0] = ct
+            A[..., 0, 1] = -st
+            A[..., 0, 3] = a
+            A[..., 1, 0] = st * ca
+            A[..., 1, 1] = ct * ca
+            A[..., 1, 2] = -sa
+            A[..., 1, 3] = -sa * d
+            A[..., 2, 0] = st * sa
+            A[..., 2, 1] = ct * sa
+            A[..., 2, 2] = ca
+            A[..., 2, 3] = ca * d
+
+        A[..., 3, 3] = 1
+
+        return A
+
+    def fkine_all_batch(self, q):
+        """
+        Forward kinematics for all link frames and many configurations
+
+        :param q: The joint configurations
+        :type q: ndarray(n) or ndarray(m,n)
+        :return: Link frame poses
+        :rtype: ndarray(m,n+1,4,4)
+
+        ``robot.fkine_all_batch(q)[k, j]`` is the pose of link frame {j} for
+        the configuration ``q[k, :]``, frame {0} is the base transform. This
+        is the numeric equivalent of :func:`fkine_all` for every row of ``q``
+        but no ``SE3`` instances are created, the products are evaluated for
+        all configurations at once.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> import numpy as np
+            >>> puma = rtb.models.DH.Puma560()
+            >>> puma.fkine_all_batch(np.random.rand(10, 6)).shape
+
+        .. note::
+
+            - The robot's base transform, if present, is incorporated into the
+              result, the tool transform is not.
+            - Joint offsets, if defined, are added to ``q`` before the forward
+              kinematics are computed.
+
+        :seealso: :func:`fkine_all`, :func:`fkine_batch`
+        """
+
+        A = self._dh_links(q)
+
+        T = np.empty((A.shape[0], self.n + 1, 4, 4))
+        T[:, 0] = self.base.A
+
+        for j in range(self.n):
+            np.matmul(T[:, j], A[:, j], out=T[:, j + 1])
+
+        return T
+
+    def fkine_batch(self, q):
+        """
+        Forward kinematics for many configurations
+
+        :param q: The joint configurations
+        :type q: ndarray(n) or ndarray(m,n)
+        :return: End-effector poses
+        :rtype: ndarray(m,4,4)
+
+        ``robot.fkine_batch(q)[k]`` is the end-effector pose, as an SE(3)
+        matrix, for the configuration ``q[k, :]``. The link transforms are
+        computed directly from the kinematic parameter arrays and no ``SE3``
+        instances are created.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> import numpy as np
+            >>> puma = rtb.models.DH.Puma560()
+            >>> puma.fkine_batch(np.random.rand(10, 6)).shape
+
+        .. note::
+
+            - The robot's base or tool transform, if present, are incorporated
+              into the result.
+            - Joint offsets, if defined, are added to ``q`` before the forward
+              kinematics are computed.
+
+        :seealso: :func:`fkine`, :func:`fkine_all_batch`
+        """
+
+        return self.fkine_all_batch(q)[:, -1] @ self.tool.A
+
+    def jacob0_batch(self, q):
+        r"""
+        Manipulator Jacobian in world frame for many configurations
+
+        :param q: The joint configurations
+        :type q: ndarray(n) or ndarray(m,n)
+        :return: The manipulator Jacobians in the world frame
+        :rtype: ndarray(m,6,n)
+
+        ``robot.jacob0_batch(q)[k]`` is the manipulator geometric Jacobian for
+        the configuration ``q[k, :]``. The columns are computed from the joint
+        axes and origins of the link frames from :func:`fkine_all_batch`, for
+        all configurations at once.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> import numpy as np
+            >>> puma = rtb.models.DH.Puma560()
+            >>> puma.jacob0_batch(np.random.rand(10, 6)).shape
+
+        :seealso: :func:`jacob0`, :func:`jacobe_batch`
+        """
+
+        T = self.fkine_all_batch(q)
+        te = (T[:, -1] @ self.tool.A)[:, :3, 3]
+
+        # joint j moves about the z-axis of frame {j} for standard DH and
+        # frame {j+1} for modified DH
+        F = T[:, :-1] if self.mdh == 0 else T[:, 1:]
+        z = F[:, :, :3, 2]
+        o = F[:, :, :3, 3]
+
+        prismatic = np.array([link.isprismatic for link in self.links])
+        flip = np.array([-1.0 if link.isflip else 1.0 for link in self.links])
+
+        J = np.empty((T.shape[0], 6, self.n))
+        J[:, :3, :] = np.where(
+            prismatic[:, np.newaxis], z, np.cross(z, te[:, np.newaxis] - o)
+        ).transpose(0, 2, 1)
+        J[:, 3:, :] = np.where(prismatic[:, np.newaxis], 0.0, z).transpose(0, 2, 1)
+
+        return J * flip
+
+    def jacobe_batch(self, q):
+        r"""
+        Manipulator Jacobian in end-effector frame for many configurations
+
+        :param q: The joint configurations
+        :type q: ndarray(n) or ndarray(m,n)
+        :return: The manipulator Jacobians in the end-effector frame
+        :rtype: ndarray(m,6,n)
+
+        ``robot.jacobe_batch(q)[k]`` is the manipulator geometric Jacobian, in
+        the end-effector frame, for the configuration ``q[k, :]``.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> import numpy as np
+            >>> puma = rtb.models.DH.Puma560()
+            >>> puma.jacobe_batch(np.random.rand(10, 6)).shape
+
+        :seealso: :func:`jacobe`, :func:`jacob0_batch`
+        """
+
+        J = self.jacob0_batch(q)
+        Rt = (self.fkine_batch(q)[:, :3, :3]).transpose(0, 2, 1)
+
+        J[:, :3, :] = Rt @ J[:, :3, :]
+        J[:, 3:, :] = Rt @ J[:, 3:, :]
+
+        return J
+
     def jacobe(self, q, half=None, **kwargs):
         r"""
         Manipulator Jacobian in end-effector frame
@@ -1371,7 +1619,16 @@ class DHRobot(Robot):
             self._rne_ob = None
 
     @_check_rne
-    def rne(self, q, qd=None, qdd=None, gravity=None, fext=None, base_wrench=False):
+    def rne(
+        self,
+        q,
+        qd=None,
+        qdd=None,
+        gravity=None,
+        fext=None,
+        base_wrench=False,
+        threads=1,
+    ):
         r"""
         Inverse dynamics
 
@@ -1386,7 +1643,10 @@ class DHRobot(Robot):
         :type gravity: ndarray(6)
         :param fext: Specify wrench acting on the end-effector
                      :math:`W=[F_x F_y F_z M_x M_y M_z]`
-        :type fext: ndarray(6)
+        :type fext: ndarray(6) or ndarray(m,6)
+        :param threads: Number of threads for a trajectory, 0 uses one per
+            CPU core
+        :type threads: int
 
         ``tau = rne(q, qd, qdd, grav, fext)`` is the joint torque required for
         the robot to achieve the specified joint position ``q`` (1xn), velocity
@@ -1396,7 +1656,10 @@ class DHRobot(Robot):
         Trajectory operation:
         If q, qd and qdd (mxn) are matrices with m cols representing a
         trajectory then tau (mxn) is a matrix with cols corresponding to each
-        trajectory step.
+        trajectory step. ``fext`` can then also be an (mx6) matrix with a
+        wrench for each step. The whole trajectory is computed by one call to
+        the C extension which releases the GIL, and is split between
+        ``threads`` threads.
 
         .. note::
             - The torque computed contains a contribution due to armature
@@ -1434,22 +1697,34 @@ class DHRobot(Robot):
 
         if fext is None:
             fext = np.zeros(6)
+        elif np.ndim(fext) == 2:
+            fext = getmatrix(fext, (trajn, 6))
         else:
             fext = getvector(fext, 6)
 
-        tau = np.zeros((trajn, self.n))
+        q = np.ascontiguousarray(q, dtype=np.float64)
+        qd = np.ascontiguousarray(qd, dtype=np.float64)
+        qdd = np.ascontiguousarray(qdd, dtype=np.float64)
+        fext = np.ascontiguousarray(fext, dtype=np.float64)
+        tau = np.empty((trajn, self.n))
+
+        # we negate gravity here, since the C code has the sign wrong
+        gravity = tuple(-gravity)
 
-        for i in range(trajn):
-            tau[i, :] = frne(
-                # we negate gravity here, since the C code has the sign wrong
+        def rows(s):
+            frne_batch(
                 self._rne_ob,
-                q[i, :],
-                qd[i, :],
-                qdd[i, :],
-                -gravity,
-                fext,
+                q[s],
+                qd[s],
+                qdd[s],
+                gravity,
+                fext if fext.ndim == 1 else fext[s],
+                tau[s],
             )
 
+        workers = threads if threads > 0 else os.cpu_count() or 1
+        _pool_map(rows, _chunks(trajn, -(-trajn // workers)), workers)
+
         if trajn == 1:
             return tau[0, :]
         else:
@@ -1874,6 +2149,63 @@ class DHRobot(Robot):
                 [sol.reason for sol in solutions],
             )
 
+    def ikine_analytic(self, T, q0=None, joint_limits=True):
+        """
+        Analytic inverse kinematics for a 6R arm with a spherical wrist
+
+        :param T: The desired end-effector pose or pose trajectory
+        :type T: SE3 or ndarray(4,4) or ndarray(m,4,4)
+        :param q0: The joint coordinates the solution should be closest to
+        :type q0: ndarray(6) or ndarray(m,6), optional
+        :param joint_limits: Reject solutions outside the joint limits
+        :type joint_limits: bool
+        :return: The inverse kinematic solution
+        :rtype: IKSolution
+
+        ``robot.ikine_analytic(T)`` is the closed-form inverse kinematic
+        solution of the pose ``T`` which is closest to ``q0``. Unlike
+        :meth:`ikine_6s` no model specific solution is required, the solver
+        is generated from the DH parameters of the robot by
+        :class:`IK_Pieper`. This applies to any robot with 6 revolute joints
+        whose last three axes intersect, see :class:`IK_Pieper` for
+        access to all solution branches.
+
+        The solver is created on first use and reused until the kinematic
+        parameters, base or tool of the robot change. Many poses are solved
+        at once when ``T`` is a trajectory.
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> puma = rtb.models.DH.Puma560()
+            >>> T = puma.fkine([0, 0.4, -0.2, 0.1, 0.6, 0.3])
+            >>> puma.ikine_analytic(T, q0=puma.qz)
+
+        :seealso: :class:`IK_Pieper`, :meth:`ikine_6s`
+        """
+
+        return self._ik_pieper().solve(T, q0=q0, joint_limits=joint_limits)
+
+    def _ik_pieper(self):
+        # the solver depends on the kinematic parameters, base and tool
+        key = (
+            self.mdh,
+            tuple(self.a),
+            tuple(self.d),
+            tuple(self.alpha),
+            tuple(self.offset),
+            tuple(link.isflip for link in self.links),
+            self.base.A.tobytes(),
+            self.tool.A.tobytes(),
+        )
+
+        cached = getattr(self, "_ik_pieper_cache", None)
+        if cached is None or cached[0] != key:
+            cached = (key, IK_Pieper(self))
+            self._ik_pieper_cache = cached
+
+        return cached[1]
+
     def config_validate(self, config, allowables):
         """
         Validate a configuration string
@@ -226,6 +226,12 @@ class BaseET:
         """
         p.text(str(self))  # pragma: nocover
 
+    def __copy__(self):
+        # shallow copies share the C object
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        return result
+
     def __deepcopy__(self, memo):
         cls = self.__class__
         result = cls.__new__(cls)
@@ -238,6 +244,24 @@ class BaseET:
         result.__fknm = result.__init_c()
         return result
 
+    def __getstate__(self):
+        # the C object and the local axis functions can not be pickled, they
+        # are rebuilt on unpickling
+        state = self.__dict__.copy()
+        del state["_BaseET__fknm"]
+        state["_axis_func"] = self._axis_func is not None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        if self._axis_func:
+            self._axis_func = getattr(type(self), self._axis)().axis_func
+        else:
+            self._axis_func = None
+
+        self.__fknm = self.__init_c()
+
     def __eq__(self, other):
         return repr(self) == repr(other)
 
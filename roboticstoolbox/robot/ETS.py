@@ -22,11 +22,13 @@ from spatialmath.base import (
     getmatrix,
 )
 from roboticstoolbox import rtb_get_param
-from roboticstoolbox.robot.IK import IK_GN, IK_LM, IK_NR, IK_QP
+from roboticstoolbox.robot.IK import IK_GN, IK_LM, IK_NR, IK_QP, _pool_map
 
 from roboticstoolbox.fknm import (
     ETS_init,
     ETS_fkine,
+    ETS_fkine_batch,
+    ETS_jacob_batch,
     ETS_jacob0,
     ETS_jacobe,
     ETS_hessian0,
@@ -34,10 +36,11 @@ from roboticstoolbox.fknm import (
     IK_NR_c,
     IK_GN_c,
     IK_LM_c,
+    IK_QP_c,
 )
 from copy import deepcopy
 from roboticstoolbox.robot.ET import ET, ET2
-from typing import Union, overload, List, Set, Tuple
+from typing import Callable, Union, overload, List, Set, Tuple
 from typing_extensions import Literal as L
 from sys import version_info
 from roboticstoolbox.tools.types import ArrayLike, NDArray
@@ -52,6 +55,59 @@ else:  # pragma: nocover
     c_property = property
 
 
+def _axes_list(axes: Union[str, List[bool]]) -> List[bool]:
+    """
+    Task space axes selection as a list of six booleans
+    """
+
+    if isinstance(axes, list):
+        return axes
+    elif axes == "all":
+        return [True, True, True, True, True, True]
+    elif axes.startswith("trans"):
+        return [True, True, True, False, False, False]
+    elif axes.startswith("rot"):
+        return [False, False, False, True, True, True]
+    else:
+        raise ValueError("axes must be all, trans, rot or both")
+
+
+def _manipulability_stack(J: NDArray, method: str) -> NDArray:
+    """
+    Manipulability of a stack of Jacobians
+
+    ``J`` is a (k, a, n) stack of Jacobians which have already been
+    reduced to the task space axes of interest. Returns the (k,)
+    manipulability measures computed with ``np.linalg`` over the stack.
+    """
+
+    if method.startswith("yoshi"):
+        if J.shape[1] == J.shape[2]:
+            # simplified case for square matrices
+            return np.abs(det(J))
+        else:
+            return np.sqrt(np.abs(det(J @ J.transpose(0, 2, 1))))
+    elif method.startswith("invc"):
+        return 1 / cond(J)
+    elif method.startswith("mins"):
+        # last/smallest singular value of each J
+        return svd(J, compute_uv=False)[:, -1]
+    else:
+        raise ValueError("Invalid method chosen")
+
+
+def _chunks(m: int, chunksize: Union[int, None]):
+    """
+    Slices which split ``m`` rows into chunks of at most ``chunksize`` rows
+    """
+
+    if chunksize is None or chunksize < 1:
+        chunksize = max(m, 1)
+
+    for start in range(0, m, chunksize):
+        yield slice(start, min(start + chunksize, m))
+
+
 class BaseETS(UserList):
     def __init__(self, *args):
         super().__init__(*args)
@@ -641,6 +697,16 @@ class BaseETS(UserList):
         memo[id(self)] = result
         return result
 
+    def __getstate__(self):
+        # the C object can not be pickled, it is rebuilt on unpickling
+        state = self.__dict__.copy()
+        state.pop("_fknm", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._update_internals()
+
     def plot(self, *args, **kwargs):
         from roboticstoolbox.robot.Robot import Robot, Robot2
 
@@ -930,6 +996,8 @@ class ETS(BaseETS):
         base: Union[NDArray, SE3, None] = None,
         tool: Union[NDArray, SE3, None] = None,
         include_base: bool = True,
+        threads: Union[int, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> SE3:
         """
         Forward kinematics
@@ -951,6 +1019,12 @@ class ETS(BaseETS):
             tool transform, optional
         include_base
             set to True if the base transform should be considered
+        threads
+            evaluate a trajectory in batch mode using this many native worker
+            threads, ``0`` uses one thread per CPU core. See :func:`eval`
+        out
+            a float64 array to write the result into rather than allocating
+            a new one. See :func:`eval`
 
         Returns
         -------
@@ -971,6 +1045,11 @@ class ETS(BaseETS):
         -----
         - A tool transform, if provided, is incorporated into the result.
         - Works from the end-effector link to the base
+        - For a trajectory, the values of the returned ``SE3`` are views into
+          the (m, 4, 4) array computed by :func:`eval`, no per-pose copy is
+          made.
+        - If ``out`` is given the returned ``SE3`` is a view of ``out``, so
+          it is overwritten by the next call that reuses the same buffer.
 
         References
         ----------
@@ -980,15 +1059,15 @@ class ETS(BaseETS):
         """  # noqa
 
         ret = SE3.Empty()
-        fk = self.eval(q, base, tool, include_base)
+        fk = self.eval(q, base, tool, include_base, threads=threads, out=out)
 
         if fk.dtype == "O":
             # symbolic
             fk = np.array(simplify(fk))
 
         if fk.ndim == 3:
-            for T in fk:
-                ret.append(SE3(T, check=False))  # type: ignore
+            # each value is a view into the (m, 4, 4) buffer
+            ret.data = list(fk)
         else:
             ret = SE3(fk, check=False)
 
@@ -1000,6 +1079,8 @@ class ETS(BaseETS):
         base: Union[NDArray, SE3, None] = None,
         tool: Union[NDArray, SE3, None] = None,
         include_base: bool = True,
+        threads: Union[int, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         """
         Forward kinematics
@@ -1011,6 +1092,12 @@ class ETS(BaseETS):
         If ``q`` has multiple rows (mxn), it is considered a trajectory and the
         result is an ``SE3`` instance with ``m`` values.
 
+        **Batch operation**:
+        If ``threads`` is given, every row of ``q`` is treated as a
+        configuration and the result is always an (m, 4, 4) array. The rows
+        are split across ``threads`` native worker threads (``0`` uses one
+        thread per CPU core) which run without holding the GIL.
+
         Attributes
         ----------
         q
@@ -1021,6 +1108,13 @@ class ETS(BaseETS):
             tool transform, optional
         include_base
             set to True if the base transform should be considered
+        threads
+            number of native worker threads for batch operation
+        out
+            a float64 array of the result shape, (4, 4) or (m, 4, 4), to
+            write the result into. It is returned in place of a newly
+            allocated array
+
         Returns
         -------
             The transformation matrix representing the pose of the
@@ -1040,6 +1134,9 @@ class ETS(BaseETS):
         -----
         - A tool transform, if provided, is incorporated into the result.
         - Works from the end-effector link to the base
+        - A (4, 4) ``out`` may be C or Fortran ordered, an (m, 4, 4) ``out``
+          must be C ordered. Reusing ``out`` across calls avoids allocating
+          a result array on every call.
 
         References
         ----------
@@ -1048,10 +1145,21 @@ class ETS(BaseETS):
 
         """  # noqa
 
-        try:
-            return ETS_fkine(self._fknm, q, base, tool, include_base)
-        except BaseException:
-            pass
+        if threads is not None:
+            try:
+                return ETS_fkine_batch(
+                    self._fknm, q, base, tool, include_base, threads, out
+                )
+            except TypeError:
+                pass
+        else:
+            try:
+                return ETS_fkine(self._fknm, q, base, tool, include_base, out)
+            except ValueError:
+                if out is not None:
+                    raise
+            except BaseException:
+                pass
 
         q = getmatrix(q, (None, None))
         l, _ = q.shape  # type: ignore
@@ -1114,12 +1222,17 @@ class ETS(BaseETS):
             else:
                 T = Tk
 
+        if out is not None:
+            out[...] = T
+            return out
+
         return T
 
     def jacob0(
         self,
         q: ArrayLike,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator geometric Jacobian in the base frame
@@ -1138,6 +1251,9 @@ class ETS(BaseETS):
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a (6, n) float64 array, C or Fortran ordered, to write the
+            Jacobian into rather than allocating a new one
 
         Returns
         -------
@@ -1170,7 +1286,7 @@ class ETS(BaseETS):
 
         # Use c extension
         try:
-            return ETS_jacob0(self._fknm, q, tool)
+            return ETS_jacob0(self._fknm, q, tool, out)
         except TypeError:
             pass
 
@@ -1239,12 +1355,17 @@ class ETS(BaseETS):
                 if A is not None:
                     U = U @ A
 
+        if out is not None:
+            out[...] = J
+            return out
+
         return J
 
     def jacobe(
         self,
         q: ArrayLike,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator geometric Jacobian in the end-effector frame
@@ -1268,6 +1389,9 @@ class ETS(BaseETS):
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a (6, n) float64 array, C or Fortran ordered, to write the
+            Jacobian into rather than allocating a new one
 
         Returns
         -------
@@ -1300,18 +1424,25 @@ class ETS(BaseETS):
 
         # Use c extension
         try:
-            return ETS_jacobe(self._fknm, q, tool)
+            return ETS_jacobe(self._fknm, q, tool, out)
         except TypeError:
             pass
 
         T = self.eval(q, tool=tool, include_base=False)
-        return tr2jac(T.T) @ self.jacob0(q, tool=tool)
+        Je = tr2jac(T.T) @ self.jacob0(q, tool=tool)
+
+        if out is not None:
+            out[...] = Je
+            return out
+
+        return Je
 
     def hessian0(
         self,
         q: Union[ArrayLike, None] = None,
         J0: Union[NDArray, None] = None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator Hessian
@@ -1331,6 +1462,9 @@ class ETS(BaseETS):
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a C ordered (n, 6, n) float64 array to write the Hessian into
+            rather than allocating a new one
 
         Returns
         -------
@@ -1381,7 +1515,7 @@ class ETS(BaseETS):
 
         # Use c extension
         try:
-            return ETS_hessian0(self._fknm, q, J0, tool)
+            return ETS_hessian0(self._fknm, q, J0, tool, out)
         except TypeError:
             pass
 
@@ -1399,7 +1533,11 @@ class ETS(BaseETS):
         else:
             verifymatrix(J0, (6, self.n))
 
-        H = np.zeros((n, 6, n))
+        if out is None:
+            H = np.zeros((n, 6, n))
+        else:
+            H = out
+            H[...] = 0
 
         for j in range(n):
             for i in range(j, n):
@@ -1416,6 +1554,7 @@ class ETS(BaseETS):
         q: Union[ArrayLike, None] = None,
         Je: Union[NDArray, None] = None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator Hessian
@@ -1435,6 +1574,9 @@ class ETS(BaseETS):
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a C ordered (n, 6, n) float64 array to write the Hessian into
+            rather than allocating a new one
 
         Returns
         -------
@@ -1485,7 +1627,7 @@ class ETS(BaseETS):
 
         # Use c extension
         try:
-            return ETS_hessiane(self._fknm, q, Je, tool)
+            return ETS_hessiane(self._fknm, q, Je, tool, out)
         except TypeError:
             pass
 
@@ -1503,7 +1645,11 @@ class ETS(BaseETS):
         else:
             verifymatrix(Je, (6, self.n))
 
-        H = np.zeros((n, 6, n))
+        if out is None:
+            H = np.zeros((n, 6, n))
+        else:
+            H = out
+            H[...] = 0
 
         for j in range(n):
             for i in range(j, n):
@@ -1515,6 +1661,205 @@ class ETS(BaseETS):
 
         return H
 
+    def jacob0_batch(
+        self,
+        q: ArrayLike,
+        tool: Union[NDArray, SE3, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        r"""
+        Manipulator geometric Jacobians in the base frame for many configurations
+
+        ``robot.jacob0_batch(q)`` is the stack of manipulator Jacobians in the
+        base frame, one for each row of ``q``.
+
+        Parameters
+        ----------
+        q
+            Joint coordinates, an (m, n) array with one configuration per row
+        tool
+            a static tool transformation matrix to apply to the
+            end of end, defaults to None
+        threads
+            number of native worker threads, ``0`` uses one thread per CPU
+            core
+
+        Returns
+        -------
+        J0
+            (m, 6, n) array of manipulator Jacobians in the base frame
+
+        Examples
+        --------
+        .. runblock:: pycon
+        >>> import roboticstoolbox as rtb
+        >>> import numpy as np
+        >>> panda = rtb.models.Panda().ets()
+        >>> panda.jacob0_batch(np.random.rand(100, 7)).shape
+
+        See Also
+        --------
+        :func:`jacob0`
+        """  # noqa
+
+        return self._jacob_batch(q, tool, 0, True, False, threads)[0]
+
+    def jacobe_batch(
+        self,
+        q: ArrayLike,
+        tool: Union[NDArray, SE3, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        r"""
+        Manipulator geometric Jacobians in the end-effector frame for many
+        configurations
+
+        ``robot.jacobe_batch(q)`` is the stack of manipulator Jacobians in the
+        end-effector frame, one for each row of ``q``.
+
+        Parameters
+        ----------
+        q
+            Joint coordinates, an (m, n) array with one configuration per row
+        tool
+            a static tool transformation matrix to apply to the
+            end of end, defaults to None
+        threads
+            number of native worker threads, ``0`` uses one thread per CPU
+            core
+
+        Returns
+        -------
+        Je
+            (m, 6, n) array of manipulator Jacobians in the end-effector frame
+
+        See Also
+        --------
+        :func:`jacobe`
+        """  # noqa
+
+        return self._jacob_batch(q, tool, 1, True, False, threads)[0]
+
+    def hessian0_batch(
+        self,
+        q: ArrayLike,
+        tool: Union[NDArray, SE3, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        r"""
+        Manipulator Hessians in the base frame for many configurations
+
+        ``robot.hessian0_batch(q)`` is the stack of manipulator Hessians in the
+        base frame, one for each row of ``q``.
+
+        Parameters
+        ----------
+        q
+            Joint coordinates, an (m, n) array with one configuration per row
+        tool
+            a static tool transformation matrix to apply to the
+            end of end, defaults to None
+        threads
+            number of native worker threads, ``0`` uses one thread per CPU
+            core
+
+        Returns
+        -------
+        H0
+            (m, n, 6, n) array of manipulator Hessians in the base frame
+
+        See Also
+        --------
+        :func:`hessian0`
+        """  # noqa
+
+        return self._jacob_batch(q, tool, 0, False, True, threads)[1]
+
+    def hessiane_batch(
+        self,
+        q: ArrayLike,
+        tool: Union[NDArray, SE3, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        r"""
+        Manipulator Hessians in the end-effector frame for many configurations
+
+        ``robot.hessiane_batch(q)`` is the stack of manipulator Hessians in the
+        end-effector frame, one for each row of ``q``.
+
+        Parameters
+        ----------
+        q
+            Joint coordinates, an (m, n) array with one configuration per row
+        tool
+            a static tool transformation matrix to apply to the
+            end of end, defaults to None
+        threads
+            number of native worker threads, ``0`` uses one thread per CPU
+            core
+
+        Returns
+        -------
+        He
+            (m, n, 6, n) array of manipulator Hessians in the end-effector frame
+
+        See Also
+        --------
+        :func:`hessiane`
+        """  # noqa
+
+        return self._jacob_batch(q, tool, 1, False, True, threads)[1]
+
+    def _jacob_batch(
+        self,
+        q: ArrayLike,
+        tool: Union[NDArray, SE3, None],
+        frame: int,
+        jacob: bool,
+        hessian: bool,
+        threads: int,
+    ) -> Tuple[Union[NDArray, None], Union[NDArray, None]]:
+        """
+        Jacobians and Hessians for each row of ``q``
+
+        ``frame`` is 0 for the base frame and 1 for the end-effector frame.
+        The Jacobian and Hessian of a row are computed from one pass over
+        the link transforms. Returns the tuple ``(J, H)`` where an array
+        not requested is None.
+        """
+
+        if isinstance(tool, SE3):
+            tool = np.array(tool.A)
+
+        # Use c extension
+        try:
+            return ETS_jacob_batch(
+                self._fknm, q, tool, frame, int(jacob), int(hessian), threads
+            )
+        except TypeError:
+            pass
+
+        # Otherwise use Python, one row at a time
+        q = getmatrix(q, (None, None))
+        J = []
+        H = []
+
+        for qk in q:
+            if frame == 0:
+                Jk = self.jacob0(qk, tool=tool)
+                Hk = self.hessian0(J0=Jk) if hessian else None
+            else:
+                Jk = self.jacobe(qk, tool=tool)
+                Hk = self.hessiane(Je=Jk) if hessian else None
+
+            J.append(Jk)
+            H.append(Hk)
+
+        return (
+            np.array(J) if jacob else None,
+            np.array(H) if hessian else None,
+        )
+
     def jacob0_analytical(
         self,
         q: ArrayLike,
@@ -1612,12 +1957,16 @@ class ETS(BaseETS):
         - J. Haviland, and P. Corke. "Manipulator Differential Kinematics Part II:
           Acceleration and Advanced Applications." arXiv preprint arXiv:2207.01794 (2022).
 
+        See Also
+        --------
+        :func:`jacobm_batch`
+
         """  # noqa
 
         J = self.jacob0(q)
-        H = self.hessian0(q)
+        H = self.hessian0(J0=J)
 
-        manipulability = self.manipulability(q)
+        manipulability = _manipulability_stack(J[np.newaxis], "yoshikawa")[0]
 
         # J = J[axes, :]
         # H = H[:, axes, :]
@@ -1636,6 +1985,7 @@ class ETS(BaseETS):
         q,
         method: L["yoshikawa", "minsingular", "invcondition"] = "yoshikawa",
         axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        out: Union[NDArray, None] = None,
     ):
         """
         Manipulability measure
@@ -1656,6 +2006,9 @@ class ETS(BaseETS):
         axes
             Task space axes to consider: "all" [default],
             "trans", or "rot"
+        out
+            a float64 array of shape (m,) to write the manipulability of
+            each configuration into, it is returned even when m is 1
 
         Returns
         -------
@@ -1680,7 +2033,7 @@ class ETS(BaseETS):
 
         If ``q`` is a matrix (m,n) then the result (m,) is a vector of
         manipulability indices for each joint configuration specified by a row
-        of ``q``.
+        of ``q``. It is computed by :func:`manipulability_batch`.
 
         Notes
         -----
@@ -1711,18 +2064,7 @@ class ETS(BaseETS):
 
         """
 
-        axes_list: List[bool] = []
-
-        if isinstance(axes, list):
-            axes_list = axes
-        elif axes == "all":
-            axes_list = [True, True, True, True, True, True]
-        elif axes.startswith("trans"):
-            axes_list = [True, True, True, False, False, False]
-        elif axes.startswith("rot"):
-            axes_list = [False, False, False, True, True, True]
-        else:
-            raise ValueError("axes must be all, trans, rot or both")
+        axes_list = _axes_list(axes)
 
         def yoshikawa(robot, J, q, axes, **kwargs):
             J = J[axes, :]
@@ -1754,17 +2096,182 @@ class ETS(BaseETS):
 
         # Otherwise use the q vector/matrix
         q = np.array(getmatrix(q, (None, self.n)))
-        w = np.zeros(q.shape[0])
+
+        if q.shape[0] > 1:
+            # trajectories are evaluated over stacked Jacobians
+            return self.manipulability_batch(q, method, axes, out=out)
+
+        if out is None:
+            w = np.zeros(q.shape[0])
+        else:
+            verifymatrix(out, (q.shape[0],))
+            w = out
+
+        # one Jacobian buffer is reused for every configuration
+        Jk = np.empty((6, self.n), order="F")
 
         for k, qk in enumerate(q):
-            Jk = self.jacob0(qk)
+            Jk = self.jacob0(qk, out=Jk)
             w[k] = mfunc(self, Jk, qk, axes_list)
 
-        if len(w) == 1:
+        if out is not None:
+            return out
+        elif len(w) == 1:
             return w[0]
         else:
             return w
 
+    def manipulability_batch(
+        self,
+        q: ArrayLike,
+        method: L["yoshikawa", "minsingular", "invcondition"] = "yoshikawa",
+        axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        chunksize: Union[int, None] = None,
+        threads: int = 1,
+        out: Union[NDArray, None] = None,
+    ) -> NDArray:
+        """
+        Manipulability measure for many configurations
+
+        ``manipulability_batch(q)`` is the (m,) vector of manipulability
+        indices, one for each row of the (m, n) joint coordinate array ``q``.
+        The Jacobians are computed with :func:`jacob0_batch` and the measure
+        is evaluated with ``np.linalg`` over the stack of Jacobians, which
+        makes dexterity maps over large grids of configurations practical.
+
+        Parameters
+        ----------
+        q
+            Joint coordinates, an (m, n) array with one configuration per row
+        method
+            method to use, "yoshikawa" (default), "invcondition",
+            "minsingular"
+        axes
+            Task space axes to consider: "all" [default],
+            "trans", or "rot"
+        chunksize
+            number of configurations evaluated together, bounds the memory
+            used by the Jacobian stack to ``chunksize * 6 * n`` floats.
+            Defaults to all of ``q`` at once
+        threads
+            number of native worker threads used for the Jacobians, ``0``
+            uses one thread per CPU core
+        out
+            a float64 array of shape (m,) to write the result into
+
+        Returns
+        -------
+        manipulability
+            (m,) array of manipulability indices
+
+        Examples
+        --------
+        .. runblock:: pycon
+        >>> import roboticstoolbox as rtb
+        >>> import numpy as np
+        >>> panda = rtb.models.Panda().ets()
+        >>> panda.manipulability_batch(np.random.rand(5, 7))
+
+        See Also
+        --------
+        :func:`manipulability`
+        :func:`jacobm_batch`
+        """
+
+        axes_list = _axes_list(axes)
+        method = method.lower()
+
+        if not method.startswith(("yoshi", "invc", "mins")):
+            raise ValueError("Invalid method chosen")
+
+        q = np.array(getmatrix(q, (None, self.n)))
+
+        if out is None:
+            out = np.empty(q.shape[0])
+        else:
+            verifymatrix(out, (q.shape[0],))
+
+        for rows in _chunks(q.shape[0], chunksize):
+            J = self.jacob0_batch(q[rows], threads=threads)
+            out[rows] = _manipulability_stack(J[:, axes_list, :], method)
+
+        return out
+
+    def jacobm_batch(
+        self,
+        q: ArrayLike,
+        axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        chunksize: Union[int, None] = None,
+        threads: int = 1,
+        out: Union[NDArray, None] = None,
+    ) -> NDArray:
+        r"""
+        The manipulability Jacobian for many configurations
+
+        ``jacobm_batch(q)`` is the (m, n) array whose rows are the
+        manipulability Jacobians of the rows of the (m, n) joint
+        coordinate array ``q``. Row ``k`` equals ``jacobm(q[k]).flatten()``.
+
+        Parameters
+        ----------
+        q
+            Joint coordinates, an (m, n) array with one configuration per row
+        axes
+            Task space axes to consider: "all" [default],
+            "trans", or "rot"
+        chunksize
+            number of configurations evaluated together, bounds the memory
+            used by the Hessian stack to ``chunksize * 6 * n * n`` floats.
+            Defaults to all of ``q`` at once
+        threads
+            number of native worker threads used for the Jacobians and
+            Hessians, ``0`` uses one thread per CPU core
+        out
+            a float64 array of shape (m, n) to write the result into
+
+        Returns
+        -------
+        jacobm
+            (m, n) array of manipulability Jacobians
+
+        Synopsis
+        --------
+        The Jacobian and Hessian of each configuration come from a single
+        :func:`hessian0_batch` style pass, and with
+        :math:`\mat{b} = (\mat{J}\mat{J}^T)^{-1}` the elements are
+
+        .. math::
+
+            \frac{\partial m}{\partial q_i} = m \sum_{c,j} \mat{H}_{i,c,j}
+            (\mat{b} \mat{J})_{c,j}
+
+        evaluated for the whole stack with ``np.einsum``.
+
+        See Also
+        --------
+        :func:`jacobm`
+        :func:`manipulability_batch`
+        """  # noqa
+
+        axes_list = _axes_list(axes)
+        q = np.array(getmatrix(q, (None, self.n)))
+
+        if out is None:
+            out = np.empty((q.shape[0], self.n))
+        else:
+            verifymatrix(out, (q.shape[0], self.n))
+
+        for rows in _chunks(q.shape[0], chunksize):
+            J, H = self._jacob_batch(q[rows], None, 0, True, True, threads)
+            J = J[:, axes_list, :]
+            H = H[:, :, axes_list, :]
+
+            m = _manipulability_stack(J, "yoshikawa")
+            bJ = inv(J @ J.transpose(0, 2, 1)) @ J
+            out[rows] = m[:, np.newaxis] * np.einsum("kicj,kcj->ki", H, bJ)
+
+        return out
+
     def partial_fkine0(self, q: ArrayLike, n: int) -> NDArray:
         r"""
         Manipulator Forward Kinematics nth Partial Derivative
@@ -1969,6 +2476,7 @@ class ETS(BaseETS):
         joint_limits: bool = True,
         k: float = 1.0,
         method: L["chan", "wampler", "sugihara"] = "chan",
+        threads: int = 1,
     ) -> Tuple[NDArray, int, int, int, float]:
         r"""
         Fast levenberg-Marquadt Numerical Inverse Kinematics Solver
@@ -2007,6 +2515,15 @@ class ETS(BaseETS):
         method
             One of "chan", "sugihara" or "wampler". Defines which method is used
             to calculate the damping matrix Wn in the ``step`` method
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
+
+        **Trajectory operation**:
+        If ``Tep`` holds ``m`` poses, each pose is solved independently by a
+        pool of ``threads`` worker threads, which run the C++ solver without
+        holding the GIL. Each element of ``sol`` then holds ``m`` per-pose
+        values and ``q`` is an (m, n) ndarray.
 
         Synopsis
         --------
@@ -2112,8 +2629,18 @@ class ETS(BaseETS):
 
         """  # noqa
 
-        return IK_LM_c(
-            self._fknm, Tep, q0, ilimit, slimit, tol, joint_limits, mask, k, method
+        return self._ik_c(
+            IK_LM_c,
+            Tep,
+            q0,
+            threads,
+            ilimit,
+            slimit,
+            tol,
+            joint_limits,
+            mask,
+            k,
+            method,
         )
 
     def ik_NR(
@@ -2127,6 +2654,7 @@ class ETS(BaseETS):
         joint_limits: bool = True,
         pinv: int = True,
         pinv_damping: float = 0.0,
+        threads: int = 1,
     ) -> Tuple[NDArray, int, int, int, float]:
         r"""
         Fast numerical inverse kinematics using Newton-Raphson optimization
@@ -2168,6 +2696,9 @@ class ETS(BaseETS):
             Use the psuedo-inverse instad of the normal matrix inverse
         pinv_damping
             Damping factor for the psuedo-inverse
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
 
         Returns
         -------
@@ -2190,6 +2721,12 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Trajectory operation**:
+        If ``Tep`` holds ``m`` poses, each pose is solved independently by a
+        pool of ``threads`` worker threads, which run the C++ solver without
+        holding the GIL. Each element of ``sol`` then holds ``m`` per-pose
+        values and ``q`` is an (m, n) ndarray.
+
         Synopsis
         --------
         Each iteration uses the Newton-Raphson optimisation method
@@ -2231,10 +2768,11 @@ class ETS(BaseETS):
 
         """  # noqa
 
-        return IK_NR_c(
-            self._fknm,
+        return self._ik_c(
+            IK_NR_c,
             Tep,
             q0,
+            threads,
             ilimit,
             slimit,
             tol,
@@ -2255,6 +2793,7 @@ class ETS(BaseETS):
         joint_limits: bool = True,
         pinv: int = True,
         pinv_damping: float = 0.0,
+        threads: int = 1,
     ) -> Tuple[NDArray, int, int, int, float]:
         r"""
         Fast numerical inverse kinematics by Gauss-Newton optimization
@@ -2296,6 +2835,9 @@ class ETS(BaseETS):
             Use the psuedo-inverse instad of the normal matrix inverse
         pinv_damping
             Damping factor for the psuedo-inverse
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
 
         Returns
         -------
@@ -2318,6 +2860,12 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Trajectory operation**:
+        If ``Tep`` holds ``m`` poses, each pose is solved independently by a
+        pool of ``threads`` worker threads, which run the C++ solver without
+        holding the GIL. Each element of ``sol`` then holds ``m`` per-pose
+        values and ``q`` is an (m, n) ndarray.
+
         Synopsis
         --------
         Each iteration uses the Gauss-Newton optimisation method
@@ -2374,10 +2922,11 @@ class ETS(BaseETS):
 
         """  # noqa
 
-        return IK_GN_c(
-            self._fknm,
+        return self._ik_c(
+            IK_GN_c,
             Tep,
             q0,
+            threads,
             ilimit,
             slimit,
             tol,
@@ -2387,6 +2936,189 @@ class ETS(BaseETS):
             pinv_damping,
         )
 
+    def ik_QP(
+        self,
+        Tep: Union[NDArray, SE3],
+        q0: Union[NDArray, None] = None,
+        ilimit: int = 30,
+        slimit: int = 100,
+        tol: float = 1e-6,
+        mask: Union[NDArray, None] = None,
+        joint_limits: bool = True,
+        kj: float = 0.01,
+        ks: float = 1.0,
+        kq: float = 0.0,
+        ps: float = 0.0,
+        pi: Union[NDArray, float] = 0.3,
+        threads: int = 1,
+    ) -> Tuple[NDArray, int, int, int, float]:
+        r"""
+        Fast numerical inverse kinematics by quadratic programming
+
+        ``sol = ets.ik_QP(Tep)`` are the joint coordinates (n) corresponding
+        to the robot end-effector pose ``Tep`` which is an ``SE3`` or ``ndarray`` object.
+        This method can be used for robots with any number of degrees of freedom. This
+        is a fast solver implemented in C++ which does not require ``qpsolvers``.
+
+        See the :ref:`Inverse Kinematics Docs Page <IK>` for more details and for a
+        **tutorial** on numerical IK, see `here <https://bit.ly/3ak5GDi>`_.
+
+        Parameters
+        ----------
+        Tep
+            The desired end-effector pose or pose trajectory
+        q0
+            initial joint configuration (default to random valid joint
+            configuration contrained by the joint limits of the robot)
+        ilimit
+            maximum number of iterations per search
+        slimit
+            maximum number of search attempts
+        tol
+            final error tolerance
+        mask
+            a mask vector which weights the end-effector error priority.
+            Corresponds to translation in X, Y and Z and rotation about X, Y and Z
+            respectively
+        joint_limits
+            constrain the solution to being within the joint limits of
+            the robot (reject solution with invalid joint configurations and perfrom
+            another search up to the slimit)
+        kj
+            A gain for joint velocity norm minimisation
+        ks
+            A gain which adjusts the cost of slack (intentional error)
+        kq
+            The gain for the joint limit velocity dampers. Setting to 0.0 will
+            remove them completely from the solution
+        ps
+            The minimum angle/distance (in radians or metres) in which the joint is
+            allowed to approach to its limit
+        pi
+            The influence angle/distance (in radians or metres) in which the
+            velocity damper becomes active
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
+
+        Returns
+        -------
+        sol
+            tuple (q, success, iterations, searches, residual)
+
+        The return value ``sol`` is a tuple with elements:
+
+        ============    ==========  ===============================================
+        Element         Type        Description
+        ============    ==========  ===============================================
+        ``q``           ndarray(n)  joint coordinates in units of radians or metres
+        ``success``     int         whether a solution was found
+        ``iterations``  int         total number of iterations
+        ``searches``    int         total number of searches
+        ``residual``    float       final value of cost function
+        ============    ==========  ===============================================
+
+        If ``success == 0`` the ``q`` values will be valid numbers, but the
+        solution will be in error.  The amount of error is indicated by
+        the ``residual``.
+
+        **Trajectory operation**:
+        If ``Tep`` holds ``m`` poses, each pose is solved independently by a
+        pool of ``threads`` worker threads, which run the C++ solver without
+        holding the GIL. Each element of ``sol`` then holds ``m`` per-pose
+        values and ``q`` is an (m, n) ndarray.
+
+        Synopsis
+        --------
+        Each iteration solves the QP of
+        :py:meth:`IK_QP.step <roboticstoolbox.robot.IK.IK_QP.step>`, without
+        the manipulability maximisation term. The slack is substituted out
+        of the equality constraint, leaving a QP in the joint velocity whose
+        only constraints are the joint limit velocity dampers. As each damper
+        bounds a single joint, this is solved exactly by a small active set
+        method.
+
+        Examples
+        --------
+        The following example gets the ``ets`` of a ``panda`` robot object, makes a goal
+        pose ``Tep``, and then solves for the joint coordinates which result in the pose
+        ``Tep`` using the `ik_QP` method.
+
+        .. runblock:: pycon
+        >>> import roboticstoolbox as rtb
+        >>> panda = rtb.models.Panda().ets()
+        >>> Tep = panda.fkine([0, -0.3, 0, -2.2, 0, 2, 0.7854])
+        >>> panda.ik_QP(Tep, kq=1.0)
+
+        References
+        ----------
+        - J. Haviland, and P. Corke. "Manipulator Differential Kinematics Part II:
+          Acceleration and Advanced Applications." arXiv preprint arXiv:2207.01794 (2022).
+
+        See Also
+        --------
+        ik_LM
+            A fast numerical inverse kinematics solver using Levenberg-Marquadt optimisation
+        ikine_QP
+            Implements the :py:class:`~roboticstoolbox.robot.IK.IK_QP` class as a method within the :py:class:`ETS` class
+
+        """  # noqa
+
+        if isinstance(pi, (int, float)):
+            pi = pi * np.ones(self.n)
+
+        return self._ik_c(
+            IK_QP_c,
+            Tep,
+            q0,
+            threads,
+            ilimit,
+            slimit,
+            tol,
+            joint_limits,
+            mask,
+            kj,
+            ks,
+            kq,
+            ps,
+            pi,
+        )
+
+    def _ik_c(
+        self,
+        func: Callable,
+        Tep: Union[NDArray, SE3],
+        q0: Union[NDArray, None],
+        threads: int,
+        *args,
+    ):
+        """
+        Calls the C++ IK solver ``func`` for ``Tep``
+
+        If ``Tep`` holds more than one pose, each pose is solved by a pool of
+        ``threads`` worker threads and the solution of each pose is stacked.
+        """
+
+        if isinstance(Tep, SE3):
+            Tep = Tep.A
+
+        Tep = np.asarray(Tep)
+
+        if Tep.ndim != 3:
+            return func(self._fknm, Tep, q0, *args)
+
+        sols = _pool_map(lambda T: func(self._fknm, T, q0, *args), Tep, threads)
+
+        q, success, iterations, searches, residual = zip(*sols)
+
+        return (
+            np.array(q),
+            np.array(success),
+            np.array(iterations),
+            np.array(searches),
+            np.array(residual),
+        )
+
     def ikine_LM(
         self,
         Tep: Union[NDArray, SE3],
@@ -2403,6 +3135,8 @@ class ETS(BaseETS):
         km: float = 0.0,
         ps: float = 0.0,
         pi: Union[NDArray, float] = 0.3,
+        threads: Union[int, None] = None,
+        warm_start: bool = False,
         **kwargs,
     ):
         r"""
@@ -2453,6 +3187,12 @@ class ETS(BaseETS):
         pi
             The influence angle/distance (in radians or metres) in null space motion
             becomes active
+        threads
+            number of worker threads used to solve a trajectory ``Tep``, see
+            :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
+        warm_start
+            solve a trajectory ``Tep`` in order, seeding each pose from the
+            previous solution, see :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
 
         Synopsis
         --------
@@ -2581,7 +3321,9 @@ class ETS(BaseETS):
         # if isinstance(Tep, SE3):
         #     Tep = Tep.A
 
-        return solver.solve(ets=self, Tep=Tep, q0=q0)
+        return solver.solve(
+            ets=self, Tep=Tep, q0=q0, threads=threads, warm_start=warm_start
+        )
 
     def ikine_NR(
         self,
@@ -2598,6 +3340,8 @@ class ETS(BaseETS):
         km: float = 0.0,
         ps: float = 0.0,
         pi: Union[NDArray, float] = 0.3,
+        threads: Union[int, None] = None,
+        warm_start: bool = False,
         **kwargs,
     ):
         r"""
@@ -2649,6 +3393,12 @@ class ETS(BaseETS):
         pi
             The influence angle/distance (in radians or metres) in null space motion
             becomes active
+        threads
+            number of worker threads used to solve a trajectory ``Tep``, see
+            :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
+        warm_start
+            solve a trajectory ``Tep`` in order, seeding each pose from the
+            previous solution, see :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
 
         Synopsis
         --------
@@ -2720,7 +3470,9 @@ class ETS(BaseETS):
         # if isinstance(Tep, SE3):
         #     Tep = Tep.A
 
-        return solver.solve(ets=self, Tep=Tep, q0=q0)
+        return solver.solve(
+            ets=self, Tep=Tep, q0=q0, threads=threads, warm_start=warm_start
+        )
 
     def ikine_GN(
         self,
@@ -2737,6 +3489,8 @@ class ETS(BaseETS):
         km: float = 0.0,
         ps: float = 0.0,
         pi: Union[NDArray, float] = 0.3,
+        threads: Union[int, None] = None,
+        warm_start: bool = False,
         **kwargs,
     ):
         r"""
@@ -2788,6 +3542,12 @@ class ETS(BaseETS):
         pi
             The influence angle/distance (in radians or metres) in null space motion
             becomes active
+        threads
+            number of worker threads used to solve a trajectory ``Tep``, see
+            :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
+        warm_start
+            solve a trajectory ``Tep`` in order, seeding each pose from the
+            previous solution, see :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
 
         Synopsis
         --------
@@ -2874,7 +3634,9 @@ class ETS(BaseETS):
         # if isinstance(Tep, SE3):
         #     Tep = Tep.A
 
-        return solver.solve(ets=self, Tep=Tep, q0=q0)
+        return solver.solve(
+            ets=self, Tep=Tep, q0=q0, threads=threads, warm_start=warm_start
+        )
 
     def ikine_QP(
         self,
@@ -2892,6 +3654,8 @@ class ETS(BaseETS):
         km: float = 0.0,
         ps: float = 0.0,
         pi: Union[NDArray, float] = 0.3,
+        threads: Union[int, None] = None,
+        warm_start: bool = False,
         **kwargs,
     ):
         r"""
@@ -2940,6 +3704,12 @@ class ETS(BaseETS):
         pi
             The influence angle/distance (in radians or metres) in null space motion
             becomes active
+        threads
+            number of worker threads used to solve a trajectory ``Tep``, see
+            :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
+        warm_start
+            solve a trajectory ``Tep`` in order, seeding each pose from the
+            previous solution, see :func:`~roboticstoolbox.robot.IK.IKSolver.solve`
 
         Raises
         ------
@@ -3071,7 +3841,9 @@ class ETS(BaseETS):
         # if isinstance(Tep, SE3):
         #     Tep = Tep.A
 
-        return solver.solve(ets=self, Tep=Tep, q0=q0)
+        return solver.solve(
+            ets=self, Tep=Tep, q0=q0, threads=threads, warm_start=warm_start
+        )
 
 
 class ETS2(BaseETS):
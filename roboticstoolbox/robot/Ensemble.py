@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+
+"""
+Ensembles of robot models with perturbed dynamic parameters
+
+An ensemble shares the kinematics of a robot and stores the mass, centre of
+mass and inertia tensor of every link of every model as stacked arrays, so
+the dynamics of all the models are evaluated by one call to the compiled
+extension rather than one robot copy per model.
+"""
+
+from typing import Tuple, Union
+
+import numpy as np
+import roboticstoolbox as rtb
+from spatialmath.base import getvector
+from roboticstoolbox.tools.types import ArrayLike, NDArray
+from roboticstoolbox.fknm import Robot_rne, Robot_crba, Robot_aba
+
+
+class DynamicsEnsemble:
+    """
+    An ensemble of dynamic models of a robot
+
+    The models differ only in their link inertial parameters. Every method
+    accepts joint arrays of shape (n) or (m,n), which are shared by all the
+    models, or (N,m,n) with one trajectory per model, and returns results
+    with a leading axis of one entry per model. Use
+    :func:`~roboticstoolbox.robot.Dynamics.DynamicsMixin.perturb_ensemble` to
+    create an ensemble.
+
+    Parameters
+    ----------
+    robot
+        The robot which provides the kinematics and the motor parameters
+    m
+        The mass of each link of each model (N,nb)
+    r
+        The centre of mass of each link of each model (N,nb,3)
+    I
+        The inertia tensor about the centre of mass of each link of each
+        model (N,nb,3,3)
+
+    Attributes
+    ----------
+    links
+        The links of the robot in the order of the parameter arrays, parents
+        before their children
+    m
+        The link masses (N,nb)
+    r
+        The link centres of mass (N,nb,3)
+    I
+        The link inertia tensors (N,nb,3,3)
+
+    Notes
+    -----
+    - The links include fixed links, which carry inertia, and are ordered
+        so that parents come before their children.
+    - For DH robots the motor inertia and joint friction of the robot are
+        shared by all the models.
+
+    """
+
+    def __init__(self, robot, m: ArrayLike, r: ArrayLike, I: ArrayLike):  # noqa
+        model = robot._rne_model()
+
+        if model is None:
+            raise ValueError("the robot must have numeric dynamic parameters")
+
+        self.robot = robot
+        self.links, self._parent = robot._dyn_links()
+        self._ets, _, _, _ = model
+
+        nb = len(self.links)
+        self.m = np.array(m, dtype=np.float64).reshape((-1, nb))
+        N = self.m.shape[0]
+        self.r = np.array(r, dtype=np.float64).reshape((N, nb, 3))
+        self.I = np.array(I, dtype=np.float64).reshape((N, nb, 3, 3))
+
+    def __len__(self) -> int:
+        return self.m.shape[0]
+
+    def __repr__(self) -> str:
+        return f"DynamicsEnsemble({self.robot.name}, N={len(self)})"
+
+    @property
+    def n(self) -> int:
+        """
+        The number of joints
+
+        """
+        return self.robot.n
+
+    def model(self, i: int):
+        """
+        A model of the ensemble as a robot
+
+        Parameters
+        ----------
+        i
+            The index of the model
+
+        Returns
+        -------
+        robot
+            A copy of the robot with the inertial parameters of the model
+
+        """
+
+        robot = self.robot.copy()
+        links, _ = robot._dyn_links()
+
+        for link, m, r, I in zip(links, self.m[i], self.r[i], self.I[i]):  # noqa
+            link.m = m
+            link.r = r
+            link.I = I
+
+        robot.dynchanged()
+
+        return robot
+
+    def _inertia(self) -> NDArray:
+        # the (N, nb, 13) parameters of the compiled dynamics
+        return np.concatenate(
+            (self.m[..., np.newaxis], self.r, self.I.reshape(self.I.shape[:2] + (9,))),
+            axis=2,
+        )
+
+    def _rows(self, *args: ArrayLike) -> Tuple[Tuple[NDArray, ...], Tuple[int, ...]]:
+        # broadcast joint arrays to (N, m, n) and stack the rows of all the
+        # models, the shape of the result of one joint is also returned
+        arrays = [np.asarray(a, dtype=np.float64) for a in args]
+        shape = np.broadcast_shapes(*[a.shape for a in arrays])
+
+        if len(shape) not in (1, 2, 3) or shape[-1] != self.n:
+            raise ValueError(f"joint arrays must be (n), (m,n) or (N,m,n), n={self.n}")
+
+        shape3 = (1,) * (3 - len(shape)) + shape
+
+        if shape3[0] not in (1, len(self)):
+            raise ValueError(f"joint arrays have {shape3[0]} models, not {len(self)}")
+
+        shape3 = (len(self),) + shape3[1:]
+        rows = tuple(
+            np.ascontiguousarray(np.broadcast_to(a, shape3)).reshape((-1, self.n))
+            for a in arrays
+        )
+
+        return rows, shape3[:1] if len(shape) == 1 else shape3[:2]
+
+    def _gravity(self, gravity: Union[ArrayLike, None]) -> NDArray:
+        g = self.robot.gravity if gravity is None else gravity
+        g = getvector(g, 3)
+
+        # gravity in the base frame of the robot
+        if not np.array_equal(self.robot.base.R, np.eye(3)):
+            g = self.robot.base.R.T @ g
+
+        return g
+
+    def _motor(self) -> Union[Tuple[NDArray, NDArray, NDArray], None]:
+        # the motor inertia, viscous and Coulomb friction of DH robots
+        if not isinstance(self.robot, rtb.DHRobot):
+            return None
+
+        links = self.robot.links
+        G = np.array([link.G for link in links], dtype=np.float64)
+        B = np.array([link.B for link in links], dtype=np.float64)
+        Tc = np.array([link.Tc for link in links], dtype=np.float64)
+
+        return G, B, Tc
+
+    def _friction(self, qd: NDArray) -> NDArray:
+        # the joint friction of DH robots, see Link.friction
+        motor = self._motor()
+
+        if motor is None:
+            return np.zeros(qd.shape)
+
+        G, B, Tc = motor
+
+        return -(G**2) * B * qd - np.abs(G) * np.where(
+            qd > 0, Tc[:, 0], np.where(qd < 0, Tc[:, 1], 0.0)
+        )
+
+    def _armature(self) -> NDArray:
+        # the motor inertia reflected through the gearbox
+        motor = self._motor()
+
+        if motor is None:
+            return np.zeros(self.n)
+
+        G = motor[0]
+
+        return G**2 * np.array([link.Jm for link in self.robot.links])
+
+    def rne(
+        self,
+        q: ArrayLike,
+        qd: ArrayLike,
+        qdd: ArrayLike,
+        gravity: Union[ArrayLike, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        """
+        Inverse dynamics of every model
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n), (m,n) or (N,m,n)
+        qd
+            Joint velocities (n), (m,n) or (N,m,n)
+        qdd
+            Joint accelerations (n), (m,n) or (N,m,n)
+        gravity
+            Gravitational acceleration, defaults to that of the robot
+        threads
+            The number of threads, 0 uses one thread per CPU core
+
+        Returns
+        -------
+        tau
+            The joint forces/torques (N,n) or (N,m,n)
+
+        """
+
+        (q, qd, qdd), shape = self._rows(q, qd, qdd)
+
+        tau = Robot_rne(
+            self._ets,
+            self._parent,
+            self._inertia(),
+            q,
+            qd,
+            qdd,
+            self._gravity(gravity),
+            np.zeros(6),
+            0,
+            threads,
+        )
+        tau += self._armature() * qdd - self._friction(qd)
+
+        return tau.reshape(shape + (self.n,))
+
+    def inertia(self, q: ArrayLike, threads: int = 1) -> NDArray:
+        """
+        Joint-space inertia matrix of every model
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n), (m,n) or (N,m,n)
+        threads
+            The number of threads, 0 uses one thread per CPU core
+
+        Returns
+        -------
+        M
+            The inertia matrices (N,n,n) or (N,m,n,n)
+
+        """
+
+        (q,), shape = self._rows(q)
+
+        M = Robot_crba(self._ets, self._parent, self._inertia(), q, threads)
+        j = np.arange(self.n)
+        M[:, j, j] += self._armature()
+
+        return M.reshape(shape + (self.n, self.n))
+
+    def gravload(
+        self,
+        q: ArrayLike,
+        gravity: Union[ArrayLike, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        """
+        Joint gravity load of every model
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n), (m,n) or (N,m,n)
+        gravity
+            Gravitational acceleration, defaults to that of the robot
+        threads
+            The number of threads, 0 uses one thread per CPU core
+
+        Returns
+        -------
+        G
+            The joint gravity loads (N,n) or (N,m,n)
+
+        """
+
+        z = np.zeros(np.shape(q))
+
+        return self.rne(q, z, z, gravity=gravity, threads=threads)
+
+    def accel(
+        self,
+        q: ArrayLike,
+        qd: ArrayLike,
+        torque: ArrayLike,
+        gravity: Union[ArrayLike, None] = None,
+        threads: int = 1,
+    ) -> NDArray:
+        """
+        Forward dynamics of every model
+
+        Parameters
+        ----------
+        q
+            Joint coordinates (n), (m,n) or (N,m,n)
+        qd
+            Joint velocities (n), (m,n) or (N,m,n)
+        torque
+            Joint forces/torques (n), (m,n) or (N,m,n)
+        gravity
+            Gravitational acceleration, defaults to that of the robot
+        threads
+            The number of threads, 0 uses one thread per CPU core
+
+        Returns
+        -------
+        qdd
+            The joint accelerations (N,n) or (N,m,n)
+
+        """
+
+        (q, qd, torque), shape = self._rows(q, qd, torque)
+
+        qdd = Robot_aba(
+            self._ets,
+            self._parent,
+            self._inertia(),
+            q,
+            qd,
+            torque + self._friction(qd),
+            self._armature(),
+            self._gravity(gravity),
+            threads,
+        )
+
+        return qdd.reshape(shape + (self.n,))
@@ -4,13 +4,16 @@
 @author Jesse Haviland
 """
 
+import os
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Tuple, Union
 import roboticstoolbox as rtb
 from dataclasses import dataclass
 from spatialmath import SE3
 from roboticstoolbox.tools.types import ArrayLike
+from roboticstoolbox.fknm import IK_GN_c, IK_LM_c, IK_NR_c
 
 try:
     import qpsolvers as qp
@@ -40,6 +43,16 @@ class IKSolution:
         The final error value from the cost function
     reason
         The reason the IK problem failed if applicable
+    jl_valid
+        True if q is within the joint limits of the robot
+
+    Notes
+    -----
+    A solution for a trajectory of ``m`` poses, returned by
+    :func:`IKSolver.solve` when ``threads`` or ``warm_start`` is given,
+    holds per-pose values: ``q`` is an (m, n) ndarray, ``success``,
+    ``iterations``, ``searches``, ``residual`` and ``jl_valid`` are (m,)
+    ndarrays and ``reason`` is a list of ``m`` strings.
 
 
     .. versionchanged:: 1.0.3
@@ -53,6 +66,7 @@ class IKSolution:
     searches: int = 0
     residual: float = 0.0
     reason: str = ""
+    jl_valid: bool = True
 
     def __iter__(self):
         return iter(
@@ -67,6 +81,16 @@ class IKSolution:
         )
 
     def __str__(self):
+        if isinstance(self.success, np.ndarray):
+            # A per-pose trajectory solution
+            return (
+                f"IKSolution: {len(self.success)} poses,"
+                f" success={np.count_nonzero(self.success)}/{len(self.success)},"
+                f" iterations={np.sum(self.iterations)},"
+                f" searches={np.sum(self.searches)},"
+                f" residual={np.max(self.residual, initial=0.0):.3g}"
+            )
+
         if self.q is not None:
             q_str = np.array2string(
                 self.q,
@@ -175,6 +199,8 @@ class IKSolver(ABC):
         ets: "rtb.ETS",
         Tep: Union[SE3, np.ndarray],
         q0: Union[ArrayLike, None] = None,
+        threads: Union[int, None] = None,
+        warm_start: bool = False,
     ) -> IKSolution:
         """
         Solves the IK problem
@@ -182,6 +208,31 @@ class IKSolver(ABC):
         This method will attempt to solve the IK problem and obtain joint coordinates
         which result the the end-effector pose `Tep`.
 
+        **Trajectory operation**:
+        If ``Tep`` holds ``m`` poses each pose is solved independently.
+        By default the result is a single ``IKSolution`` which is only
+        successful if every pose was solved. If ``threads`` is given, the
+        poses are split across a pool of ``threads`` worker threads (``0``
+        uses one thread per CPU core) and the result holds per-pose values,
+        see :class:`IKSolution`.
+
+        The Python solvers hold the GIL for most of each iteration, so
+        worker threads only run in parallel when the pose is solved by the
+        C++ solver of :class:`IK_LM`, :class:`IK_NR` or :class:`IK_GN`,
+        which is used when ``threads`` is given, ``kq`` and ``km`` are zero
+        and ``step`` is not overridden. The C++ solvers draw their own
+        random restarts, so ``seed`` is not used, and take a single initial
+        joint coordinate vector, so only the first row of a 2D ``q0`` is
+        used. Otherwise the poses are solved by :func:`step` and the
+        threads give little speedup.
+
+        If ``warm_start`` is True, the poses of a trajectory are solved in
+        order and the first search of each pose starts from the solution of
+        the previous pose. Random restarts are only used when that search
+        fails. This suits continuous Cartesian paths, needing fewer
+        iterations and keeping the joint path on one branch. The result
+        holds per-pose values.
+
         Parameters
         ----------
         ets
@@ -190,6 +241,10 @@ class IKSolver(ABC):
             The desired end-effector pose
         q0
             The initial joint coordinate vector
+        threads
+            The number of worker threads used to solve a trajectory
+        warm_start
+            Seed each pose of a trajectory from the previous solution
 
         Returns
         -------
@@ -218,6 +273,13 @@ class IKSolver(ABC):
             if j.jindex > max_jindex:  # type: ignore
                 max_jindex = j.jindex  # type: ignore
 
+        # The initial joint coordinates of the C++ solvers, which take a
+        # single vector so only the first row of a 2D q0 is used
+        q0_c = None if q0 is None else np.array(q0, dtype=float)
+
+        if q0_c is not None and q0_c.ndim == 2:
+            q0_c = q0_c[0]
+
         q0_method = np.zeros((self.slimit, max_jindex + 1))
 
         if q0 is None:
@@ -238,6 +300,9 @@ class IKSolver(ABC):
 
         q0 = q0_method
 
+        if warm_start and threads is not None:
+            raise ValueError("warm_start and threads can not be used together")
+
         traj = False
 
         methTep: np.ndarray
@@ -259,6 +324,60 @@ class IKSolver(ABC):
         else:
             methTep = Tep
 
+        if traj and warm_start:
+            sols = []
+            q0_warm = q0.copy()
+
+            for T in methTep:
+                sol = self._solve(ets, T, q0_warm)
+                sols.append(sol)
+
+                # Seed the first search of the next pose from this solution
+                if sol.success:
+                    q0_warm[0, ets.jindices] = sol.q
+
+            return _stack_solutions(sols, ets.n)
+
+        if traj and threads is not None:
+            kernel = self._kernel()
+
+            if kernel is not None:
+                # the C++ solver does not hold the GIL
+                func, args = kernel
+                q, success, iterations, searches, residual = ets._ik_c(
+                    func,
+                    methTep,
+                    q0_c,
+                    threads,
+                    self.ilimit,
+                    self.slimit,
+                    self.tol,
+                    self.joint_limits,
+                    np.diag(self.We),
+                    *args,
+                )
+
+                success = success.astype(bool)
+
+                return IKSolution(
+                    q=q,
+                    success=success,
+                    iterations=iterations.astype(int),
+                    searches=searches.astype(int),
+                    residual=residual.astype(float),
+                    reason=[  # type: ignore
+                        "Success" if s else "iteration and search limit reached"
+                        for s in success
+                    ],
+                    jl_valid=np.all(  # type: ignore
+                        (q >= ets.qlim[0]) & (q <= ets.qlim[1]), axis=1
+                    ),
+                )
+
+            sols = _pool_map(lambda T: self._solve(ets, T, q0), methTep, threads)
+
+            return _stack_solutions(sols, ets.n)
+
         if traj:
             q = np.empty((methTep.shape[0], ets.n))
             success = True
@@ -266,6 +385,7 @@ class IKSolver(ABC):
             searches = 0
             residual = np.inf
             reason = ""
+            jl_valid = True
 
             for i, T in enumerate(methTep):
                 sol = self._solve(ets, T, q0)
@@ -273,6 +393,7 @@ class IKSolver(ABC):
                 if not sol.success:
                     success = False
                     reason = sol.reason
+                jl_valid = jl_valid and sol.jl_valid
                 interations += sol.iterations
                 searches += sol.searches
 
@@ -286,6 +407,7 @@ class IKSolver(ABC):
                 searches=searches,
                 residual=residual,
                 reason=reason,
+                jl_valid=jl_valid,
             )
 
         else:
@@ -293,6 +415,16 @@ class IKSolver(ABC):
 
         return sol
 
+    def _kernel(self) -> Union[Tuple[Callable, tuple], None]:
+        """
+        The C++ solver equivalent to this solver
+
+        :return: The C++ solver and its arguments which follow the mask, or
+            None if the solver has no C++ equivalent
+        """
+
+        return None
+
     def _solve(self, ets: "rtb.ETS", Tep: np.ndarray, q0: np.ndarray) -> IKSolution:
         # Iteration count
         i = 0
@@ -344,6 +476,7 @@ class IKSolver(ABC):
                             searches=search + 1,
                             residual=E,
                             reason="Success",
+                            jl_valid=jl_valid,
                         )
             total_i += i
 
@@ -363,6 +496,7 @@ class IKSolver(ABC):
             searches=self.slimit,
             residual=E,
             reason=reason,
+            jl_valid=self._check_jl(ets, q),
         )
 
     def error(self, Te: np.ndarray, Tep: np.ndarray) -> Tuple[np.ndarray, float]:
@@ -503,6 +637,51 @@ class IKSolver(ABC):
         return True
 
 
+def _pool_map(func: Callable[[Any], Any], items: Iterable, threads: int) -> List:
+    """
+    Maps func over items using a pool of worker threads
+
+    :param threads: The number of worker threads, 0 uses one thread per CPU core
+
+    :return: The results of func in the order of items
+    """
+
+    if threads == 0:
+        threads = os.cpu_count() or 1
+
+    if threads <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(func, items))
+
+
+def _stack_solutions(sols: List[IKSolution], n: int) -> IKSolution:
+    """
+    Stacks the solutions of a trajectory into a per-pose IKSolution
+
+    :param sols: The solution of each pose
+    :param n: The number of joints
+
+    :return: An IKSolution holding an array of each attribute
+    """
+
+    q = np.empty((len(sols), n))
+
+    for i, sol in enumerate(sols):
+        q[i] = sol.q
+
+    return IKSolution(
+        q=q,
+        success=np.array([sol.success for sol in sols], dtype=bool),
+        iterations=np.array([sol.iterations for sol in sols], dtype=int),
+        searches=np.array([sol.searches for sol in sols], dtype=int),
+        residual=np.array([sol.residual for sol in sols], dtype=float),
+        reason=[sol.reason for sol in sols],  # type: ignore
+        jl_valid=np.array([sol.jl_valid for sol in sols], dtype=bool),
+    )
+
+
 def _null_Σ(ets: "rtb.ETS", q: np.ndarray, ps: float, pi: Union[np.ndarray, float]):
     """
     Formulates a relationship between joint limits and the joint velocity.
@@ -710,6 +889,12 @@ class IK_NR(IKSolver):
         if self.km > 0.0:
             self.name += " Jm"
 
+    def _kernel(self) -> Union[Tuple[Callable, tuple], None]:
+        if type(self).step is not IK_NR.step or self.kq > 0.0 or self.km > 0.0:
+            return None
+
+        return IK_NR_c, (self.pinv, 0.0)
+
     def step(
         self, ets: "rtb.ETS", Tep: np.ndarray, q: np.ndarray
     ) -> Tuple[float, np.ndarray]:
@@ -908,6 +1093,14 @@ class IK_LM(IKSolver):
         if self.km > 0.0:
             self.name += " Jm"
 
+    def _kernel(self) -> Union[Tuple[Callable, tuple], None]:
+        if type(self).step is not IK_LM.step or self.kq > 0.0 or self.km > 0.0:
+            return None
+
+        method = ("chan", "sugihara", "wampler")[self.method]
+
+        return IK_LM_c, (self.k, method)
+
     def step(self, ets: "rtb.ETS", Tep: np.ndarray, q: np.ndarray):
         r"""
         Performs a single iteration of the Levenberg-Marquadt optimisation
@@ -1150,6 +1343,12 @@ class IK_GN(IKSolver):
         if self.km > 0.0:
             self.name += " Jm"
 
+    def _kernel(self) -> Union[Tuple[Callable, tuple], None]:
+        if type(self).step is not IK_GN.step or self.kq > 0.0 or self.km > 0.0:
+            return None
+
+        return IK_GN_c, (self.pinv, 0.0)
+
     def step(
         self, ets: "rtb.ETS", Tep: np.ndarray, q: np.ndarray
     ) -> Tuple[float, np.ndarray]:
@@ -1511,6 +1710,547 @@ class IK_QP(IKSolver):
         return E, q
 
 
+def _poly2(k: np.ndarray, delta: float) -> np.ndarray:
+    """
+    Tangent half-angle polynomial of a trigonometric-linear function
+
+    ``k`` holds the coefficients ``[k0, kc, ks]`` of the function
+    ``k0 + kc cos(θ) + ks sin(θ)`` along its last axis. With
+    ``θ = delta + 2 atan(t)`` the function multiplied by ``1 + t²`` is the
+    quadratic in ``t`` whose coefficients, highest power first, are
+    returned along the last axis.
+    """
+
+    cd, sd = np.cos(delta), np.sin(delta)
+    k0 = k[..., 0]
+    kc = k[..., 1] * cd + k[..., 2] * sd
+    ks = -k[..., 1] * sd + k[..., 2] * cd
+
+    return np.stack((k0 - kc, 2 * ks, k0 + kc), axis=-1)
+
+
+def _polymul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Product of stacks of polynomials along the last axis
+    """
+
+    shape = np.broadcast_shapes(a.shape[:-1], b.shape[:-1])
+    out = np.zeros(shape + (a.shape[-1] + b.shape[-1] - 1,))
+
+    for i in range(a.shape[-1]):
+        out[..., i : i + b.shape[-1]] += a[..., i : i + 1] * b
+
+    return out
+
+
+def _trig(k: np.ndarray, c: np.ndarray, s: np.ndarray) -> np.ndarray:
+    """
+    Evaluates the trigonometric-linear function ``k`` at ``cos(θ)=c`` and
+    ``sin(θ)=s``
+    """
+
+    return k[..., 0] + k[..., 1] * c + k[..., 2] * s
+
+
+def _Rz(theta: np.ndarray) -> np.ndarray:
+    """
+    Stack of rotations about the z-axis
+    """
+
+    c, s = np.cos(theta), np.sin(theta)
+    R = np.zeros(np.shape(theta) + (3, 3))
+    R[..., 0, 0] = c
+    R[..., 0, 1] = -s
+    R[..., 1, 0] = s
+    R[..., 1, 1] = c
+    R[..., 2, 2] = 1
+
+    return R
+
+
+class IK_Pieper:
+    """
+    Analytic inverse kinematics for 6R arms with a spherical wrist
+
+    A class which generates a closed-form inverse kinematic solver from the
+    Denavit-Hartenberg parameters of a ``DHRobot``. The robot must have six
+    revolute joints and the axes of its last three joints must intersect at
+    a point, the wrist centre. This is the arm class solved by Pieper and
+    includes most six-axis industrial robots.
+
+    The position of the wrist centre depends only on the first three joints
+    which leads to a polynomial of at most fourth degree in the third joint.
+    The last three joints then form an Euler angle set. Every pose has up to
+    eight solutions, four arm configurations each with two wrist
+    configurations, and all of them are returned by `solve_all`. Every step
+    is vectorised over the poses, so many poses can be solved at once.
+
+    Parameters
+    ----------
+    robot
+        A six joint ``DHRobot``, standard or modified DH parameters
+    tol
+        Maximum allowed error, in metres and radians, when the solutions are
+        checked against the requested pose
+
+    Raises
+    ------
+    ValueError
+        If the robot is not a 6R arm with a spherical wrist, or if its first
+        three joints can not position the wrist centre
+
+    Examples
+    --------
+    .. runblock:: pycon
+    >>> import roboticstoolbox as rtb
+    >>> puma = rtb.models.DH.Puma560()
+    >>> solver = rtb.IK_Pieper(puma)
+    >>> Tep = puma.fkine([0, 0.4, -0.2, 0.1, 0.6, 0.3])
+    >>> solver.solve(Tep, q0=puma.qz)
+
+    Notes
+    -----
+    - The base and tool transforms of the robot when the solver is created
+      are incorporated into the solver.
+    - :func:`DHRobot.isspherical` detects the common wrist with twists of
+      ±90°; this class tests that the wrist axes intersect at ``q = 0``, so
+      any wrist twist other than 0 or 180° is accepted.
+    - When the fifth joint is at a singularity, the fourth joint is set to
+      zero and the sixth joint provides the combined rotation.
+
+    References
+    ----------
+    - D. L. Pieper, "The kinematics of manipulators under computer control",
+      Ph.D. thesis, Stanford University, 1968.
+    - Robotics, Vision & Control in Python, 3e, P. Corke, Springer 2023,
+      Chap 7.
+
+    See Also
+    --------
+    DHRobot.ikine_analytic
+        Solves using a solver generated for the robot
+
+    """
+
+    # offset of the tangent half-angle substitution which moves the t = ∞
+    # root of the polynomial away from θ3 = π
+    _delta = 0.7071
+
+    def __init__(self, robot: "rtb.DHRobot", tol: float = 1e-6):
+        if robot.n != 6 or any(link.isprismatic for link in robot.links):
+            raise ValueError("IK_Pieper requires a robot with 6 revolute joints")
+
+        self.robot = robot
+        self.tol = tol
+
+        self._flip = np.array([-1.0 if link.isflip else 1.0 for link in robot.links])
+        self._offset = np.array(robot.offset, dtype=np.float64)
+
+        def T(d=0.0, a=0.0, alpha=0.0):
+            # Tz(d) Tx(a) Rx(alpha)
+            ca, sa = np.cos(alpha), np.sin(alpha)
+            return np.array(
+                [[1, 0, 0, a], [0, ca, -sa, 0], [0, sa, ca, d], [0, 0, 0, 1.0]]
+            )
+
+        # Each link transform is pre @ Rz(θ) @ post
+        if robot.mdh:
+            pre = [T(a=link.a, alpha=link.alpha) for link in robot.links]
+            post = [T(d=link.d) for link in robot.links]
+        else:
+            pre = [np.eye(4)] * 6
+            post = [T(link.d, link.a, link.alpha) for link in robot.links]
+
+        pre[0] = robot.base.A @ pre[0]
+        post[5] = post[5] @ robot.tool.A
+
+        # Joint axes at the zero configuration, θ = offset
+        theta0 = self._offset
+        F = np.eye(4)
+        z = []
+        o = []
+
+        for j in range(6):
+            F = F @ pre[j]
+            z.append(F[:3, 2])
+            o.append(F[:3, 3])
+            F = F @ self._Rz4(theta0[j])
+
+            if j == 2:
+                X3 = F
+
+            F = F @ post[j]
+
+        # The wrist centre is the point closest to the last three axes
+        A = np.zeros((3, 3))
+        b = np.zeros(3)
+        for zj, oj in zip(z[3:], o[3:]):
+            P = np.eye(3) - np.outer(zj, zj)
+            A += P
+            b += P @ oj
+
+        if np.linalg.matrix_rank(A) < 3:
+            raise ValueError("IK_Pieper requires a spherical wrist")
+
+        W = np.linalg.solve(A, b)
+        scale = max(1.0, np.max(np.abs(np.array(o))))
+
+        for zj, oj in zip(z[3:], o[3:]):
+            if np.linalg.norm(np.cross(W - oj, zj)) > 1e-9 * scale:
+                raise ValueError("IK_Pieper requires a spherical wrist")
+
+        # wrist centre in the end-effector frame and in the frame of the
+        # third link
+        self._w6 = (np.linalg.inv(F) @ np.r_[W, 1])[:3]
+        g3 = (np.linalg.inv(X3) @ np.r_[W, 1])[:3]
+
+        # W = G0 Rz(θ1) G1 Rz(θ2) G2 Rz(θ3) g3, where G1 and G2 are of the form
+        # Tz(d) Tx(a) Rx(alpha)
+        self._G0inv = np.linalg.inv(pre[0])
+        G1 = post[0] @ pre[1]
+        G2 = post[1] @ pre[2]
+        self._d1, self._a1 = G1[2, 3], G1[0, 3]
+        alpha1 = np.arctan2(G1[2, 1], G1[1, 1])
+        self._s1, self._c1 = np.sin(alpha1), np.cos(alpha1)
+        d2, a2 = G2[2, 3], G2[0, 3]
+        alpha2 = np.arctan2(G2[2, 1], G2[1, 1])
+        s2, c2 = np.sin(alpha2), np.cos(alpha2)
+
+        # Functions of θ3 as [k0, kc, ks]: k0 + kc cos(θ3) + ks sin(θ3)
+        fx = np.array([0, g3[0], -g3[1]])
+        fy = np.array([0, g3[1], g3[0]])
+        fz = np.array([g3[2], 0, 0])
+        one = np.array([1.0, 0, 0])
+
+        self._ux = a2 * one + fx
+        self._uy = c2 * fy - s2 * fz
+        self._uz = d2 * one + s2 * fy + c2 * fz
+        self._uu = (a2**2 + d2**2 + g3 @ g3) * one + 2 * (
+            a2 * fx + d2 * (s2 * fy + c2 * fz)
+        )
+
+        tiny = 1e-12 * scale
+        if abs(self._a1) < tiny and abs(self._s1) < 1e-12:
+            raise ValueError(
+                "IK_Pieper requires the first three joints to position the wrist"
+            )
+
+        self._case = (
+            "a1" if abs(self._a1) < tiny else "s1" if abs(self._s1) < 1e-12 else ""
+        )
+
+        # The wrist, R = (R3 D0) Rz(θ4) Rx(a) Rz(θ5) Rx(b) Rz(θ6) D3
+        self._D0 = (post[2] @ pre[3])[:3, :3]
+        self._D3 = post[5][:3, :3]
+        C1 = (post[3] @ pre[4])[:3, :3]
+        C2 = (post[4] @ pre[5])[:3, :3]
+        a = np.arctan2(C1[2, 1], C1[1, 1])
+        b = np.arctan2(C2[2, 1], C2[1, 1])
+        self._sa, self._ca = np.sin(a), np.cos(a)
+        self._sb, self._cb = np.sin(b), np.cos(b)
+        self._C1 = C1
+        self._C2 = C2
+
+        if abs(self._sa * self._sb) < 1e-12:
+            raise ValueError("IK_Pieper requires a spherical wrist")
+
+        self._pre = pre
+        self._post = post
+
+    @staticmethod
+    def _Rz4(theta: float) -> np.ndarray:
+        T = np.eye(4)
+        T[:3, :3] = _Rz(theta)
+        return T
+
+    def solve_all(self, Tep: Union[SE3, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All inverse kinematic solutions of a set of poses
+
+        Parameters
+        ----------
+        Tep
+            The desired end-effector poses, an ``SE3`` with ``m`` values or
+            an (m, 4, 4) or (4, 4) array
+
+        Returns
+        -------
+        q
+            An (m, 8, 6) array of joint coordinates, ``q[k, i]`` is branch
+            ``i`` for pose ``k``. Branches ``2i`` and ``2i+1`` share an arm
+            configuration and differ in the wrist configuration. Branches
+            which do not exist are NaN
+        valid
+            An (m, 8) boolean array which is True where ``q`` is a solution
+
+        Notes
+        -----
+        Joint coordinates are wrapped to the interval [-π, π), joint limits
+        are not considered.
+
+        """
+
+        if isinstance(Tep, SE3):
+            Tep = np.array(Tep.A)
+
+        Tep = np.asarray(Tep, dtype=np.float64).reshape((-1, 4, 4))
+        m = Tep.shape[0]
+
+        # Wrist centre relative to the first joint
+        W = Tep[:, :3, :3] @ self._w6 + Tep[:, :3, 3]
+        W0 = W @ self._G0inv[:3, :3].T + self._G0inv[:3, 3]
+
+        d1, a1, s1, c1 = self._d1, self._a1, self._s1, self._c1
+        Wz = W0[:, 2]
+        one = np.array([1.0, 0, 0])
+
+        # E_z: s1 gy = P(θ3), E_r: 2 a1 gx = Q(θ3), gx² + gy² = U(θ3)
+        P = (Wz - d1)[:, None] * one - c1 * self._uz
+        Q = (np.sum(W0**2, axis=1) - a1**2 + d1**2 - 2 * d1 * Wz)[
+            :, None
+        ] * one - self._uu
+
+        delta = self._delta
+        Pt = _poly2(P, delta)
+        Qt = _poly2(Q, delta)
+
+        # θ3 solutions, 4 per pose
+        if self._case == "":
+            Ut = _polymul(_poly2(self._uu, delta), np.array([1.0, 0, 1])) - _polymul(
+                _poly2(self._uz, delta), _poly2(self._uz, delta)
+            )
+            poly = (
+                s1**2 * _polymul(Qt, Qt)
+                + 4 * a1**2 * _polymul(Pt, Pt)
+                - 4 * a1**2 * s1**2 * Ut
+            )
+            t = self._roots4(poly)
+            sign = np.ones(4)
+        else:
+            t = self._roots2(Qt if self._case == "a1" else Pt)
+            t = np.repeat(t, 2, axis=1)
+            sign = np.array([1.0, -1.0, 1.0, -1.0])
+
+        th3 = delta + 2 * np.arctan(t)
+        c3, s3 = np.cos(th3), np.sin(th3)
+
+        uz = _trig(self._uz, c3, s3)
+        ux = _trig(self._ux, c3, s3)
+        uy = _trig(self._uy, c3, s3)
+        Pv = _trig(P[:, None, :], c3, s3)
+        Qv = _trig(Q[:, None, :], c3, s3)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if self._case == "":
+                gx = Qv / (2 * a1)
+                gy = Pv / s1
+            elif self._case == "a1":
+                gy = Pv / s1
+                gx = sign * np.sqrt(ux**2 + uy**2 - gy**2)
+            else:
+                gx = Qv / (2 * a1)
+                gy = sign * np.sqrt(ux**2 + uy**2 - gx**2)
+
+        th2 = np.arctan2(gy, gx) - np.arctan2(uy, ux)
+
+        vx = a1 + gx
+        vy = c1 * gy - s1 * uz
+        th1 = np.arctan2(W0[:, 1], W0[:, 0])[:, None] - np.arctan2(vy, vx)
+
+        # Rotation of the third link frame for each arm solution
+        G1 = self._post[0] @ self._pre[1]
+        G2 = self._post[1] @ self._pre[2]
+        R3 = (
+            self._pre[0][:3, :3]
+            @ _Rz(th1)
+            @ G1[:3, :3]
+            @ _Rz(th2)
+            @ G2[:3, :3]
+            @ _Rz(th3)
+        )
+
+        N = (
+            np.swapaxes(R3 @ self._D0, -1, -2)
+            @ Tep[:, None, :3, :3]
+            @ self._D3.T
+        )
+
+        # Two wrist solutions for each arm solution
+        sa, ca, sb, cb = self._sa, self._ca, self._sb, self._cb
+        c5 = (ca * cb - N[..., 2, 2]) / (sa * sb)
+        c5 = np.clip(c5, -1.0, 1.0)[..., None] * np.ones(2)
+        s5 = np.sqrt(1 - c5**2) * np.array([1.0, -1.0])
+
+        th5 = np.arctan2(s5, c5)
+        Nx = N[..., None, :, :]
+
+        th4 = np.arctan2(Nx[..., 1, 2], Nx[..., 0, 2]) - np.arctan2(
+            -ca * sb * c5 - sa * cb, sb * s5
+        )
+        th6 = np.arctan2(cb * sa * c5 + sb * ca, sa * s5) - np.arctan2(
+            Nx[..., 2, 1], Nx[..., 2, 0]
+        )
+
+        # At a wrist singularity θ4 is set to 0 and θ6 takes the rotation
+        singular = np.abs(s5) < 1e-9
+        if np.any(singular):
+            X = np.swapaxes(self._C1 @ _Rz(th5) @ self._C2, -1, -2) @ Nx
+            th4 = np.where(singular, 0.0, th4)
+            th6 = np.where(singular, np.arctan2(X[..., 1, 0], X[..., 0, 0]), th6)
+
+        theta = np.stack(
+            (
+                np.repeat(th1, 2, axis=1),
+                np.repeat(th2, 2, axis=1),
+                np.repeat(th3, 2, axis=1),
+                th4.reshape((m, 8)),
+                th5.reshape((m, 8)),
+                th6.reshape((m, 8)),
+            ),
+            axis=-1,
+        )
+
+        q = self._flip * (theta - self._offset)
+        q = np.mod(q + np.pi, 2 * np.pi) - np.pi
+
+        # Keep the solutions which achieve the pose
+        valid = np.all(np.isfinite(q), axis=-1)
+        q[~valid] = 0.0
+        T = self.robot.fkine_batch(q.reshape((-1, 6))).reshape((m, 8, 4, 4))
+        err = np.max(np.abs(T - Tep[:, None]), axis=(-1, -2))
+        valid &= err < self.tol
+
+        q[~valid] = np.nan
+
+        return q, valid
+
+    @staticmethod
+    def _roots2(p: np.ndarray) -> np.ndarray:
+        """
+        Real roots of a stack of quadratics, NaN where there is none
+        """
+
+        a, b, c = p[:, 0], p[:, 1], p[:, 2]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            disc = np.sqrt(b**2 - 4 * a * c)
+            # numerically stable form
+            k = -0.5 * (b + np.copysign(disc, b))
+            r = np.stack((k / a, c / k), axis=1)
+
+            # linear when the leading coefficient vanishes
+            lin = np.abs(a) < 1e-14 * np.max(np.abs(p), axis=1)
+            r[lin, 0] = -c[lin] / b[lin]
+            r[lin, 1] = np.nan
+
+        return r
+
+    @staticmethod
+    def _roots4(p: np.ndarray) -> np.ndarray:
+        """
+        Real roots of a stack of quartics, NaN where there is none
+        """
+
+        m = p.shape[0]
+        scale = np.max(np.abs(p), axis=1)
+        scale[scale == 0] = 1.0
+        p = p / scale[:, None]
+
+        # companion matrices, a vanishing leading coefficient gives large
+        # roots which fail the pose check
+        lead = np.where(np.abs(p[:, 0]) < 1e-14, 1e-14, p[:, 0])
+        C = np.zeros((m, 4, 4))
+        C[:, 0, :] = -p[:, 1:] / lead[:, None]
+        C[:, 1, 0] = C[:, 2, 1] = C[:, 3, 2] = 1.0
+
+        r = np.linalg.eigvals(C)
+        real = np.abs(r.imag) < 1e-6 * np.maximum(1.0, np.abs(r.real))
+
+        return np.where(real, r.real, np.nan)
+
+    def solve(
+        self,
+        Tep: Union[SE3, np.ndarray],
+        q0: Union[ArrayLike, None] = None,
+        joint_limits: bool = True,
+    ) -> IKSolution:
+        """
+        Solves the inverse kinematics of one or more poses
+
+        Of all the solutions of each pose, the one closest to ``q0`` is
+        chosen.
+
+        Parameters
+        ----------
+        Tep
+            The desired end-effector poses, an ``SE3`` or an (m, 4, 4) or
+            (4, 4) array
+        q0
+            The joint coordinates which the solution should be closest to,
+            an (n,) vector or an (m, n) array with one row per pose.
+            Defaults to the zero vector
+        joint_limits
+            Reject solutions which violate the joint limits of the robot.
+            Solution angles are shifted by ±2π to lie within the limits, and
+            as close to ``q0`` as possible
+
+        Returns
+        -------
+        sol
+            An IKSolution. For more than one pose it holds per-pose arrays,
+            see :class:`IKSolution`
+
+        """
+
+        q, valid = self.solve_all(Tep)
+        m = q.shape[0]
+
+        if q0 is None:
+            q0 = np.zeros(6)
+
+        q0 = np.broadcast_to(np.asarray(q0, dtype=np.float64), (m, 6))
+        reason = np.array(["" for _ in range(m)], dtype=object)
+        reason[~np.any(valid, axis=1)] = "Pose is out of reach"
+
+        # Each joint is independently shifted by -2π, 0 or 2π to be closest
+        # to q0, only shifts within the joint limits are allowed
+        shifts = q[..., None, :] + 2 * np.pi * np.array([-1.0, 0.0, 1.0])[:, None]
+        cost = (shifts - q0[:, None, None, :]) ** 2
+
+        if joint_limits:
+            qlim = self.robot.qlim
+            cost[(shifts < qlim[0]) | (shifts > qlim[1])] = np.inf
+
+        k = np.argmin(cost, axis=-2)
+        q = np.take_along_axis(shifts, k[..., None, :], axis=-2)[..., 0, :]
+
+        if joint_limits:
+            inlim = np.all(np.isfinite(np.min(cost, axis=-2)), axis=-1)
+            reason[np.any(valid, axis=1) & ~np.any(valid & inlim, axis=1)] = (
+                "No solution within joint limits"
+            )
+            valid &= inlim
+
+        # closest solution to q0
+        dist = np.sum((q - q0[:, None, :]) ** 2, axis=-1)
+        dist[~valid] = np.inf
+        best = np.argmin(dist, axis=1)
+
+        success = np.any(valid, axis=1)
+        qs = q[np.arange(m), best]
+
+        if m == 1:
+            return IKSolution(q=qs[0], success=bool(success[0]), reason=reason[0])
+
+        return IKSolution(
+            q=qs,
+            success=success,
+            iterations=np.zeros(m, dtype=int),  # type: ignore
+            searches=np.zeros(m, dtype=int),  # type: ignore
+            residual=np.zeros(m),  # type: ignore
+            reason=list(reason),  # type: ignore
+        )
+
+
 if __name__ == "__main__":  # pragma nocover
     sol = IKSolution(
         np.array([1, 2, 3]), success=True, iterations=10, searches=100, residual=0.1
@@ -59,6 +59,37 @@ def _listen_dyn(func):
     return wrapper_listen_dyn
 
 
+def _listen_kin(func):
+    """
+    @_listen_kin
+
+    Decorator for property setters
+
+    Use this decorator for any property setter that updates a parameter that
+    affects the kinematic structure of the robot. This signals the change by
+    invoking the ``.kinchanged()`` method of the robot that owns the link,
+    which invalidates the robot's cache of ETS objects.
+
+    Example::
+
+        @jindex.setter
+        @_listen_kin
+        def jindex(self, j):
+            ...
+
+    :seealso: :func:`BaseRobot.kinchanged`
+    """
+
+    @wraps(func)
+    def wrapper_listen_kin(*args):
+        result = func(*args)
+        if args[0]._robot is not None:
+            args[0]._robot.kinchanged()
+        return result
+
+    return wrapper_listen_kin
+
+
 class BaseLink(SceneNode, ABC):
     """
     An abstract link superclass for all link types.
@@ -311,6 +342,7 @@ class BaseLink(SceneNode, ABC):
         ...  # pragma: nocover
 
     @ets.setter
+    @_listen_kin
     def ets(self, new_ets):
         if new_ets.n > 1:
             raise ValueError("An elementary link can only have one joint variable")
@@ -576,6 +608,7 @@ class BaseLink(SceneNode, ABC):
             return None
 
     @qlim.setter
+    @_listen_kin
     def qlim(self, qlim_new: ArrayLike):
         if self.v:
             self.ets.qlim = qlim_new
@@ -1020,6 +1053,7 @@ class BaseLink(SceneNode, ABC):
         return None if not self.v else self.v._jindex
 
     @jindex.setter
+    @_listen_kin
     def jindex(self, j: int):
         if self.v:
             self.v.jindex = j
@@ -1077,6 +1111,7 @@ class BaseLink(SceneNode, ABC):
         return self._parent
 
     @parent.setter
+    @_listen_kin
     def parent(self, parent: Union[Self, None]):
         self._parent = parent
 
@@ -46,11 +46,14 @@ from roboticstoolbox.robot.BaseRobot import BaseRobot
 from roboticstoolbox.robot.RobotKinematics import RobotKinematicsMixin
 from roboticstoolbox.robot.Gripper import Gripper
 from roboticstoolbox.robot.Link import BaseLink, Link, Link2
-from roboticstoolbox.robot.ETS import ETS, ETS2
+from roboticstoolbox.robot.ETS import ETS, ETS2, _chunks
 from roboticstoolbox.tools import xacro
-from roboticstoolbox.tools import URDF
+from roboticstoolbox.tools.urdf import cache as urdf_cache
+from roboticstoolbox.tools.urdf import stream as urdf_stream
+from roboticstoolbox.tools.params import rtb_get_param
 from roboticstoolbox.tools.types import ArrayLike, NDArray
 from roboticstoolbox.tools.data import rtb_path_to_datafile
+from roboticstoolbox.fknm import Robot_rne
 
 # A generic type variable representing any subclass of BaseLink
 LinkType = TypeVar("LinkType", bound=BaseLink)
@@ -216,7 +219,7 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
 
     @staticmethod
     def URDF_read(
-        file_path, tld=None, xacro_tld=None
+        file_path, tld=None, xacro_tld=None, geometry=None
     ) -> Tuple[List[Link], str, str, Union[Path, PurePosixPath]]:
         """
         Read a URDF file as Links
@@ -233,6 +236,9 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         xacro_tld
             A custom top-level within the xacro data,
             defaults to None
+        geometry
+            Create the visual and collision geometry of the links, defaults
+            to the ``"model_geometry"`` parameter
 
         Returns
         -------
@@ -252,8 +258,16 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         to the model file calling this method. If ``tld`` is supplied, then
         ```file_path``` needs to be relative to ``tld``
 
+        Links read with ``geometry=False`` have no shapes, which makes
+        reading faster and the robot smaller when only kinematics and
+        dynamics are needed. Use ``rtb_set_param("model_geometry", False)``
+        to read the robot models of the toolbox this way.
+
         """
 
+        if geometry is None:
+            geometry = rtb_get_param("model_geometry")
+
         # Get the path to the class that defines the robot
         if tld is None:
             base_path = rtb_path_to_datafile("xacro")
@@ -265,27 +279,57 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         file_path = base_path / PurePosixPath(file_path)
         _, ext = splitext(file_path)
 
+        if xacro_tld is not None:
+            xacro_tld = base_path / PurePosixPath(xacro_tld)
+
+        cache = rtb_get_param("model_cache")
+
+        if cache:
+            cached = urdf_cache.load(file_path, xacro_tld, geometry)
+
+            if cached is not None:
+                links, name, urdf_string = cached
+                return links, name, urdf_string, file_path
+
+        # the files read by xacro are appended to all_includes
+        includes = len(xacro.all_includes)
+
         if ext == ".xacro":
             # it's a xacro file, preprocess it
-            if xacro_tld is not None:
-                xacro_tld = base_path / PurePosixPath(xacro_tld)
             urdf_string = xacro.main(file_path, xacro_tld)
             try:
-                urdf = URDF.loadstr(urdf_string, file_path, base_path)
+                links, name = urdf_stream.loadstr(urdf_string, base_path, geometry)
             except BaseException as e:  # pragma nocover
                 print("error parsing URDF file", file_path)
                 raise e
         else:  # pragma nocover
             urdf_string = open(file_path).read()
-            urdf = URDF.loadstr(urdf_string, file_path, base_path)
+            links, name = urdf_stream.loadstr(urdf_string, base_path, geometry)
 
         if not isinstance(urdf_string, str):  # pragma nocover
             raise ValueError("Parsing failed, did not get valid URDF string back")
 
-        return urdf.elinks, urdf.name, urdf_string, file_path
+        if cache:
+            depends = [file_path] + xacro.all_includes[includes:]
+            urdf_cache.save(
+                file_path,
+                xacro_tld,
+                depends,
+                links,
+                name,
+                urdf_string,
+                geometry,
+            )
+
+        return links, name, urdf_string, file_path
 
     @classmethod
-    def URDF(cls, file_path: str, gripper: Union[int, str, None] = None):
+    def URDF(
+        cls,
+        file_path: str,
+        gripper: Union[int, str, None] = None,
+        geometry: Union[bool, None] = None,
+    ):
         """
         Construct a Robot object from URDF file
 
@@ -295,6 +339,9 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
             the path to the URDF
         gripper
             index or name of the gripper link(s)
+        geometry
+            create the visual and collision geometry of the links, defaults
+            to the ``"model_geometry"`` parameter
 
         Returns
         -------
@@ -303,7 +350,9 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
 
         """
 
-        links, name, urdf_string, urdf_filepath = Robot.URDF_read(file_path)
+        links, name, urdf_string, urdf_filepath = Robot.URDF_read(
+            file_path, geometry=geometry
+        )
 
         gripperLink: Union[Link, None] = None
 
@@ -706,6 +755,8 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         start: Union[str, Link, Gripper, None] = None,
         method: L["yoshikawa", "asada", "minsingular", "invcondition"] = "yoshikawa",
         axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        out: Union[NDArray, None] = None,
+        chunksize: Union[int, None] = None,
         **kwargs,
     ) -> Union[float, NDArray]:  # pragma nocover
         ...
@@ -719,6 +770,8 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         start: Union[str, Link, Gripper, None] = None,
         method: L["yoshikawa", "asada", "minsingular", "invcondition"] = "yoshikawa",
         axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        out: Union[NDArray, None] = None,
+        chunksize: Union[int, None] = None,
         **kwargs,
     ) -> Union[float, NDArray]:  # pragma nocover
         ...
@@ -731,6 +784,8 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         start: Union[str, Link, Gripper, None] = None,
         method: L["yoshikawa", "asada", "minsingular", "invcondition"] = "yoshikawa",
         axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        out: Union[NDArray, None] = None,
+        chunksize: Union[int, None] = None,
         **kwargs,
     ):
         """
@@ -755,6 +810,13 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         axes
             Task space axes to consider: "all" [default],
             "trans", or "rot"
+        out
+            a float64 array of shape (m,) to write the manipulability of
+            each configuration into, it is returned even when m is 1
+        chunksize
+            for a trajectory, the number of configurations evaluated
+            together. Bounds the memory used by the stacked Jacobians,
+            defaults to the whole trajectory
 
         Returns
         -------
@@ -782,7 +844,8 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
 
         If ``q`` is a matrix (m,n) then the result (m,) is a vector of
         manipulability indices for each joint configuration specified by a row
-        of ``q``.
+        of ``q``. The measure is evaluated over stacks of Jacobians, see
+        :func:`ETS.manipulability_batch`.
 
         Notes
         -----
@@ -891,20 +954,79 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         if J is not None:
             w = [mfunc(self, J, q, axes_list)]
 
+            if out is not None:
+                verifymatrix(out, (1,))
+                out[0] = w[0]
+
         # Otherwise use the q vector/matrix
         else:
             q = np.array(getmatrix(q, (None, self.n)))
-            w = np.zeros(q.shape[0])
+
+            if q.shape[0] > 1:
+                # trajectories are evaluated over stacked Jacobians
+                if mfunc is asada:
+                    return self._asada_batch(ets, q, axes_list, chunksize, out)
+
+                return ets.manipulability_batch(
+                    q, method, axes_list, chunksize=chunksize, out=out
+                )
+
+            if out is None:
+                w = np.zeros(q.shape[0])
+            else:
+                verifymatrix(out, (q.shape[0],))
+                w = out
+
+            # one Jacobian buffer is reused for every configuration
+            Jk = np.empty((6, ets.n), order="F")
 
             for k, qk in enumerate(q):
-                Jk = ets.jacob0(qk)
+                Jk = ets.jacob0(qk, out=Jk)
                 w[k] = mfunc(self, Jk, qk, axes_list)
 
-        if len(w) == 1:
+        if out is not None:
+            return out
+        elif len(w) == 1:
             return w[0]
         else:
             return w
 
+    def _asada_batch(
+        self,
+        ets: ETS,
+        q: NDArray,
+        axes_list: List[bool],
+        chunksize: Union[int, None],
+        out: Union[NDArray, None],
+    ) -> NDArray:
+        """
+        Asada's manipulability for each row of ``q``
+
+        The Jacobians, inertia matrices and the eigenvalues of the Cartesian
+        inertia are evaluated over stacks, ``chunksize`` rows at a time.
+        """
+
+        if out is None:
+            out = np.empty(q.shape[0])
+        else:
+            verifymatrix(out, (q.shape[0],))
+
+        d = np.where(axes_list)[0]
+
+        for rows in _chunks(q.shape[0], chunksize):
+            J = ets.jacob0_batch(q[rows])
+            M = np.reshape(self.inertia(q[rows]), (-1, self.n, self.n))
+
+            Ji = np.linalg.pinv(J)
+            Mx = Ji.transpose(0, 2, 1) @ M @ Ji
+            e = np.linalg.eigvalsh(Mx[:, d][:, :, d])
+
+            w = np.min(e, axis=1) / np.max(e, axis=1)
+            w[np.linalg.matrix_rank(J) < 6] = 0
+            out[rows] = w
+
+        return out
+
     def jtraj(
         self,
         T1: Union[NDArray, SE3],
@@ -1665,6 +1787,64 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
     # --------- Dynamics Methods ------------------------------------------ #
     # --------------------------------------------------------------------- #
 
+    def _dyn_links(self) -> Tuple[List[Link], NDArray]:
+        """
+        The links of the kinematic tree for the dynamics algorithms
+
+        The links ordered so that parents come before their children, and
+        the index of the parent of each link within that order, -1 for the
+        robot base.
+
+        """
+
+        def depth(link):
+            d = 0
+            while link.parent is not None:
+                link = link.parent
+                d += 1
+            return d
+
+        links = sorted(self.links, key=depth)
+        index = {id(link): i for i, link in enumerate(links)}
+        parent = np.array([index.get(id(link.parent), -1) for link in links])
+
+        return links, parent
+
+    def _rne_model(self) -> Union[Tuple[List, NDArray, NDArray, int], None]:
+        """
+        The model used by the compiled inverse dynamics
+
+        The ETS of every link, the index of the parent of each link, an
+        (nb, 13) array holding the mass, centre of mass and inertia tensor of
+        each link, and the index of the end-effector link. Links are ordered
+        by :func:`_dyn_links`, and fixed links are included as they carry
+        inertia. None when the robot has symbolic dynamic parameters. The
+        model is rebuilt after :func:`dynchanged` or :func:`kinchanged`.
+
+        """
+
+        if self._rne_cache is None:
+            links, parent = self._dyn_links()
+            ee_links = self.ee_links or [None]
+            ee = next(
+                (i for i, link in enumerate(links) if link is ee_links[0]),
+                len(links) - 1,
+            )
+            model = None
+
+            try:
+                inertia = np.array(
+                    [np.r_[link.m, link.r, link.I.flatten()] for link in links],
+                    dtype=np.float64,
+                )
+                model = ([link.ets._fknm for link in links], parent, inertia, ee)
+            except TypeError:
+                pass
+
+            self._rne_cache = (model,)
+
+        return self._rne_cache[0]
+
     def rne(
         self,
         q: NDArray,
@@ -1672,6 +1852,8 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         qdd: NDArray,
         symbolic: bool = False,
         gravity: Union[ArrayLike, None] = None,
+        fext: Union[ArrayLike, None] = None,
+        threads: int = 1,
     ):
         """
         Compute inverse dynamics via recursive Newton-Euler formulation
@@ -1702,6 +1884,13 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         gravity
             Gravitational acceleration, defaults to attribute
             of self
+        fext
+            The wrench :math:`[F_x F_y F_z M_x M_y M_z]` applied by the
+            end-effector link, the first of ``ee_links``, in its frame. A (6,)
+            vector for all steps or an (m, 6) array with one row per step
+        threads
+            The number of threads used for a trajectory, 0 uses one thread
+            per CPU core
 
         Returns
         -------
@@ -1712,11 +1901,50 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         -----
         - This version supports symbolic model parameters
         - Verified against MATLAB code
+        - Numeric inverse dynamics is computed for the whole trajectory by
+          one call to the compiled extension, which releases the GIL. It
+          handles kinematic trees with branches and fixed links, the
+          inertia of fixed links is carried by their parent joint.
 
         """
 
         n = self.n
 
+        # Handle trajectory case
+        q = getmatrix(q, (None, None))
+        qd = getmatrix(qd, (None, None))
+        qdd = getmatrix(qdd, (None, None))
+        l, _ = q.shape  # type: ignore
+
+        if gravity is None:
+            gravity = self.gravity
+
+        gravity = getvector(gravity, 3)
+
+        # gravity in the base frame of the robot
+        if not np.array_equal(self.base.R, np.eye(3)):
+            gravity = self.base.R.T @ gravity
+
+        if fext is None:
+            fext = np.zeros(6)
+        elif np.ndim(fext) == 2:
+            fext = getmatrix(fext, (l, 6))
+        else:
+            fext = getvector(fext, 6)
+
+        model = None if symbolic else self._rne_model()
+
+        if model is not None:
+            try:
+                links, parent, inertia, ee = model
+                Q = Robot_rne(
+                    links, parent, inertia, q, qd, qdd, gravity, fext, ee, threads
+                )
+                return Q[0] if l == 1 else Q
+            except TypeError:
+                # symbolic joint values
+                pass
+
         # allocate intermediate variables
         Xup = SE3.Alloc(n)
         Xtree = SE3.Alloc(n)
@@ -1727,12 +1955,6 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         I = SpatialInertia.Alloc(n)  # noqa
         s = []  # joint motion subspace
 
-        # Handle trajectory case
-        q = getmatrix(q, (None, None))
-        qd = getmatrix(qd, (None, None))
-        qdd = getmatrix(qdd, (None, None))
-        l, _ = q.shape  # type: ignore
-
         if symbolic:  # pragma: nocover
             Q = np.empty((l, n), dtype="O")  # joint torque/force
         else:
@@ -1747,37 +1969,35 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         # A counter through joints
         j = 0
 
-        for k in range(l):
-            qk = q[k, :]
-            qdk = qd[k, :]
-            qddk = qdd[k, :]
+        # initialize intermediate variables
+        for link in self.links:
+            if link.isjoint:
+                I[j] = SpatialInertia(m=link.m, r=link.r, I=link.I)
+                if symbolic and link.Ts is None:  # pragma: nocover
+                    Xtree[j] = SE3(np.eye(4, dtype="O"), check=False)
+                elif link.Ts is not None:
+                    Xtree[j] = Ts * SE3(link.Ts, check=False)
 
-            # initialize intermediate variables
-            for link in self.links:
-                if link.isjoint:
-                    I[j] = SpatialInertia(m=link.m, r=link.r)
-                    if symbolic and link.Ts is None:  # pragma: nocover
-                        Xtree[j] = SE3(np.eye(4, dtype="O"), check=False)
-                    elif link.Ts is not None:
-                        Xtree[j] = Ts * SE3(link.Ts, check=False)
+                if link.v is not None:
+                    s.append(link.v.s)
 
-                    if link.v is not None:
-                        s.append(link.v.s)
+                # Increment the joint counter
+                j += 1
 
-                    # Increment the joint counter
-                    j += 1
+                # Reset the Ts tracker
+                Ts = SE3()
+            else:  # pragma nocover
+                # TODO Keep track of inertia and transform???
+                if link.Ts is not None:
+                    Ts *= SE3(link.Ts, check=False)
 
-                    # Reset the Ts tracker
-                    Ts = SE3()
-                else:  # pragma nocover
-                    # TODO Keep track of inertia and transform???
-                    if link.Ts is not None:
-                        Ts *= SE3(link.Ts, check=False)
+        a_grav = -SpatialAcceleration(gravity)
 
-            if gravity is None:
-                a_grav = -SpatialAcceleration(self.gravity)
-            else:  # pragma nocover
-                a_grav = -SpatialAcceleration(gravity)
+        for k in range(l):
+            qk = q[k, :]
+            qdk = qd[k, :]
+            qddk = qdd[k, :]
+            fextk = fext if fext.ndim == 1 else fext[k]
 
             # forward recursion
             for j in range(0, n):
@@ -1798,6 +2018,10 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
 
                 f[j] = I[j] * a[j] + v[j] @ (I[j] * v[j])
 
+            # the wrench applied by the last link
+            if np.any(fextk != 0):
+                f[n - 1] = f[n - 1] + SpatialForce(fextk)
+
             # backward recursion
             for j in reversed(range(0, n)):
                 # next line could be dot(), but fails for symbolic arguments
@@ -1890,6 +2114,10 @@ class Robot2(BaseRobot[Link2]):
     def fkine(self, q, end=None, start=None):
         return self.ets(start, end).fkine(q)
 
+    def _rne_model(self) -> None:
+        # there is no compiled inverse dynamics for planar robots
+        return None
+
     @property
     def reach(self) -> float:
         r"""
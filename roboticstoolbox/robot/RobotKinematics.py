@@ -32,6 +32,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         tool: Union[NDArray, SE3, None] = None,
         include_base: bool = True,
+        out: Union[NDArray, None] = None,
     ) -> SE3:
         """
         Forward kinematics
@@ -53,6 +54,9 @@ class RobotKinematicsMixin:
             the link to compute forward kinematics from
         tool
             tool transform, optional
+        out
+            a float64 array to write the result into rather than allocating
+            a new one, see :func:`ETS.eval`
 
         Returns
         -------
@@ -91,7 +95,7 @@ class RobotKinematicsMixin:
 
         return SE3(
             self.ets(start, end).fkine(
-                q, base=self._T, tool=tool, include_base=include_base
+                q, base=self._T, tool=tool, include_base=include_base, out=out
             ),
             check=False,
         )
@@ -102,6 +106,7 @@ class RobotKinematicsMixin:
         end: Union[str, Link, Gripper, None] = None,
         start: Union[str, Link, Gripper, None] = None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator geometric Jacobian in the ``start`` frame
@@ -125,6 +130,9 @@ class RobotKinematicsMixin:
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a (6, n) float64 array, C or Fortran ordered, to write the
+            Jacobian into rather than allocating a new one
 
         Returns
         -------
@@ -155,7 +163,7 @@ class RobotKinematicsMixin:
 
         """  # noqa
 
-        return self.ets(start, end).jacob0(q, tool=tool)
+        return self.ets(start, end).jacob0(q, tool=tool, out=out)
 
     def jacobe(
         self: KinematicsProtocol,
@@ -163,6 +171,7 @@ class RobotKinematicsMixin:
         end: Union[str, Link, Gripper, None] = None,
         start: Union[str, Link, Gripper, None] = None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator geometric Jacobian in the end-effector frame
@@ -186,6 +195,9 @@ class RobotKinematicsMixin:
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a (6, n) float64 array, C or Fortran ordered, to write the
+            Jacobian into rather than allocating a new one
 
         Returns
         -------
@@ -216,7 +228,7 @@ class RobotKinematicsMixin:
 
         """  # noqa
 
-        return self.ets(start, end).jacobe(q, tool=tool)
+        return self.ets(start, end).jacobe(q, tool=tool, out=out)
 
     @overload
     def hessian0(
@@ -226,6 +238,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         J0: None = None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:  # pragma nocover
         ...
 
@@ -237,6 +250,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         J0: NDArray = ...,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:  # pragma nocover
         ...
 
@@ -247,6 +261,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         J0=None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator Hessian
@@ -270,6 +285,9 @@ class RobotKinematicsMixin:
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a C ordered (n, 6, n) float64 array to write the Hessian into
+            rather than allocating a new one
 
         Returns
         -------
@@ -318,7 +336,7 @@ class RobotKinematicsMixin:
 
         """  # noqa
 
-        return self.ets(start, end).hessian0(q, J0=J0, tool=tool)
+        return self.ets(start, end).hessian0(q, J0=J0, tool=tool, out=out)
 
     @overload
     def hessiane(
@@ -328,6 +346,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         Je: None = None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:  # pragma nocover
         ...
 
@@ -339,6 +358,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         Je: NDArray = ...,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:  # pragma nocover
         ...
 
@@ -349,6 +369,7 @@ class RobotKinematicsMixin:
         start: Union[str, Link, Gripper, None] = None,
         Je=None,
         tool: Union[NDArray, SE3, None] = None,
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         r"""
         Manipulator Hessian
@@ -372,6 +393,9 @@ class RobotKinematicsMixin:
         tool
             a static tool transformation matrix to apply to the
             end of end, defaults to None
+        out
+            a C ordered (n, 6, n) float64 array to write the Hessian into
+            rather than allocating a new one
 
         Returns
         -------
@@ -420,7 +444,7 @@ class RobotKinematicsMixin:
 
         """  # noqa
 
-        return self.ets(start, end).hessiane(q, Je=Je, tool=tool)
+        return self.ets(start, end).hessiane(q, Je=Je, tool=tool, out=out)
 
     def partial_fkine0(
         self: KinematicsProtocol,
@@ -557,6 +581,7 @@ class RobotKinematicsMixin:
         joint_limits: bool = True,
         k: float = 1.0,
         method: L["chan", "wampler", "sugihara"] = "chan",
+        threads: int = 1,
     ) -> Tuple[NDArray, int, int, int, float]:
         r"""
         Fast levenberg-Marquadt Numerical Inverse Kinematics Solver
@@ -599,6 +624,9 @@ class RobotKinematicsMixin:
         method
             One of "chan", "sugihara" or "wampler". Defines which method is used
             to calculate the damping matrix Wn in the ``step`` method
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
 
         Synopsis
         --------
@@ -714,6 +742,7 @@ class RobotKinematicsMixin:
             mask=mask,
             k=k,
             method=method,
+            threads=threads,
         )
 
     def ik_NR(
@@ -729,6 +758,7 @@ class RobotKinematicsMixin:
         joint_limits: bool = True,
         pinv: int = True,
         pinv_damping: float = 0.0,
+        threads: int = 1,
     ) -> Tuple[NDArray, int, int, int, float]:
         r"""
         Fast numerical inverse kinematics using Newton-Raphson optimization
@@ -774,6 +804,9 @@ class RobotKinematicsMixin:
             Use the psuedo-inverse instad of the normal matrix inverse
         pinv_damping
             Damping factor for the psuedo-inverse
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
 
         Returns
         -------
@@ -847,6 +880,7 @@ class RobotKinematicsMixin:
             mask=mask,
             pinv=pinv,
             pinv_damping=pinv_damping,
+            threads=threads,
         )
 
     def ik_GN(
@@ -862,6 +896,7 @@ class RobotKinematicsMixin:
         joint_limits: bool = True,
         pinv: int = True,
         pinv_damping: float = 0.0,
+        threads: int = 1,
     ) -> Tuple[NDArray, int, int, int, float]:
         r"""
         Fast numerical inverse kinematics by Gauss-Newton optimization
@@ -907,6 +942,9 @@ class RobotKinematicsMixin:
             Use the psuedo-inverse instad of the normal matrix inverse
         pinv_damping
             Damping factor for the psuedo-inverse
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
 
         Returns
         -------
@@ -995,6 +1033,111 @@ class RobotKinematicsMixin:
             mask=mask,
             pinv=pinv,
             pinv_damping=pinv_damping,
+            threads=threads,
+        )
+
+    def ik_QP(
+        self: KinematicsProtocol,
+        Tep: Union[NDArray, SE3],
+        end: Union[str, Link, Gripper, None] = None,
+        start: Union[str, Link, Gripper, None] = None,
+        q0: Union[NDArray, None] = None,
+        ilimit: int = 30,
+        slimit: int = 100,
+        tol: float = 1e-6,
+        mask: Union[NDArray, None] = None,
+        joint_limits: bool = True,
+        kj: float = 0.01,
+        ks: float = 1.0,
+        kq: float = 0.0,
+        ps: float = 0.0,
+        pi: Union[NDArray, float] = 0.3,
+        threads: int = 1,
+    ) -> Tuple[NDArray, int, int, int, float]:
+        r"""
+        Fast numerical inverse kinematics by quadratic programming
+
+        ``sol = robot.ik_QP(Tep)`` are the joint coordinates (n) corresponding
+        to the robot end-effector pose ``Tep`` which is an ``SE3`` or ``ndarray``
+        object. This is a fast solver implemented in C++ which solves the QP of
+        :py:class:`~roboticstoolbox.robot.IK.IK_QP` with joint limit velocity
+        dampers.
+
+        Parameters
+        ----------
+        Tep
+            The desired end-effector pose or pose trajectory
+        end
+            the particular link or gripper to compute the pose of
+        start
+            the link considered as the base frame, defaults to the robots's base frame
+        q0
+            initial joint configuration (default to random valid joint
+            configuration contrained by the joint limits of the robot)
+        ilimit
+            maximum number of iterations per search
+        slimit
+            maximum number of search attempts
+        tol
+            final error tolerance
+        mask
+            a mask vector which weights the end-effector error priority.
+            Corresponds to translation in X, Y and Z and rotation about X, Y and Z
+            respectively
+        joint_limits
+            constrain the solution to being within the joint limits of
+            the robot (reject solution with invalid joint configurations and perfrom
+            another search up to the slimit)
+        kj
+            A gain for joint velocity norm minimisation
+        ks
+            A gain which adjusts the cost of slack (intentional error)
+        kq
+            The gain for the joint limit velocity dampers. Setting to 0.0 will
+            remove them completely from the solution
+        ps
+            The minimum angle/distance (in radians or metres) in which the joint is
+            allowed to approach to its limit
+        pi
+            The influence angle/distance (in radians or metres) in which the
+            velocity damper becomes active
+        threads
+            number of worker threads used to solve a trajectory ``Tep``,
+            ``0`` uses one thread per CPU core
+
+        Returns
+        -------
+        sol
+            tuple (q, success, iterations, searches, residual)
+
+        Examples
+        --------
+        .. runblock:: pycon
+        >>> import roboticstoolbox as rtb
+        >>> panda = rtb.models.Panda()
+        >>> Tep = panda.fkine([0, -0.3, 0, -2.2, 0, 2, 0.7854])
+        >>> panda.ik_QP(Tep, kq=1.0)
+
+        See Also
+        --------
+        :py:meth:`ETS.ik_QP <roboticstoolbox.robot.ETS.ETS.ik_QP>`
+
+        """  # noqa
+
+        return self.ets(start, end).ik_QP(
+            Tep=Tep,
+            q0=q0,
+            ilimit=ilimit,
+            slimit=slimit,
+            tol=tol,
+            joint_limits=joint_limits,
+            mask=mask,
+            kj=kj,
+            ks=ks,
+            kq=kq,
+            ps=ps,
+            pi=pi,
+            threads=threads,
         )
 
     def ikine_LM(
@@ -52,6 +52,12 @@ class RobotProto(Protocol):
     def dynchanged(self):
         ...
 
+    def _dyn_links(self) -> Tuple[List[Link], NDArray]:
+        ...
+
+    def _rne_model(self) -> Union[Tuple[List, NDArray, NDArray, int], None]:
+        ...
+
     def jacobe(
         self,
         q: ArrayLike,
@@ -73,7 +79,7 @@ class RobotProto(Protocol):
     def copy(self) -> Self:
         ...
 
-    def accel(self, q, qd, torque, gravity=None) -> NDArray:
+    def accel(self, q, qd, torque, gravity=None, threads=1) -> NDArray:
         ...
 
     def nofriction(self, coulomb: bool, viscous: bool) -> Self:
@@ -95,6 +101,8 @@ class RobotProto(Protocol):
         qdd: NDArray,
         symbolic: bool = False,
         gravity: Union[None, ArrayLike] = None,
+        fext: Union[None, ArrayLike] = None,
+        threads: int = 1,
     ) -> NDArray:
         ...
 
@@ -15,8 +15,18 @@ from roboticstoolbox.robot.ELink import ELink, ELink2
 from roboticstoolbox.robot.ETS import ETS, ETS2
 from roboticstoolbox.robot.Gripper import Gripper
 from roboticstoolbox.robot.ET import ET, ET2
+from roboticstoolbox.robot.Codegen import DynamicsCode
+from roboticstoolbox.robot.Ensemble import DynamicsEnsemble
 
-from roboticstoolbox.robot.IK import IKSolution, IKSolver, IK_LM, IK_NR, IK_GN, IK_QP
+from roboticstoolbox.robot.IK import (
+    IKSolution,
+    IKSolver,
+    IK_LM,
+    IK_NR,
+    IK_GN,
+    IK_QP,
+    IK_Pieper,
+)
 
 __all__ = [
     "Robot",
@@ -45,10 +55,13 @@ __all__ = [
     "PoERevolute",
     "ET",
     "ET2",
+    "DynamicsCode",
+    "DynamicsEnsemble",
     "IKSolution",
     "IKSolver",
     "IK_LM",
     "IK_NR",
     "IK_GN",
     "IK_QP",
+    "IK_Pieper",
 ]
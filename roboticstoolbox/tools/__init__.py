@@ -19,6 +19,7 @@ from roboticstoolbox.tools.data import (
     rtb_load_matfile,
     rtb_load_jsonfile,
     rtb_path_to_datafile,
+    rtb_cache_dir,
 )
 from roboticstoolbox.tools.plot import xplot
 from roboticstoolbox.tools.params import rtb_set_param, rtb_get_param
@@ -46,6 +47,7 @@ __all__ = [
     "rtb_load_matfile",
     "rtb_load_jsonfile",
     "rtb_path_to_datafile",
+    "rtb_cache_dir",
     "rtb_set_param",
     "rtb_get_param",
     "PyArrayLike",
@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 import sys
 import importlib
 
@@ -154,6 +155,33 @@ def rtb_path_to_datafile(*filename, local=True):
     else:
         raise ValueError(f"file {filename} not found locally or in rtbdata")
 
+
+def rtb_cache_dir(*subdir):
+    """
+    Get path to the toolbox cache folder
+
+    :param subdir: subfolder of the cache folder
+    :type subdir: str
+    :return: Absolute path of the folder, which is created if required
+    :rtype: Path
+
+    The positional arguments are joined, like ``os.path.join``.  The cache
+    is ``$XDG_CACHE_HOME/roboticstoolbox``, or ``~/.cache/roboticstoolbox``
+    if that environment variable is not set, and holds files which are
+    expensive to create but can be safely deleted at any time.
+
+    Example::
+
+        rtb_cache_dir("codegen")    # ~/.cache/roboticstoolbox/codegen
+    """
+
+    root = os.environ.get("XDG_CACHE_HOME") or Path("~", ".cache")
+    path = Path(root, "roboticstoolbox", *subdir).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path.resolve()
+
+
 if __name__ == "__main__":
 
     house = rtb_load_matfile("data/house.mat");
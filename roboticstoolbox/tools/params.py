@@ -1,5 +1,9 @@
 _params = {
     "unicode": True,
+    # cache models read from URDF and xacro files on disk
+    "model_cache": True,
+    # create link geometry when reading URDF and xacro files
+    "model_geometry": True,
 }
 
 
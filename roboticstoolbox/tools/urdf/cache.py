@@ -0,0 +1,156 @@
+"""
+On-disk cache of robot models read from URDF and xacro files
+
+The links read from a file are pickled together with the expanded URDF
+string under the toolbox cache folder. An entry is valid while the SHA-1 of
+the contents of every file read to build it, the URDF or xacro file and all
+the files it includes, is unchanged, so later reads need no xacro or XML
+processing.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from spatialgeometry import Shape
+from roboticstoolbox.robot.Link import BaseLink
+from roboticstoolbox.tools.data import rtb_cache_dir
+
+# bump when the cached objects change, invalidates the cache
+_VERSION = 2
+
+
+def _digest(path: Union[str, Path]) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _entry(file_path, xacro_tld, geometry) -> Path:
+    # not keyed by the toolbox version, reading the package metadata is slow
+    key = f"{_VERSION} {file_path} {xacro_tld} {geometry}"
+    key = hashlib.sha1(key.encode()).hexdigest()
+    name = Path(file_path).name.split(".")[0]
+
+    return rtb_cache_dir("urdf") / f"{name}-{key}.pickle"
+
+
+def _shape(cls, state, T):
+    # as Shape.__deepcopy__, the scene graph node is not pickled
+    shape = cls.__new__(cls)
+    shape.__dict__.update(state)
+    shape._custom_scene_node_init(T=T)
+
+    return shape
+
+
+def _link(cls, kwargs, parent):
+    link = cls(**kwargs)
+    link._parent = parent
+
+    return link
+
+
+class _Pickler(pickle.Pickler):
+    # links and shapes hold scene graph nodes of the spatialgeometry
+    # extension which can not be pickled, they are rebuilt from their
+    # parameters as by their __deepcopy__ methods
+    def reducer_override(self, obj):
+        if isinstance(obj, Shape):
+            state = {
+                k: v
+                for k, v in obj.__dict__.items()
+                if not k.lower().startswith("_scene")
+            }
+            return _shape, (type(obj), state, obj.T)
+
+        elif isinstance(obj, BaseLink):
+            kwargs = dict(
+                ets=obj.ets,
+                name=obj.name,
+                joint_name=obj._joint_name,
+                m=obj.m,
+                r=obj.r,
+                I=obj.I,
+                Jm=obj.Jm,
+                B=obj.B,
+                Tc=obj.Tc,
+                G=obj.G,
+                qlim=obj.qlim,
+                geometry=list(obj._geometry),
+                collision=list(obj._collision),
+            )
+            return _link, (type(obj), kwargs, obj.parent)
+
+        return NotImplemented
+
+
+def load(
+    file_path, xacro_tld=None, geometry: bool = True
+) -> Union[Tuple[List[BaseLink], str, str], None]:
+    """
+    Read links from the cache
+
+    :param file_path: the URDF or xacro file
+    :param xacro_tld: the top-level directory of the xacro data
+    :param geometry: the links have visual and collision geometry
+    :return: the links, the robot name and the URDF string, or None if
+        there is no valid entry
+
+    """
+
+    try:
+        with open(_entry(file_path, xacro_tld, geometry), "rb") as f:
+            depends = pickle.load(f)
+
+            for path, digest in depends:
+                if _digest(path) != digest:
+                    return None
+
+            return pickle.load(f)
+    except Exception:
+        # missing, stale or unreadable entries are rebuilt
+        return None
+
+
+def save(
+    file_path,
+    xacro_tld,
+    depends: List[Union[str, Path]],
+    links: List[BaseLink],
+    name: str,
+    urdf_string: str,
+    geometry: bool = True,
+):
+    """
+    Write links to the cache
+
+    :param file_path: the URDF or xacro file
+    :param xacro_tld: the top-level directory of the xacro data
+    :param depends: the files read to create the links
+    :param links: the links
+    :param name: the robot name
+    :param urdf_string: the expanded URDF
+    :param geometry: the links have visual and collision geometry
+
+    An entry which can not be written is skipped.
+
+    """
+
+    depends = sorted(set(str(p) for p in depends))
+    tmp = None
+
+    try:
+        path = _entry(file_path, xacro_tld, geometry)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+
+        with open(tmp, "wb") as f:
+            pickle.dump([(p, _digest(p)) for p in depends], f)
+            _Pickler(f, pickle.HIGHEST_PROTOCOL).dump((links, name, urdf_string))
+
+        # replace atomically so concurrent processes never see partial files
+        os.replace(tmp, path)
+    except Exception:
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+"""
+Single-pass URDF parser
+
+The URDF document is read with ``iterparse`` and every top-level ``link``
+and ``joint`` element is converted to robot links as soon as it has been
+read, then discarded. No intermediate :class:`~roboticstoolbox.tools.urdf.URDF`
+object tree is built, and elements which do not define the kinematics,
+dynamics or geometry of the links, such as materials and gazebo extensions,
+are skipped. Only the gear ratio is read from transmissions.
+"""
+
+from io import BytesIO
+from math import cos, sin
+from pathlib import PurePosixPath
+import xml.etree.ElementTree as ETT
+
+import numpy as np
+import roboticstoolbox as rtb
+import spatialgeometry as gm
+from spatialmath import SE3
+from spatialmath.base import unitvec_norm, angvec2r, tr2rpy
+from roboticstoolbox.tools.data import rtb_path_to_datafile
+
+_JOINT_TYPES = ("fixed", "prismatic", "revolute", "continuous", "floating", "planar")
+
+# the joint variables for an axis along or about x, y and z
+_VARIABLES = {
+    "revolute": ("Rx", "Ry", "Rz"),
+    "continuous": ("Rx", "Ry", "Rz"),
+    "prismatic": ("tx", "ty", "tz"),
+}
+
+
+def _vector(s):
+    return np.array([float(x) for x in s.split()], dtype=np.float64)
+
+
+def _rpy2r(roll, pitch, yaw):
+    # as spatialmath.base.rpy2r with the default zyx order, but without
+    # argument checking
+    cr, sr = cos(roll), sin(roll)
+    cp, sp = cos(pitch), sin(pitch)
+    cy, sy = cos(yaw), sin(yaw)
+
+    return (
+        np.array([[cy, -sy, 0], [sy, cy, 0], [0, 0, 1]])
+        @ np.array([[cp, 0, sp], [0, 1, 0], [-sp, 0, cp]])
+        @ np.array([[1, 0, 0], [0, cr, -sr], [0, sr, cr]])
+    )
+
+
+def _origin(node):
+    # the pose and roll-pitch-yaw angles of the origin subelement of a node
+    T = np.eye(4)
+    rpy = np.zeros(3)
+    origin = node.find("origin")
+
+    if origin is not None:
+        xyz = origin.get("xyz")
+        if xyz is not None:
+            T[:3, 3] = _vector(xyz)
+
+        s = origin.get("rpy")
+        if s is not None:
+            rpy = _vector(s)
+            T[:3, :3] = _rpy2r(*rpy)
+
+    return T, rpy
+
+
+def _shape(node, base_path):
+    # the shape of a visual or collision element
+    geometry = node.find("geometry")
+    shape = None
+
+    if geometry is not None:
+        for child in geometry:
+            if child.tag == "box":
+                shape = gm.Cuboid(_vector(child.get("size")))
+            elif child.tag == "cylinder":
+                shape = gm.Cylinder(
+                    float(child.get("radius")), float(child.get("length"))
+                )
+            elif child.tag == "sphere":
+                shape = gm.Sphere(float(child.get("radius")))
+            elif child.tag == "mesh":
+                filename = child.get("filename").replace("package://", "")
+                if base_path is None:
+                    filename = rtb_path_to_datafile("xacro", filename)
+                else:
+                    filename = base_path / PurePosixPath(filename)
+
+                scale = child.get("scale")
+                if scale is not None:
+                    scale = _vector(scale)
+
+                shape = gm.Mesh(str(filename), scale=scale)
+
+    if shape is None:
+        raise ValueError("At least one geometry element must be set")
+
+    shape.T, _ = _origin(node)
+
+    return shape
+
+
+def _link(node, base_path, geometry):
+    inertial = node.find("inertial")
+    m = r = I = None
+
+    if inertial is not None:
+        T, _ = _origin(inertial)
+        r = T[:3, 3]
+        m = float(inertial.find("mass").get("value"))
+        n = inertial.find("inertia").attrib
+        xx, xy, xz = float(n["ixx"]), float(n["ixy"]), float(n["ixz"])
+        yy, yz, zz = float(n["iyy"]), float(n["iyz"]), float(n["izz"])
+        I = np.array([[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]])  # noqa
+
+    # new lists, the defaults of Link are shared
+    visuals = []
+    collisions = []
+
+    if geometry:
+        for visual in node.iterfind("visual"):
+            shape = _shape(visual, base_path)
+
+            # only colors defined in line are used
+            color = visual.find("material/color")
+            if color is not None:
+                shape.color = _vector(color.get("rgba"))
+
+            visuals.append(shape)
+
+        for collision in node.iterfind("collision"):
+            collisions.append(_shape(collision, base_path))
+
+    return rtb.Link(
+        name=node.get("name"),
+        m=m,
+        r=r,
+        I=I,
+        geometry=visuals,
+        collision=collisions,
+    )
+
+
+def _joint(node):
+    # a compact tuple of the joint parameters
+    joint_type = node.get("type")
+    if joint_type not in _JOINT_TYPES:
+        raise ValueError(f"Unsupported joint type {joint_type}")
+
+    axis = node.find("axis")
+    if axis is None:
+        axis = np.array([1.0, 0.0, 0.0])
+    else:
+        axis = _vector(axis.get("xyz"))
+        norm = np.linalg.norm(axis)
+        if norm != 0:
+            axis = axis / norm
+
+    qlim = node.find("limit")
+    if qlim is not None:
+        qlim = [qlim.get("lower"), qlim.get("upper")]
+        qlim = [None if q is None else float(q) for q in qlim]
+    elif joint_type in ("prismatic", "revolute"):
+        raise ValueError("Require joint limit for prismatic and revolute joints")
+
+    B = node.find("dynamics")
+    if B is not None:
+        B = B.get("friction")
+        B = None if B is None else float(B)
+
+    T, rpy = _origin(node)
+
+    return (
+        node.get("name"),
+        joint_type,
+        node.find("parent").get("link"),
+        node.find("child").get("link"),
+        axis,
+        T,
+        rpy,
+        qlim,
+        B,
+    )
+
+
+def _ets(joint_type, axis, T, rpy):
+    # the ETS of a link from the parameters of its joint
+    if np.count_nonzero(axis) >= 2:
+        # Normalise the joint axis to be along or about z axis
+        # Convert rest to static ETS
+        u, n = unitvec_norm(axis)
+        rpy = tr2rpy(SE3.RPY(rpy) * angvec2r(n, u))
+        T = SE3.Rt(SE3.RPY(rpy).R, T[:3, 3]).A
+        axis = [0, 0, 1]
+
+    ets = rtb.ET.SE3(T)
+
+    variables = _VARIABLES.get(joint_type)
+
+    if variables is not None:
+        for i in range(3):
+            if axis[i] == 1 or axis[i] == -1:
+                var = getattr(rtb.ET, variables[i])(flip=bool(axis[i] == -1))
+                return rtb.ETS([ets, var])
+
+    return rtb.ETS(ets)
+
+
+def loadstr(str_obj, base_path=None, geometry=True):
+    """Read the links of a robot from a URDF string.
+
+    Parameters
+    ----------
+    str_obj : str
+        The URDF document.
+    base_path : Path, optional
+        The folder to which mesh file names are relative. Defaults to the
+        xacro folder of the toolbox data.
+    geometry : bool, optional
+        If False, the visual and collision elements are skipped and the
+        links have no geometry.
+
+    Returns
+    -------
+    links : list of :class:`~roboticstoolbox.robot.Link.Link`
+        The links in the order of the document.
+    name : str
+        The name of the robot.
+
+    Notes
+    -----
+    The links are the same as those of :class:`~roboticstoolbox.tools.urdf.URDF`
+    but fewer intermediate objects are created, which makes reading large
+    descriptions such as those of humanoids faster.
+    """
+    links = {}
+    joints = []
+    gears = {}
+    name = None
+    depth = 0
+
+    for event, node in ETT.iterparse(
+        BytesIO(str_obj.encode("utf-8")), events=("start", "end")
+    ):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                name = node.get("name")
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        if node.tag == "link":
+            link = _link(node, base_path, geometry)
+            if link.name in links:
+                raise ValueError("Duplicate link names")
+            links[link.name] = link
+
+        elif node.tag == "joint":
+            joints.append(_joint(node))
+
+        elif node.tag == "transmission":
+            # the gear ratio of a joint of the same name
+            reduction = node.find("actuator/mechanicalReduction")
+            if reduction is not None:
+                gears[node.get("name")] = float(reduction.text)
+
+        # the element is not needed any more
+        node.clear()
+
+    if len(joints) > len(set(joint[0] for joint in joints)):
+        raise ValueError("Duplicate joint names")
+
+    for joint_name, joint_type, parent, child, axis, T, rpy, qlim, B in joints:
+        link = links[child]
+        link._parent = links[parent]
+        link._joint_name = joint_name
+        link.ets = _ets(joint_type, axis, T, rpy)
+
+        if qlim is not None and link.isjoint:
+            link.qlim = qlim
+
+        if B is not None:
+            link.B = B
+
+        if joint_name in gears:
+            link.G = gears[joint_name]
+
+    return list(links.values()), name
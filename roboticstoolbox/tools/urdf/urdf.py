@@ -104,7 +104,7 @@ class URDFType(object):
         return kwargs
 
     @classmethod
-    def _parse_simple_elements(cls, node, path):
+    def _parse_simple_elements(cls, node, path, geometry=True):
         """Parse all elements in the _ELEMENTS array from the children of
         this node.
         Parameters
@@ -114,6 +114,9 @@ class URDFType(object):
         path : str
             The string path where the XML file is located (used for resolving
             the location of mesh or image files).
+        geometry : bool, optional
+            If False, :class:`.Link` children are parsed without their visual
+            and collision elements.
         Returns
         -------
         kwargs : dict
@@ -134,12 +137,15 @@ class URDFType(object):
                         "Missing required subelement(s) of type {} when "
                         "parsing an object of type {}".format(t.__name__, cls.__name__)
                     )
-                v = [t._from_xml(n, path) for n in vs]
+                if t is Link:
+                    v = [t._from_xml(n, path, geometry) for n in vs]
+                else:
+                    v = [t._from_xml(n, path) for n in vs]
             kwargs[a] = v
         return kwargs
 
     @classmethod
-    def _parse(cls, node, path):
+    def _parse(cls, node, path, geometry=True):
         """Parse all elements and attributes in the _ELEMENTS and _ATTRIBS
         arrays for a node.
         Parameters
@@ -149,6 +155,9 @@ class URDFType(object):
         path : str
             The string path where the XML file is located (used for resolving
             the location of mesh or image files).
+        geometry : bool, optional
+            If False, :class:`.Link` children are parsed without their visual
+            and collision elements.
         Returns
         -------
         kwargs : dict
@@ -156,7 +165,7 @@ class URDFType(object):
             and elements in the class arrays.
         """
         kwargs = cls._parse_simple_attribs(node)
-        kwargs.update(cls._parse_simple_elements(node, path))
+        kwargs.update(cls._parse_simple_elements(node, path, geometry))
         return kwargs
 
     @classmethod
@@ -1572,6 +1581,20 @@ class Link(URDFType):
                     raise ValueError("Expected list of Collision objects")
         self._collisions = value
 
+    @classmethod
+    def _from_xml(cls, node, path, geometry=True):
+        if geometry:
+            return cls(**cls._parse(node, path))
+
+        # kinematics and dynamics only, no shapes are created
+        kwargs = cls._parse_simple_attribs(node)
+        inertial = node.find(Inertial._TAG)
+
+        if inertial is not None:
+            inertial = Inertial._from_xml(inertial, path)
+
+        return cls(inertial=inertial, visuals=[], collisions=[], **kwargs)
+
 
 class URDF(URDFType):
     """The top-level URDF specification.
@@ -1911,7 +1934,7 @@ class URDF(URDFType):
         return URDF._from_xml(node, path)
 
     @staticmethod
-    def loadstr(str_obj, file_obj, base_path=None):
+    def loadstr(str_obj, file_obj, base_path=None, geometry=True):
         """Load a URDF from a file.
         Parameters
         ----------
@@ -1920,6 +1943,10 @@ class URDF(URDFType):
             ``.urdf`` XML file. Any paths in the URDF should be specified
             as relative paths to the ``.urdf`` file instead of as ROS
             resources.
+        geometry : bool, optional
+            If False, the visual and collision elements are skipped and the
+            links have no geometry, which is faster for kinematics and
+            dynamics only.
         Returns
         -------
         urdf : :class:`.URDF`
@@ -1943,7 +1970,7 @@ class URDF(URDFType):
             path, _ = os.path.split(file_obj.name)
 
         node = tree.getroot()
-        return URDF._from_xml(node, path)
+        return URDF._from_xml(node, path, geometry)
 
     def _validate_transmissions(self):
         """Raise an exception of any transmissions are invalidly specified.
@@ -1959,9 +1986,9 @@ class URDF(URDFType):
                     )
 
     @classmethod
-    def _from_xml(cls, node, path):
+    def _from_xml(cls, node, path, geometry=True):
         valid_tags = set(["joint", "link", "transmission", "material"])
-        kwargs = cls._parse(node, path)
+        kwargs = cls._parse(node, path, geometry)
 
         extra_xml_node = ETT.Element("extra")
         for child in node:
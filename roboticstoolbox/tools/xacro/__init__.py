@@ -421,6 +421,111 @@ def import_xml_namespaces(parent, attributes):
                 parent.setAttribute(name, value)
 
 
+# declarations of include files which only define macros and properties,
+# keyed by file name, modification time and size
+_include_cache = {}
+
+
+class _IncludeDeclarations(object):
+    def __init__(self):
+        self.attributes = {}  # attributes of the root element
+        self.macros = []  # (name, body, params, defaultmap)
+        self.properties = []  # (name, value)
+        self.content = []  # remaining nodes, None for _empty_text_node
+
+
+def _include_key(filename):
+    try:
+        st = os.stat(filename)
+    except OSError:   # pragma: no cover
+        return None
+    return filename, st.st_mtime_ns, st.st_size
+
+
+def _is_declarative(root):
+    """
+    Check if the root element of an included file only defines macros and
+    properties. Such a file evaluates to the same definitions whatever the
+    symbols in scope.
+    """
+    for value in root.attributes.values():
+        if '$' in value.value:
+            return False
+
+    for node in root.childNodes:
+        if node.nodeType == xml.dom.Node.ELEMENT_NODE:
+            if node.tagName == 'xacro:macro':
+                continue
+            if node.tagName == 'xacro:property' and \
+                    node.hasAttribute('value') and \
+                    not node.hasAttribute('default') and \
+                    not node.hasAttribute('scope'):
+                continue
+            return False
+        elif node.nodeType == xml.dom.Node.TEXT_NODE and '$' in node.data:
+            return False
+    return True
+
+
+def _grab_declarations(include, macros, symbols, func):
+    """
+    Evaluate a declarative include file and record its definitions
+    """
+    names = []
+    decl = _IncludeDeclarations()
+    for node in include.childNodes:
+        if node.nodeType != xml.dom.Node.ELEMENT_NODE:
+            continue
+        name = node.getAttribute('name')
+        if node.tagName == 'xacro:macro':
+            names.append(name[6:] if name.startswith('xacro:') else name)
+        else:
+            decl.properties.append((name, node.getAttribute('value')))
+
+    func(include, macros, symbols)
+
+    for name in names:
+        m = macros[name]
+        decl.macros.append((name, m.body, m.params, m.defaultmap))
+    decl.attributes = dict(include.attributes.items())
+    for node in include.childNodes:
+        if node is _empty_text_node:
+            decl.content.append(None)
+        else:
+            decl.content.append((node.nodeType, node.data))
+    return decl
+
+
+def _replay_declarations(decl, elt, macros, symbols):
+    """
+    Define the macros and properties of a cached include file, and return
+    an element holding the remaining content of the file
+    """
+    for name, body, params, defaultmap in decl.macros:
+        macro = macros.get(name, Macro())
+        macro.history.append(filestack)
+        # macro bodies are cloned before expansion and can be shared
+        macro.body = body
+        macro.params = list(params)
+        macro.defaultmap = dict(defaultmap)
+        macros[name] = macro
+
+    for name, value in decl.properties:
+        symbols._setitem(name, value, unevaluated=True)
+
+    doc = elt.ownerDocument
+    include = doc.createElement('include')
+    for node in decl.content:
+        if node is None:
+            node = _empty_text_node
+        elif node[0] == xml.dom.Node.COMMENT_NODE:
+            node = doc.createComment(node[1])
+        else:
+            node = doc.createTextNode(node[1])
+        include.appendChild(node)
+    return include
+
+
 def process_include(elt, macros, symbols, func):
     included = []
     filename_spec, namespace_spec, optional = check_attrs(
@@ -447,10 +552,24 @@ def process_include(elt, macros, symbols, func):
         try:
             # extend filestack
             oldstack = push_file(filename)
+
+            key = _include_key(filename)
+            if key in _include_cache:
+                decl = _include_cache[key]
+                included.append(
+                    _replay_declarations(decl, elt, macros, symbols))
+                import_xml_namespaces(elt.parentNode, decl.attributes)
+                continue
+
             include = parse(None, filename).documentElement
 
-            # recursive call to func
-            func(include, macros, symbols)
+            if key is not None and _is_declarative(include):
+                # recursive call to func, recording the definitions
+                _include_cache[key] = _grab_declarations(
+                    include, macros, symbols, func)
+            else:
+                # recursive call to func
+                func(include, macros, symbols)
             included.append(include)
             import_xml_namespaces(elt.parentNode, include.attributes)
         except XacroException as e:
@@ -624,6 +743,10 @@ def eval_text(text, symbols):
     def handle_extension(s):   # pragma: no cover
         return eval_extension("$(%s)" % eval_text(s, symbols))
 
+    # text without $ evaluates to itself
+    if isinstance(text, _basestr) and '$' not in text:
+        return text
+
     results = []
     lex = QuickLexer(LEXER)
     lex.lex(text)
@@ -41,6 +41,7 @@ import os.path
 import re
 import subprocess
 import sys
+import tempfile
 import unittest
 from roboticstoolbox.tools import xacro
 from roboticstoolbox.tools.xacro.cli import process_args
@@ -610,6 +611,50 @@ class TestXacro(TestXacroCommentsIgnored):
 </a>'''
         self.assert_matches(self.quick_xacro(src), res)
 
+    def test_include_cache(self):
+        src = '''
+<a xmlns:xacro="http://www.ros.org/wiki/xacro">
+  <xacro:include filename="{file}"/>
+  <xacro:include filename="{content}"/>
+  <xacro:foo x="2"/><b y="${{var}}"/>
+</a>'''
+        inc = '''<a xmlns:xacro="http://www.ros.org/wiki/xacro">
+  <!-- a property -->
+  <xacro:property name="var" value="{var}"/>
+  <xacro:macro name="foo" params="x"><foo x="${{x*var}}"/></xacro:macro>
+</a>'''
+        res = '''<a><inc1/><foo x="{x}"/><b y="{var}"/></a>'''
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file = os.path.join(temp_dir, 'include.xacro')
+            with open(file, 'w') as f:
+                f.write(inc.format(var=3))
+
+            content = os.path.join(temp_dir, 'content.xml')
+            with open(content, 'w') as f:
+                f.write('<a><inc1/></a>')
+
+            doc = self.quick_xacro(src.format(file=file, content=content))
+            doc = doc.toxml()
+            self.assert_matches(doc, res.format(x=6, var=3))
+            self.assertIn(xacro._include_key(file), xacro._include_cache)
+
+            # the declarations are reused
+            self.assertEqual(self.quick_xacro(
+                src.format(file=file, content=content)).toxml(), doc)
+
+            # files with content are not cached
+            self.assertNotIn(xacro._include_key(content),
+                             xacro._include_cache)
+
+            # changing the file invalidates the entry
+            with open(file, 'w') as f:
+                f.write(inc.format(var=10))
+
+            self.assert_matches(
+                self.quick_xacro(src.format(file=file, content=content)),
+                res.format(x=20, var=10))
+
     def test_boolean_if_statement(self):
         self.assert_matches(self.quick_xacro('''
 <robot xmlns:xacro="http://www.ros.org/wiki/xacro">
@@ -1,5 +1,6 @@
 from setuptools import setup, Extension
 import os
+import sys
 import numpy
 
 extra_folders = [
@@ -19,6 +20,12 @@ extra_files = []
 for extra_folder in extra_folders:
     extra_files += package_files(extra_folder)
 
+# fknm uses std::thread for its batched methods
+if sys.platform == "win32":
+    thread_args = []
+else:
+    thread_args = ["-pthread"]
+
 frne = Extension(
     "roboticstoolbox.frne",
     sources=[
@@ -35,9 +42,12 @@ fknm = Extension(
         "./roboticstoolbox/core/methods.cpp",
         "./roboticstoolbox/core/ik.cpp",
         "./roboticstoolbox/core/linalg.cpp",
+        "./roboticstoolbox/core/dynamics.cpp",
         "./roboticstoolbox/core/fknm.cpp",
     ],
     include_dirs=["./roboticstoolbox/core/", numpy.get_include()],
+    extra_compile_args=thread_args,
+    extra_link_args=thread_args,
 )
 
 setup(
@@ -11,7 +11,13 @@ from spatialmath import SE3
 from roboticstoolbox.tools.data import rtb_path_to_datafile
 from distutils.dir_util import copy_tree
 from os import mkdir, path
+from pathlib import Path
+from unittest import mock
+import os
+import shutil
 import tempfile as tf
+import roboticstoolbox as rtb
+from roboticstoolbox.tools import xacro
 
 
 class TestCustomXacro(unittest.TestCase):
@@ -61,6 +67,57 @@ class TestCustomXacro(unittest.TestCase):
             robot.qr, np.array([0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4])
         )
 
+    def test_model_cache(self):
+        temp_dir = tf.mkdtemp()
+        xacro_path = rtb_path_to_datafile("xacro")
+        shutil.copytree(
+            xacro_path / "franka_description", path.join(temp_dir, "franka_description")
+        )
+        file = "franka_description/robots/panda_arm_hand.urdf.xacro"
+        cache_dir = path.join(temp_dir, "cache")
+
+        def read():
+            with mock.patch.object(xacro, "main", wraps=xacro.main) as main:
+                links, name, urdf_string, _ = Robot.URDF_read(file, tld=temp_dir)
+
+            robot = Robot(links, urdf_string=urdf_string)
+            return robot, name, main.called
+
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir}):
+            robot, name, expanded = read()
+            self.assertTrue(expanded)
+            self.assertEqual(len(list(Path(cache_dir).rglob("*.pickle"))), 1)
+
+            # no xacro or XML processing for the cached model
+            robot2, name2, expanded = read()
+            self.assertFalse(expanded)
+            self.assertEqual(name2, name)
+            self.assertEqual(robot2.urdf_string, robot.urdf_string)
+            self.assertEqual(robot2.n, robot.n)
+            q = np.linspace(0, 1, robot.n)
+            nt.assert_almost_equal(robot2.fkine(q).A, robot.fkine(q).A)
+            nt.assert_almost_equal(robot2.qlim, robot.qlim)
+            self.assertEqual(
+                [link.geometry[0].filename for link in robot2.links[:8]],
+                [link.geometry[0].filename for link in robot.links[:8]],
+            )
+
+            # changing an included file invalidates the entry
+            arm = Path(temp_dir, "franka_description", "robots", "panda_arm.xacro")
+            text = arm.read_text().replace('xyz="0 0 0.333"', 'xyz="0 0 0.433"')
+            arm.write_text(text)
+            robot3, _, expanded = read()
+            self.assertTrue(expanded)
+            nt.assert_almost_equal(robot3.fkine(q).t - robot.fkine(q).t, [0, 0, 0.1])
+
+            rtb.rtb_set_param("model_cache", False)
+            try:
+                self.assertTrue(read()[2])
+            finally:
+                rtb.rtb_set_param("model_cache", True)
+
+        shutil.rmtree(temp_dir)
+
 
 if __name__ == "__main__":
 
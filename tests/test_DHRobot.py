@@ -9,6 +9,8 @@ import roboticstoolbox as rp
 import spatialmath as sm
 import unittest
 import math
+import shutil
+import tempfile
 
 
 class TestDHRobot(unittest.TestCase):
@@ -1075,6 +1077,27 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(t0[0, :], tr0, decimal=4)
         nt.assert_array_almost_equal(t0[1, :], tr1, decimal=4)
 
+    def test_rne_traj_fext(self):
+        puma = rp.models.DH.Puma560()
+        qt = np.random.rand(20, 6)
+        qdt = np.random.rand(20, 6)
+        qddt = np.random.rand(20, 6)
+        fext = np.random.rand(20, 6)
+
+        t0 = np.array(
+            [puma.rne(qt[k], qdt[k], qddt[k], fext=fext[k]) for k in range(20)]
+        )
+        nt.assert_array_almost_equal(puma.rne(qt, qdt, qddt, fext=fext), t0)
+        nt.assert_array_almost_equal(
+            puma.rne(qt, qdt, qddt, fext=fext, threads=3), t0
+        )
+
+        t1 = puma.rne(qt, qdt, qddt, fext=fext[0])
+        nt.assert_array_almost_equal(t1[0], t0[0])
+
+        with self.assertRaises(ValueError):
+            puma.rne(qt, qdt, qddt, fext=fext[:5])
+
     def test_rne_delete(self):
         puma = rp.models.DH.Puma560()
 
@@ -1106,6 +1129,167 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(qdd1[0, :], res, decimal=4)
         nt.assert_array_almost_equal(qdd1[1, :], res, decimal=4)
 
+    def test_accel_aba(self):
+        # the articulated-body accelerations, including motor inertia and
+        # friction, invert rne
+        puma = rp.models.DH.Puma560()
+        q, qd, tau = np.random.uniform(-1, 1, (3, 5, 6))
+
+        qdd = puma.accel(q, qd, tau, threads=2)
+        self.assertEqual(qdd.shape, (5, 6))
+        nt.assert_array_almost_equal(puma.rne(q, qd, qdd), tau)
+        nt.assert_array_almost_equal(puma.accel(q[0], qd[0], tau[0]), qdd[0])
+
+    def test_fdyn_batch(self):
+        puma = rp.models.DH.Puma560().nofriction()
+        q0 = np.random.uniform(-1, 1, (3, 6))
+
+        tg = puma.fdyn(0.2, q0[1], solver_args={"rtol": 1e-10, "atol": 1e-10})
+
+        out = np.zeros((3, 41, 12))
+        tb = puma.fdyn_batch(0.2, 0.005, q0, out=out)
+        self.assertEqual(tb.t.shape, (41,))
+        self.assertEqual(tb.q.shape, (3, 41, 6))
+        nt.assert_array_almost_equal(out[:, 0, :6], q0)
+        nt.assert_array_almost_equal(tb.q[1, -1], tg.q[-1])
+        nt.assert_array_almost_equal(tb.qd[1, -1], tg.qd[-1])
+
+        te = puma.fdyn_batch(0.2, 0.001, q0, method="euler")
+        nt.assert_array_almost_equal(te.q[1, -1], tg.q[-1], decimal=3)
+
+        # a vectorised torque callback holding all the robots still
+        def hold(robot, t, q, qd):
+            return robot.rne(q, np.zeros(q.shape), np.zeros(q.shape))
+
+        th = puma.fdyn_batch(0.2, 0.01, q0, hold)
+        nt.assert_array_almost_equal(th.q[:, -1], q0)
+
+        with self.assertRaises(ValueError):
+            puma.fdyn_batch(0.2, 0.01, q0, out=np.zeros((3, 10, 12)))
+
+    def test_dynamics_codegen(self):
+        def link(cls, **kwargs):
+            r = np.random.uniform(-0.1, 0.1, 3)
+            I = np.random.uniform(0.01, 0.05, 3)  # noqa
+            return cls(m=2, r=r, I=I, G=5, Jm=1e-3, **kwargs)
+
+        robot = rp.DHRobot(
+            [
+                link(rp.RevoluteDH, d=0.3, alpha=math.pi / 2),
+                link(rp.RevoluteDH, a=0.4),
+                link(rp.PrismaticDH, theta=0.2, alpha=-math.pi / 2),
+            ],
+            base=sm.SE3.Rx(0.2),
+        )
+        q = np.random.uniform(-1, 1, (4, 3))
+        qd = np.random.uniform(-1, 1, (4, 3))
+        qdd = np.random.uniform(-1, 1, (4, 3))
+
+        backends = ["numpy"]
+        if shutil.which("gcc") is not None:
+            backends.append("c")
+
+        with tempfile.TemporaryDirectory() as cachedir:
+            for backend in backends:
+                code = robot.dynamics_codegen(backend=backend, cachedir=cachedir)
+
+                nt.assert_array_almost_equal(code.inertia(q), robot.inertia(q))
+                nt.assert_array_almost_equal(code.inertia(q[0]), robot.inertia(q[0]))
+                nt.assert_array_almost_equal(
+                    code.coriolis(q, qd), robot.coriolis(q, qd)
+                )
+                nt.assert_array_almost_equal(code.gravload(q), robot.gravload(q))
+                nt.assert_array_almost_equal(
+                    code.gravload(q, gravity=[0, 1, 0]),
+                    robot.gravload(q, gravity=[0, 1, 0]),
+                )
+                nt.assert_array_almost_equal(
+                    code.rne(q, qd, qdd),
+                    robot.nofriction(coulomb=True).rne(q, qd, qdd),
+                )
+
+                # the generated code is reused for an identical model
+                mtime = code.path.stat().st_mtime_ns
+                code2 = robot.copy().dynamics_codegen(
+                    backend=backend, cachedir=cachedir
+                )
+                self.assertEqual(code2.path, code.path)
+                self.assertEqual(code2.path.stat().st_mtime_ns, mtime)
+
+            robot.links[0].m = 3
+            self.assertNotEqual(
+                robot.dynamics_codegen(cachedir=cachedir).path.name,
+                code.path.with_suffix(".py").name,
+            )
+
+        with self.assertRaises(ValueError):
+            robot.dynamics_codegen(backend="fortran")
+
+    def test_perturb_ensemble(self):
+        puma = rp.models.DH.Puma560()
+        puma.base = sm.SE3.Ry(0.3)
+        ens = puma.perturb_ensemble(10, 0.2, dr=0.01, seed=0)
+        self.assertEqual(len(ens), 10)
+
+        q, qd, qdd = np.random.uniform(-1, 1, (3, 4, 6))
+        tau = ens.rne(q, qd, qdd)
+        M = ens.inertia(q)
+        G = ens.gravload(q[0])
+        self.assertEqual(tau.shape, (10, 4, 6))
+        self.assertEqual(M.shape, (10, 4, 6, 6))
+        self.assertEqual(G.shape, (10, 6))
+
+        for i in [0, 9]:
+            robot = ens.model(i)
+            nt.assert_array_almost_equal(tau[i], robot.rne(q, qd, qdd))
+            nt.assert_array_almost_equal(M[i], robot.inertia(q))
+            nt.assert_array_almost_equal(G[i], robot.gravload(q[0]))
+
+        nt.assert_array_almost_equal(ens.accel(q, qd, tau), np.tile(qdd, (10, 1, 1)))
+
+        # one trajectory per model
+        Q = np.random.uniform(-1, 1, (10, 6))
+        nt.assert_array_almost_equal(
+            ens.gravload(Q[:, np.newaxis])[:, 0],
+            [ens.model(i).gravload(Q[i]) for i in range(10)],
+        )
+
+        ens = puma.perturb_ensemble(5, p=0)
+        self.assertEqual(ens.inertia(puma.qn).shape, (5, 6, 6))
+        nt.assert_array_almost_equal(ens.gravload(puma.qn)[3], puma.gravload(puma.qn))
+
+        with self.assertRaises(ValueError):
+            ens.gravload(np.zeros((3, 2, 6)))
+
+    def test_regressor(self):
+        puma = rp.models.DH.Puma560().nofriction(coulomb=True, viscous=True)
+        puma.base = sm.SE3.Rx(0.4)
+
+        for link in puma.links:
+            link.Jm = 0
+
+        q, qd, qdd = np.random.uniform(-1, 1, (3, 50, 6))
+        tau = puma.rne(q, qd, qdd)
+
+        Y = puma.regressor(q, qd, qdd)
+        self.assertEqual(Y.shape, (50, 6, 60))
+        nt.assert_array_almost_equal(Y @ puma.dynparams(), tau)
+        nt.assert_array_almost_equal(puma.regressor(q[3], qd[3], qdd[3]), Y[3])
+
+        # identification is one least-squares solve
+        A = Y.reshape(-1, 60)
+        pi = np.linalg.lstsq(A, tau.ravel(), rcond=None)[0]
+        nt.assert_array_almost_equal(A @ pi, tau.ravel())
+
+        # into a slice of a preallocated observation matrix
+        out = np.zeros((100, 6, 60))
+        puma.regressor(q, qd, qdd, out=out[50:])
+        nt.assert_array_almost_equal(out[50:], Y)
+
+        # motor inertia and friction are not in the regressor
+        with self.assertWarns(RuntimeWarning):
+            rp.models.DH.Puma560().regressor(q, qd, qdd)
+
     def test_inertia(self):
         puma = rp.models.DH.Puma560()
         puma.q = puma.qn
@@ -1121,11 +1305,25 @@ class TestDHRobot(unittest.TestCase):
         ]
 
         I0 = puma.inertia(q)
-        # I1 = puma.inertia(np.c_[q, q].T)
+        I1 = puma.inertia(np.c_[q, q].T)
 
         nt.assert_array_almost_equal(I0, Ir, decimal=4)
-        # nt.assert_array_almost_equal(I1[0, :, :], Ir, decimal=4)
-        # nt.assert_array_almost_equal(I1[1, :, :], Ir, decimal=4)
+        nt.assert_array_almost_equal(I1[0, :, :], Ir, decimal=4)
+        nt.assert_array_almost_equal(I1[1, :, :], Ir, decimal=4)
+
+    def test_inertia_crba(self):
+        # the composite-rigid-body inertia matches n calls of RNE
+        puma = rp.models.DH.Puma560()
+        q = np.random.uniform(-1, 1, (5, 6))
+        z = np.zeros((6, 6))
+
+        M = puma.inertia(q, threads=2)
+        self.assertEqual(M.shape, (5, 6, 6))
+
+        for k in range(5):
+            tau = puma.rne(np.tile(q[k], (6, 1)), z, np.eye(6), gravity=[0, 0, 0])
+            nt.assert_array_almost_equal(M[k], tau.T)
+            nt.assert_array_almost_equal(M[k], M[k].T)
 
     def test_inertia_x(self):
         puma = rp.models.DH.Puma560()
@@ -1169,6 +1367,24 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(C1[0, :, :], Cr, decimal=4)
         nt.assert_array_almost_equal(C1[1, :, :], Cr, decimal=4)
 
+    def test_coriolis_christoffel(self):
+        puma = rp.models.DH.Puma560()
+        q, qd = np.random.uniform(-1, 1, (2, 4, 6))
+        z = np.zeros((4, 6))
+
+        C = puma.coriolis(q, qd, threads=2)
+        self.assertEqual(C.shape, (4, 6, 6))
+
+        # C qd are the velocity terms of rne
+        tau = puma.nofriction(True, True).rne(q, qd, z, gravity=[0, 0, 0])
+        nt.assert_array_almost_equal(np.einsum("kij,kj->ki", C, qd), tau)
+
+        # Mdot - 2C is skew-symmetric
+        dt = 1e-6
+        Md = (puma.inertia(q + qd * dt) - puma.inertia(q - qd * dt)) / (2 * dt)
+        N = Md - 2 * C
+        nt.assert_array_almost_equal(N, -np.swapaxes(N, 1, 2), decimal=5)
+
     def test_gravload(self):
         puma = rp.models.DH.Puma560()
         q = puma.qn
@@ -1219,29 +1435,45 @@ class TestDHRobot(unittest.TestCase):
 
     #         self.assertEqual(str(puma), res)
 
-    # def test_paycap(self):
-    #     self.skipTest("error introduced with DHLink change")
-    #     puma = rp.models.DH.Puma560()
-    #     puma.q = puma.qn
-    #     q = puma.qn
+    def test_paycap(self):
+        puma = rp.models.DH.Puma560()
+        puma.q = puma.qn
+        q = puma.qn
+
+        w = [1, 2, 1, 2, 1, 2]
+        tauR = np.ones((6, 2))
+        tauR[:, 1] = -1
+
+        res0 = [
+            1.15865438e00,
+            -3.04790052e02,
+            -5.00870095e01,
+            6.00479950e15,
+            3.76356072e00,
+            1.93649167e00,
+        ]
 
-    #     w = [1, 2, 1, 2, 1, 2]
-    #     tauR = np.ones((6, 2))
-    #     tauR[:, 1] = -1
+        wmax0, joint = puma.paycap(w, tauR, q=q, frame=0)
+        wmax1, joint1 = puma.paycap(np.c_[w, w].T, tauR, q=np.c_[q, q].T, frame=0)
+        wmax2, _ = puma.paycap(w, tauR, frame=0)
 
-    #     res0 = [
-    #         1.15865438e+00, -3.04790052e+02, -5.00870095e+01,  6.00479950e+15,
-    #         3.76356072e+00, 1.93649167e+00]
+        nt.assert_allclose(wmax0, res0)
+        self.assertEqual(joint, 1)
+        nt.assert_allclose(wmax1[0, :], res0)
+        nt.assert_allclose(wmax1[1, :], res0)
+        nt.assert_array_equal(joint1, [1, 1])
+        nt.assert_allclose(wmax2, res0)
 
-    #     wmax0, joint = puma.paycap(w, tauR, q=q, frame=0)
-    #     wmax1, _ = puma.paycap(np.c_[w, w], tauR, q=np.c_[q, q], frame=0)
-    #     wmax2, _ = puma.paycap(w, tauR, frame=0)
+        # a constant wrench over a grid of configurations
+        qg = np.random.uniform(-1, 1, (10, 6))
+        wmax3, joint3 = puma.paycap(w, tauR, q=qg)
+        self.assertEqual(wmax3.shape, (10, 6))
+
+        for k in range(10):
+            wk, jk = puma.paycap(w, tauR, q=qg[k])
+            nt.assert_allclose(wmax3[k], wk)
+            self.assertEqual(joint3[k], jk)
 
-    #     nt.assert_allclose(wmax0, res0)
-    #     self.assertEqual(joint, 1)
-    #     nt.assert_allclose(wmax1[:, 0], res0)
-    #     nt.assert_allclose(wmax1[:, 1], res0)
-    #     nt.assert_allclose(wmax2, res0)
 
     def test_jacob_dot(self):
         puma = rp.models.DH.Puma560()
@@ -1338,6 +1570,106 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_almost_equal(m5, a4, decimal=4)
         # nt.assert_array_almost_equal(mx5, ax3, decimal=4)
 
+    def test_fkine_batch(self):
+        for puma in [rp.models.DH.Puma560(), rp.models.DH.Panda()]:
+            puma.base = sm.SE3.Rx(0.3) * sm.SE3.Tz(0.2)
+            puma.tool = sm.SE3.Ty(0.1)
+            ets = puma.ets()
+            qt = np.random.rand(10, puma.n)
+
+            T = puma.fkine_batch(qt)
+            self.assertEqual(T.shape, (10, 4, 4))
+            nt.assert_almost_equal(T, ets.eval(qt))
+
+            Tall = puma.fkine_all_batch(qt)
+            self.assertEqual(Tall.shape, (10, puma.n + 1, 4, 4))
+            nt.assert_almost_equal(Tall[3], puma.fkine_all(qt[3]).A)
+
+            J0 = puma.jacob0_batch(qt)
+            Je = puma.jacobe_batch(qt)
+
+            for k, q in enumerate(qt):
+                nt.assert_almost_equal(J0[k], puma.jacob0(q))
+                nt.assert_almost_equal(Je[k], puma.jacobe(q))
+
+    def test_fkine_batch_flip(self):
+        for cls in [(rp.RevoluteDH, rp.PrismaticDH), (rp.RevoluteMDH, rp.PrismaticMDH)]:
+            r = rp.DHRobot(
+                [
+                    cls[0](a=1, offset=0.2, flip=True),
+                    cls[1](alpha=0.3, theta=0.1, flip=True, qlim=[0, 1]),
+                    cls[0](a=0.2, d=0.1),
+                ]
+            )
+            ets = r.ets()
+            qt = np.random.rand(5, r.n)
+
+            nt.assert_almost_equal(r.fkine_batch(qt), ets.eval(qt))
+            nt.assert_almost_equal(r.fkine(qt[0]).A, r.A(2, qt[0]).A)
+
+            for k, q in enumerate(qt):
+                nt.assert_almost_equal(r.jacob0_batch(qt)[k], ets.jacob0(q))
+
+    def test_asada_batch(self):
+        puma = rp.models.DH.Puma560()
+        qt = np.r_[[puma.qn, puma.qz], np.random.rand(5, puma.n)]
+
+        for axes in ["all", "trans", "rot"]:
+            m0 = [puma.manipulability(q, method="asada", axes=axes) for q in qt]
+            m1 = puma.manipulability(qt, method="asada", axes=axes, chunksize=3)
+            nt.assert_almost_equal(m1, m0)
+
+    def test_ikine_analytic(self):
+        links = [
+            rp.RevoluteMDH(),
+            rp.RevoluteMDH(alpha=-np.pi / 2, offset=0.3),
+            rp.RevoluteMDH(a=0.4318, d=0.15005),
+            rp.RevoluteMDH(a=0.0203, d=0.4318, alpha=-np.pi / 2),
+            rp.RevoluteMDH(alpha=np.pi / 2),
+            rp.RevoluteMDH(alpha=-np.pi / 2, flip=True),
+        ]
+        mdh = rp.DHRobot(links, base=sm.SE3(0.1, 0.2, 0.3), tool=sm.SE3(0, 0, 0.1))
+
+        robots = [rp.models.DH.Puma560(), rp.models.DH.IRB140(), mdh]
+
+        for robot in robots:
+            qt = np.random.uniform(-np.pi, np.pi, (20, 6))
+            Tt = robot.fkine_batch(qt)
+
+            q, valid = rp.IK_Pieper(robot).solve_all(Tt)
+            self.assertEqual(q.shape, (20, 8, 6))
+            self.assertTrue(np.all(np.sum(valid, axis=1) >= 4))
+
+            for k in range(20):
+                for qk in q[k, valid[k]]:
+                    nt.assert_almost_equal(robot.fkine(qk).A, Tt[k])
+
+                # the original configuration is one of the branches
+                d = np.mod(q[k, valid[k]] - qt[k] + np.pi, 2 * np.pi) - np.pi
+                self.assertAlmostEqual(np.min(np.max(np.abs(d), axis=1)), 0)
+
+            sol = robot.ikine_analytic(Tt, q0=qt, joint_limits=False)
+            self.assertTrue(np.all(sol.success))
+            nt.assert_almost_equal(sol.q, qt)
+
+    def test_ikine_analytic_fail(self):
+        puma = rp.models.DH.Puma560()
+
+        sol = puma.ikine_analytic(sm.SE3(3, 0, 0))
+        self.assertFalse(sol.success)
+        self.assertEqual(sol.reason, "Pose is out of reach")
+
+        sol = puma.ikine_analytic(puma.fkine(puma.qr), q0=puma.qr)
+        self.assertTrue(sol.success)
+        self.assertTrue(np.all(sol.q >= puma.qlim[0]))
+        self.assertTrue(np.all(sol.q <= puma.qlim[1]))
+
+        with self.assertRaises(ValueError):
+            rp.IK_Pieper(rp.models.DH.UR5())
+
+        with self.assertRaises(ValueError):
+            rp.IK_Pieper(rp.models.DH.Stanford())
+
     def test_manipulability_fail(self):
         puma = rp.models.DH.Puma560()
         puma.q = puma.qn
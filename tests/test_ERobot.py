@@ -11,6 +11,7 @@ from roboticstoolbox import ERobot, ET, ETS, Link
 
 # from spatialmath import SE2, SE3
 import unittest
+import tempfile
 import spatialmath as sm
 import spatialgeometry as gm
 from math import pi, sin, cos
@@ -152,6 +153,119 @@ class TestERobot(unittest.TestCase):
         tau = robot.rne(q, z, np.array([1, 1]))
         nt.assert_array_almost_equal(tau, np.r_[d11 + d12, d21 + d22])
 
+    def test_rne_native(self):
+        # the same robot as modified DH parameters and as an ERobot, the
+        # joint ends each link so d moves to the next link
+        dh = []
+        links = []
+        d0 = 0
+
+        for i in range(4):
+            a, d, alpha = np.random.uniform(-0.5, 0.5, 3)
+            d = 0 if i == 3 else d
+            r = np.random.uniform(-0.2, 0.2, 3)
+            I = np.diag(np.random.uniform(0.1, 0.2, 3))  # noqa
+            dh.append(rtb.RevoluteMDH(a=a, d=d, alpha=alpha, m=2, r=r, I=I, G=1))
+
+            ets = ET.tz(d0) * ET.Rx(alpha) * ET.tx(a) * ET.Rz()
+            parent = links[-1] if links else None
+            links.append(Link(ets, m=2, r=r + [0, 0, d], I=I, parent=parent))
+            d0 = d
+
+        robot_dh = rtb.DHRobot(dh).nofriction(viscous=True)
+        robot = ERobot(links)
+        robot.base = robot_dh.base = sm.SE3.Rx(0.3)
+
+        q, qd, qdd = np.random.uniform(-1, 1, (3, 10, 4))
+        fext = np.random.uniform(-1, 1, (10, 6))
+
+        tau = robot.rne(q, qd, qdd, fext=fext)
+        nt.assert_array_almost_equal(tau, robot_dh.rne(q, qd, qdd, fext=fext))
+        tau2 = robot.rne(q, qd, qdd, fext=fext, threads=2)
+        nt.assert_array_almost_equal(tau2, tau)
+
+        for k in range(10):
+            nt.assert_array_almost_equal(
+                robot.rne(q[k], qd[k], qdd[k], fext=fext[k]), tau[k]
+            )
+
+        # the python implementation
+        robot._rne_cache = (None,)
+        tau0 = robot.rne(q[0], qd[0], qdd[0], fext=fext[0])
+        nt.assert_array_almost_equal(tau0, tau[0])
+
+        # changing the dynamics rebuilds the model
+        robot.links[0].m = 3
+        self.assertFalse(np.allclose(robot.rne(q, qd, qdd, fext=fext), tau))
+
+    def test_rne_tree(self):
+        # a branched robot with fixed links, checked against the inertia
+        # matrix and gravity load from the link Jacobians
+        def link(ets, parent, name):
+            r = np.random.uniform(-0.2, 0.2, 3)
+            I = np.diag(np.random.uniform(0.1, 0.2, 3))  # noqa
+            return Link(ets, m=1.5, r=r, I=I, parent=parent, name=name)
+
+        l0 = link(ETS(ET.tz(0.1)), None, "l0")
+        l1 = link(ET.tz(0.3) * ET.Rz(), l0, "l1")
+        l2 = link(ET.tx(0.2) * ET.Ry(), l1, "l2")
+        l3 = link(ET.tx(0.3) * ET.Rx(0.4), l2, "l3")
+        l4 = link(ET.ty(0.2) * ET.Rx(), l1, "l4")
+        l5 = link(ET.tz(0.2) * ET.tx(), l4, "l5")
+        robot = ERobot([l0, l1, l2, l3, l4, l5])
+
+        q = np.random.uniform(-1, 1, 4)
+        M = np.zeros((4, 4))
+        G = np.zeros(4)
+
+        for lk in robot.links[1:]:
+            ets = robot.ets(end=lk)
+            J = np.zeros((6, 4))
+            J[:, [et.jindex for et in ets.joints()]] = ets.jacob0(q)
+            R = ets.fkine(q).R
+            C = sm.base.skew(lk.r)
+            Js = np.r_[R.T @ J[3:], R.T @ J[:3]]
+            Is = np.block(
+                [[lk.I + 1.5 * C @ C.T, 1.5 * C], [1.5 * C.T, 1.5 * np.eye(3)]]
+            )
+            M += Js.T @ Is @ Js
+            G -= (J[:3] - sm.base.skew(R @ lk.r) @ J[3:]).T @ (1.5 * robot.gravity)
+
+        z = np.zeros(4)
+        nt.assert_array_almost_equal(robot.rne(q, z, z), G)
+
+        qdd = np.eye(4)
+        tau = robot.rne(np.tile(q, (4, 1)), np.zeros((4, 4)), qdd, gravity=[0, 0, 0])
+        nt.assert_array_almost_equal(tau.T, M)
+        nt.assert_array_almost_equal(robot.inertia(q), M)
+
+        M2 = robot.inertia(np.tile(q, (3, 1)))
+        self.assertEqual(M2.shape, (3, 4, 4))
+        nt.assert_array_almost_equal(M2[2], M)
+
+        qd, tau = np.random.uniform(-1, 1, (2, 3, 4))
+        qdd = robot.accel(np.tile(q, (3, 1)), qd, tau)
+        nt.assert_array_almost_equal(robot.rne(np.tile(q, (3, 1)), qd, qdd), tau)
+
+        C = robot.coriolis(np.tile(q, (3, 1)), qd)
+        tau = robot.rne(np.tile(q, (3, 1)), qd, np.zeros((3, 4)), gravity=[0, 0, 0])
+        nt.assert_array_almost_equal(np.einsum("kij,kj->ki", C, qd), tau)
+
+        with tempfile.TemporaryDirectory() as cachedir:
+            code = robot.dynamics_codegen(cachedir=cachedir)
+            nt.assert_array_almost_equal(code.inertia(q), M)
+            nt.assert_array_almost_equal(code.gravload(q), G)
+            nt.assert_array_almost_equal(code.coriolis(np.tile(q, (3, 1)), qd), C)
+
+        ens = robot.perturb_ensemble(3, p=0.2, seed=0)
+        z = np.zeros(4)
+        nt.assert_array_almost_equal(ens.inertia(q)[1], ens.model(1).inertia(q))
+        nt.assert_array_almost_equal(ens.rne(q, z, z)[2], ens.model(2).rne(q, z, z))
+
+        Y = robot.regressor(np.tile(q, (3, 1)), qd, qdd)
+        tau = robot.rne(np.tile(q, (3, 1)), qd, qdd)
+        nt.assert_array_almost_equal(Y @ robot.dynparams(), tau)
+
 
 class TestERobot2(unittest.TestCase):
     def test_plot(self):
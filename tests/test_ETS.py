@@ -13,6 +13,7 @@ import numpy as np
 from spatialmath import SE3
 from spatialmath.base import tr2jac
 import unittest
+import pickle
 import sympy
 
 
@@ -258,6 +259,115 @@ class TestETS(unittest.TestCase):
         for i in range(10):
             nt.assert_allclose(T_traj[i, :, :], T_individual[i])
 
+    def test_fkine_batch(self):
+        ets = rtb.models.Panda().ets()
+        base = SE3.Tz(0.5)
+        tool = SE3.Tx(0.1)
+
+        qt = np.random.rand(25, ets.n)
+        T_traj = ets.eval(qt, base=base, tool=tool)
+
+        for threads in [0, 1, 3, 50]:
+            T_batch = ets.eval(qt, base=base, tool=tool, threads=threads)
+            self.assertEqual(T_batch.shape, (25, 4, 4))
+            nt.assert_almost_equal(T_batch, T_traj)
+
+        T_batch = ets.eval(qt[0], base=base, tool=tool, threads=2)
+        self.assertEqual(T_batch.shape, (1, 4, 4))
+        nt.assert_almost_equal(T_batch[0], T_traj[0])
+
+        with self.assertRaises(ValueError):
+            ets.eval(qt[:, :3], threads=2)
+
+    def test_fkine_batch_se3(self):
+        ets = rtb.models.Panda().ets()
+
+        qt = np.random.rand(10, ets.n)
+        T = ets.fkine(qt, threads=2)
+
+        self.assertIsInstance(T, SE3)
+        self.assertEqual(len(T), 10)
+
+        for i in range(10):
+            nt.assert_almost_equal(T[i].A, ets.fkine(qt[i]).A)
+
+        # values share a single buffer
+        base = T.data[0].base
+        self.assertIsNotNone(base)
+        for A in T.data:
+            self.assertIs(A.base, base)
+
+    def test_jacob_batch(self):
+        ets = rtb.models.Panda().ets()
+        tool = SE3.Tx(0.1)
+
+        qt = np.random.rand(20, ets.n)
+
+        for threads in [0, 1, 3]:
+            J0 = ets.jacob0_batch(qt, tool=tool, threads=threads)
+            Je = ets.jacobe_batch(qt, tool=tool, threads=threads)
+            H0 = ets.hessian0_batch(qt, tool=tool, threads=threads)
+            He = ets.hessiane_batch(qt, tool=tool, threads=threads)
+
+            self.assertEqual(J0.shape, (20, 6, ets.n))
+            self.assertEqual(Je.shape, (20, 6, ets.n))
+            self.assertEqual(H0.shape, (20, ets.n, 6, ets.n))
+            self.assertEqual(He.shape, (20, ets.n, 6, ets.n))
+
+            for i, q in enumerate(qt):
+                nt.assert_almost_equal(J0[i], ets.jacob0(q, tool=tool))
+                nt.assert_almost_equal(Je[i], ets.jacobe(q, tool=tool))
+                nt.assert_almost_equal(H0[i], ets.hessian0(q, tool=tool))
+                nt.assert_almost_equal(He[i], ets.hessiane(q, tool=tool))
+
+        nt.assert_almost_equal(ets.jacob0_batch(qt[0])[0], ets.jacob0(qt[0]))
+
+        with self.assertRaises(ValueError):
+            ets.jacob0_batch(qt[:, :3])
+
+    def test_out(self):
+        ets = rtb.models.Panda().ets()
+        tool = SE3.Tx(0.1)
+        q = np.random.rand(ets.n)
+        qt = np.random.rand(5, ets.n)
+
+        for order in ["C", "F"]:
+            T = np.empty((4, 4), order=order)
+            self.assertIs(ets.eval(q, tool=tool, out=T), T)
+            nt.assert_almost_equal(T, ets.eval(q, tool=tool))
+            self.assertIs(ets.fkine(q, out=T).A, T)
+
+            J = np.empty((6, ets.n), order=order)
+            self.assertIs(ets.jacob0(q, tool=tool, out=J), J)
+            nt.assert_almost_equal(J, ets.jacob0(q, tool=tool))
+            self.assertIs(ets.jacobe(q, tool=tool, out=J), J)
+            nt.assert_almost_equal(J, ets.jacobe(q, tool=tool))
+
+        Tt = np.empty((5, 4, 4))
+        self.assertIs(ets.eval(qt, out=Tt), Tt)
+        nt.assert_almost_equal(Tt, ets.eval(qt))
+        self.assertIs(ets.eval(qt, threads=1, out=Tt), Tt)
+        nt.assert_almost_equal(Tt, ets.eval(qt))
+
+        H = np.empty((ets.n, 6, ets.n))
+        self.assertIs(ets.hessian0(q, out=H), H)
+        nt.assert_almost_equal(H, ets.hessian0(q))
+        self.assertIs(ets.hessiane(q, out=H), H)
+        nt.assert_almost_equal(H, ets.hessiane(q))
+
+        w = np.empty(5)
+        self.assertIs(ets.manipulability(qt, out=w), w)
+        nt.assert_almost_equal(w, ets.manipulability(qt))
+
+        with self.assertRaises(ValueError):
+            ets.jacob0(q, out=np.empty((6, ets.n + 1)))
+
+        with self.assertRaises(ValueError):
+            ets.hessian0(q, out=np.empty((ets.n, 6, ets.n), dtype=np.float32))
+
+        with self.assertRaises(ValueError):
+            ets.eval(qt, out=np.empty((5, 4, 8))[:, :, :4])
+
     def test_jacob0_panda(self):
         deg = np.pi / 180
         mm = 1e-3
@@ -4366,6 +4476,38 @@ class TestETS(unittest.TestCase):
         with self.assertRaises(ValueError):
             ets.manipulability(q, axes="abcdef")  # type: ignore
 
+    def test_manipulability_batch(self):
+        ets = rtb.models.Panda().ets()
+        qt = np.random.rand(10, ets.n)
+
+        for method in ["yoshikawa", "invcondition", "minsingular"]:
+            for axes in ["all", "trans", "rot"]:
+                m0 = [ets.manipulability(q, method=method, axes=axes) for q in qt]
+                m1 = ets.manipulability_batch(qt, method, axes, chunksize=3)
+                nt.assert_almost_equal(m1, m0)
+
+        nt.assert_almost_equal(ets.manipulability(qt), ets.manipulability_batch(qt))
+
+        Jm0 = [ets.jacobm(q).flatten() for q in qt]
+        nt.assert_almost_equal(ets.jacobm_batch(qt, chunksize=4), Jm0)
+
+        with self.assertRaises(ValueError):
+            ets.manipulability_batch(qt, method="notamethod")  # type: ignore
+
+    def test_pickle(self):
+        ets = rtb.models.Panda().ets() * rtb.ET.tx(flip=True) * rtb.ET.Ry(0.3)
+        ets2 = pickle.loads(pickle.dumps(ets))
+        q = np.random.rand(ets.n)
+
+        self.assertEqual(str(ets2), str(ets))
+        nt.assert_almost_equal(ets2.fkine(q).A, ets.fkine(q).A)
+        nt.assert_almost_equal(ets2.jacob0(q), ets.jacob0(q))
+        nt.assert_almost_equal(ets2[-2].A(0.2), ets[-2].A(0.2))
+
+        ets = rtb.ETS2(rtb.ET2.R() * rtb.ET2.tx(1) * rtb.ET2.ty())
+        ets2 = pickle.loads(pickle.dumps(ets))
+        nt.assert_almost_equal(ets2.fkine([0.1, 0.2]).A, ets.fkine([0.1, 0.2]).A)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -840,6 +840,182 @@ class TestIK(unittest.TestCase):
         self.assertEqual(e, 0.1)
         self.assertEqual(f, "")
 
+    def test_IK_traj_threads(self):
+        tol = 1e-6
+
+        panda = rtb.models.Panda().ets()
+
+        qt = np.array([[0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4]]) + np.linspace(
+            0, 0.2, 6
+        ).reshape(6, 1)
+
+        Tep = panda.fkine(qt)
+
+        solver = rtb.IK_LM(joint_limits=True, seed=0, tol=tol)
+
+        sol = solver.solve(panda, Tep, threads=3)
+
+        self.assertEqual(sol.q.shape, (6, 7))
+        self.assertEqual(sol.success.shape, (6,))
+        self.assertEqual(sol.iterations.shape, (6,))
+        self.assertEqual(sol.searches.shape, (6,))
+        self.assertEqual(sol.residual.shape, (6,))
+        self.assertEqual(len(sol.reason), 6)
+        self.assertTrue(np.all(sol.success))
+
+        for i in range(6):
+            _, E = solver.error(Tep[i].A, panda.eval(sol.q[i]))
+            self.assertGreater(test_tol, E)
+
+        self.assertIn("6 poses", str(sol))
+
+    def test_IK_traj_threads_kernel(self):
+        panda = rtb.models.Panda().ets()
+
+        qt = np.array([[0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4]]) + np.linspace(
+            0, 0.2, 6
+        ).reshape(6, 1)
+
+        Tep = panda.fkine(qt)
+
+        class Solver(rtb.IK_LM):
+            def step(self, ets, Tep, q):
+                return super().step(ets, Tep, q)
+
+        # solvers with a C++ equivalent and solvers which run step
+        for solver, kernel in [
+            (rtb.IK_LM(method="wampler", k=0.1), True),
+            (rtb.IK_NR(pinv=True), True),
+            (rtb.IK_GN(pinv=True), True),
+            (rtb.IK_LM(kq=0.1), False),
+            (Solver(), False),
+            (rtb.IK_QP(), False),
+        ]:
+            self.assertEqual(solver._kernel() is not None, kernel)
+
+            sol = solver.solve(panda, Tep, q0=qt[0] + 0.05, threads=2)
+
+            self.assertEqual(sol.q.shape, (6, 7))
+            self.assertTrue(np.all(sol.success))
+            self.assertEqual(sol.reason, ["Success"] * 6)
+            nt.assert_equal(
+                sol.jl_valid,
+                [solver._check_jl(panda, q) for q in sol.q],
+            )
+
+            for i in range(6):
+                _, E = solver.error(Tep[i].A, panda.eval(sol.q[i]))
+                self.assertGreater(test_tol, E)
+
+        # the C++ solvers start from the first row of a 2D q0
+        sol = rtb.IK_LM().solve(panda, Tep, q0=qt + 0.05, threads=2)
+        self.assertTrue(np.all(sol.success))
+        self.assertEqual(sol.jl_valid.shape, (6,))
+
+    def test_ik_c_traj_threads(self):
+        panda = rtb.models.Panda().ets()
+
+        qt = np.array([[0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4]]) + np.linspace(
+            0, 0.2, 6
+        ).reshape(6, 1)
+
+        Tep = panda.fkine(qt)
+        solver = rtb.IK_LM()
+
+        for threads in [0, 1, 4]:
+            q, success, iterations, searches, residual = panda.ik_LM(
+                Tep, threads=threads
+            )
+
+            self.assertEqual(q.shape, (6, 7))
+            self.assertEqual(success.shape, (6,))
+            self.assertEqual(iterations.shape, (6,))
+            self.assertEqual(searches.shape, (6,))
+            self.assertEqual(residual.shape, (6,))
+            self.assertTrue(np.all(success))
+
+            for i in range(6):
+                _, E = solver.error(Tep[i].A, panda.eval(q[i]))
+                self.assertGreater(test_tol, E)
+
+    def test_IK_traj_warm_start(self):
+        panda = rtb.models.Panda().ets()
+
+        qt = np.array([[0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4]]) + np.linspace(
+            0, 0.3, 10
+        ).reshape(10, 1)
+
+        Tep = panda.fkine(qt)
+
+        for solver in [
+            rtb.IK_LM(seed=0),
+            rtb.IK_NR(seed=0, pinv=True),
+            rtb.IK_GN(seed=0, pinv=True),
+        ]:
+            sol = solver.solve(panda, Tep, q0=qt[0], warm_start=True)
+
+            self.assertEqual(sol.q.shape, (10, 7))
+            self.assertEqual(sol.iterations.shape, (10,))
+            self.assertTrue(np.all(sol.success))
+
+            # every pose converges from the previous solution
+            nt.assert_equal(sol.searches, np.ones(10))
+
+            for i in range(10):
+                _, E = solver.error(Tep[i].A, panda.eval(sol.q[i]))
+                self.assertGreater(test_tol, E)
+
+        sol = panda.ikine_LM(Tep, q0=qt[0], warm_start=True)
+        self.assertTrue(np.all(sol.success))
+        self.assertLess(np.max(np.abs(np.diff(sol.q, axis=0))), 0.1)
+
+        with self.assertRaises(ValueError):
+            panda.ikine_LM(Tep, warm_start=True, threads=2)
+
+    def test_ik_QP_c(self):
+        panda = rtb.models.Panda().ets()
+        solver = rtb.IK_QP()
+
+        Tep = panda.fkine([0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4])
+
+        for kq in [0.0, 1.0]:
+            q, success, _, _, _ = panda.ik_QP(Tep, kq=kq)
+
+            self.assertEqual(success, 1)
+            self.assertTrue(np.all(q >= panda.qlim[0]))
+            self.assertTrue(np.all(q <= panda.qlim[1]))
+
+            _, E = solver.error(Tep.A, panda.eval(q))
+            self.assertGreater(test_tol, E)
+
+        q, success, _, _, _ = panda.ik_QP(
+            Tep, q0=[0, -0.3, 0, -2.2, 0, 2.0, 0.7], kq=1.0, pi=np.full(7, 0.2)
+        )
+        self.assertEqual(success, 1)
+
+        with self.assertRaises(ValueError):
+            panda.ik_QP(Tep, pi=np.ones(3))
+
+    def test_ik_QP_c_traj(self):
+        panda = rtb.models.Panda()
+        solver = rtb.IK_QP()
+
+        qt = np.array([[0, -0.3, 0, -2.2, 0, 2.0, np.pi / 4]]) + np.linspace(
+            0, 0.2, 5
+        ).reshape(5, 1)
+
+        Tep = panda.fkine(qt)
+
+        q, success, iterations, _, _ = panda.ik_QP(Tep, kq=1.0, threads=2)
+
+        self.assertEqual(q.shape, (5, 7))
+        self.assertEqual(iterations.shape, (5,))
+        self.assertTrue(np.all(success))
+
+        for i in range(5):
+            _, E = solver.error(Tep[i].A, panda.fkine(q[i]).A)
+            self.assertGreater(test_tol, E)
+
 
 if __name__ == "__main__":
 
@@ -7,6 +7,7 @@ import numpy as np
 import roboticstoolbox as rtb
 import unittest
 import os
+from concurrent.futures import ThreadPoolExecutor
 import spatialgeometry as sg
 from spatialmath.base import tr2jac
 
@@ -539,6 +540,61 @@ class TestRobot(unittest.TestCase):
         self.assertEqual(panda.qlim.shape[0], 2)
         self.assertEqual(panda.qlim.shape[1], panda.n)
 
+    def test_out(self):
+        panda = rtb.models.Panda()
+        qt = np.random.rand(4, panda.n)
+
+        J = np.empty((6, panda.n))
+        self.assertIs(panda.jacob0(qt[0], out=J), J)
+        nt.assert_almost_equal(J, panda.jacob0(qt[0]))
+
+        w = np.empty(4)
+        self.assertIs(panda.manipulability(qt, out=w), w)
+        nt.assert_almost_equal(w, panda.manipulability(qt))
+
+    def test_ets_cache(self):
+        panda = rtb.models.Panda()
+
+        ets = panda.ets()
+        self.assertIs(panda.ets(), ets)
+
+        ets5 = panda.ets(end="panda_link5")
+        self.assertIsNot(ets5, ets)
+        self.assertIs(panda.ets(end="panda_link5"), ets5)
+
+        info = panda.ets_cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.currsize, 2)
+
+        # editing a link invalidates the cache
+        panda.links[2].qlim = [-1.0, 1.0]
+        self.assertEqual(panda.ets_cache_info().currsize, 0)
+
+        ets = panda.ets()
+        nt.assert_almost_equal(ets.qlim[:, 1], [-1.0, 1.0])
+
+        # as does editing the base or tool
+        panda.base = panda.base
+        self.assertIsNot(panda.ets(), ets)
+
+        ets = panda.ets()
+        panda.tool = panda.tool
+        self.assertIsNot(panda.ets(), ets)
+
+        # a gripper tool forms part of the key
+        ets = panda.ets()
+        panda.grippers[0].tool = panda.grippers[0].tool.A @ np.diag([1, 1, 1, 1.0])
+        self.assertIs(panda.ets(), ets)
+
+        z = ets.eval(np.zeros(7))[2, 3]
+        panda.grippers[0].tool = panda.grippers[0].tool.A @ np.array(
+            [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0.1], [0, 0, 0, 1.0]]
+        )
+        ets2 = panda.ets()
+        self.assertIsNot(ets2, ets)
+        self.assertNotAlmostEqual(ets2.eval(np.zeros(7))[2, 3], z)
+
     def test_manuf(self):
         panda = rtb.models.ETS.Panda()
 
@@ -626,6 +682,138 @@ class TestRobot(unittest.TestCase):
 
         self.assertEqual(r.n, 7)
 
+    def test_URDF_geometry(self):
+        file = "fetch_description/robots/fetch.urdf"
+        r = rtb.Robot.URDF(file)
+        r2 = rtb.Robot.URDF(file, geometry=False)
+
+        self.assertTrue(any(link.geometry for link in r.links))
+        self.assertTrue(any(link.collision for link in r.links))
+
+        for link, link2 in zip(r.links, r2.links):
+            self.assertEqual(link.name, link2.name)
+            self.assertEqual(len(link2.geometry), 0)
+            self.assertEqual(len(link2.collision), 0)
+            nt.assert_almost_equal(link.m, link2.m)
+            nt.assert_almost_equal(link.r, link2.r)
+            nt.assert_almost_equal(link.I, link2.I)
+
+        q = np.linspace(0.1, 0.5, r.n)
+        nt.assert_almost_equal(r.fkine(q).A, r2.fkine(q).A)
+        nt.assert_almost_equal(r.inertia(q), r2.inertia(q))
+
+        # loads with different flags can run at once
+        base_path = rtb.rtb_path_to_datafile("xacro")
+        path = str(base_path / file)
+        with open(path) as f:
+            urdf = f.read()
+
+        def load(geometry):
+            return rtb.tools.URDF.loadstr(urdf, path, base_path, geometry)
+
+        flags = [True, False] * 4
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            urdfs = list(pool.map(load, flags))
+
+        for u, geometry in zip(urdfs, flags):
+            self.assertEqual(any(link.visuals for link in u.links), geometry)
+
+        # the toolbox models follow the parameter
+        try:
+            rtb.rtb_set_param("model_geometry", False)
+            panda = rtb.models.Panda()
+        finally:
+            rtb.rtb_set_param("model_geometry", True)
+
+        self.assertFalse(any(link.geometry for link in panda.links))
+        self.assertTrue(any(link.geometry for link in rtb.models.Panda().links))
+
+    def test_URDF_stream(self):
+        urdf = """<robot name="test">
+  <material name="grey"><color rgba="0.5 0.5 0.5 1"/></material>
+  <joint name="j1" type="revolute">
+    <parent link="base"/><child link="l1"/>
+    <origin xyz="0 0 0.3" rpy="0.1 0.2 0.3"/>
+    <axis xyz="0 1 1"/>
+    <limit lower="-1" upper="2" effort="1" velocity="1"/>
+    <dynamics friction="0.2"/>
+  </joint>
+  <link name="base">
+    <visual>
+      <geometry><box size="0.1 0.2 0.3"/></geometry>
+      <material name="grey"/>
+    </visual>
+  </link>
+  <link name="l1">
+    <inertial>
+      <origin xyz="0.1 0 0"/><mass value="2"/>
+      <inertia ixx="1" ixy="0.1" ixz="0" iyy="2" iyz="0" izz="3"/>
+    </inertial>
+    <visual>
+      <origin xyz="0 0 0.1" rpy="0 1.57 0"/>
+      <geometry><cylinder radius="0.1" length="0.5"/></geometry>
+      <material name="red"><color rgba="1 0 0 1"/></material>
+    </visual>
+    <collision><geometry><sphere radius="0.2"/></geometry></collision>
+  </link>
+  <link name="l2"/>
+  <joint name="j2" type="prismatic">
+    <parent link="l1"/><child link="l2"/>
+    <origin xyz="0.5 0 0"/><axis xyz="0 0 -1"/>
+    <limit lower="0" upper="0.4" effort="1" velocity="1"/>
+  </joint>
+  <link name="l3"/>
+  <joint name="j3" type="fixed">
+    <parent link="l2"/><child link="l3"/><origin rpy="0 0 1"/>
+  </joint>
+  <transmission name="j1">
+    <type>transmission_interface/SimpleTransmission</type>
+    <joint name="j1"/>
+    <actuator name="m1"><mechanicalReduction>10</mechanicalReduction></actuator>
+  </transmission>
+  <gazebo reference="l1"><material>Gazebo/Grey</material></gazebo>
+</robot>"""
+
+        links, name = rtb.tools.urdf.stream.loadstr(urdf)
+        urdf2 = rtb.tools.URDF.loadstr(urdf, __file__)
+
+        self.assertEqual(name, "test")
+        self.assertEqual([link.name for link in links], ["base", "l1", "l2", "l3"])
+
+        for link, link2 in zip(links, urdf2.elinks):
+            self.assertEqual(link.name, link2.name)
+            self.assertEqual(link._joint_name, link2._joint_name)
+            self.assertEqual(str(link.ets), str(link2.ets))
+            if link.parent is not None:
+                self.assertEqual(link.parent.name, link2.parent.name)
+            q = np.full(link.ets.n, 0.3)
+            nt.assert_almost_equal(link.ets.fkine(q).A, link2.ets.fkine(q).A)
+            nt.assert_almost_equal(link.m, link2.m)
+            nt.assert_almost_equal(link.r, link2.r)
+            nt.assert_almost_equal(link.I, link2.I)
+            nt.assert_almost_equal(link.B, link2.B)
+            nt.assert_almost_equal(link.G, float(link2.G))
+            if link.isjoint:
+                nt.assert_almost_equal(link.qlim, link2.qlim)
+
+            for shapes, shapes2 in (
+                (link.geometry, link2.geometry),
+                (link.collision, link2.collision),
+            ):
+                self.assertEqual(len(shapes), len(shapes2))
+                for shape, shape2 in zip(shapes, shapes2):
+                    self.assertEqual(shape.stype, shape2.stype)
+                    nt.assert_almost_equal(shape.T, shape2.T)
+                    nt.assert_almost_equal(shape.color, shape2.color)
+
+        self.assertEqual(links[1].qlim.tolist(), [-1, 2])
+        self.assertEqual(links[1].B, 0.2)
+        self.assertEqual(links[1].G, 10)
+        self.assertEqual(links[2].ets[-1].isflip, True)
+
+        links, _ = rtb.tools.urdf.stream.loadstr(urdf, geometry=False)
+        self.assertFalse(any(link.geometry or link.collision for link in links))
+
     def test_showgraph(self):
         r = rtb.models.Panda()
 
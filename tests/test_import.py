@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Lazy import of the toolbox subpackages
+"""
+
+import subprocess
+import sys
+import unittest
+import roboticstoolbox as rtb
+
+
+def _loaded(code):
+    # the modules loaded by a new interpreter which runs code
+    code += "\nimport sys\nprint(' '.join(sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(out.stdout.split())
+
+
+class TestImport(unittest.TestCase):
+    def test_lazy(self):
+        loaded = _loaded("import roboticstoolbox")
+        self.assertFalse(any(m.startswith("roboticstoolbox.") for m in loaded))
+
+        loaded = _loaded("import roboticstoolbox as rtb\nrtb.ETS\nrtb.Robot")
+        self.assertIn("roboticstoolbox.robot.ETS", loaded)
+
+        for module in (
+            "roboticstoolbox.mobile",
+            "roboticstoolbox.models",
+            "roboticstoolbox.backends",
+            "swift",
+            "scipy.integrate",
+            "scipy.stats",
+            "pgraph",
+        ):
+            self.assertNotIn(module, loaded)
+
+    def test_exports(self):
+        for package, names in rtb._exports.items():
+            package = getattr(rtb, package)
+            self.assertEqual(set(names), set(package.__all__))
+
+            for name in names:
+                self.assertIs(getattr(rtb, name), getattr(package, name))
+
+        self.assertIs(rtb.models, sys.modules["roboticstoolbox.models"])
+        self.assertIn("ETS", dir(rtb))
+        self.assertIn("backends", dir(rtb))
+        self.assertIsInstance(rtb.__version__, str)
+
+        with self.assertRaises(AttributeError):
+            rtb.foo
+
+        namespace = {}
+        exec("from roboticstoolbox import *", namespace)
+        self.assertTrue(set(rtb.__all__) <= set(namespace))
+
+
+if __name__ == "__main__":  # pragma nocover
+    unittest.main()